@@ -0,0 +1,327 @@
+"""
+Cool QRCode 性能基准
+
+覆盖所有渲染路径：make_image、make_custom_image（方形/圆形，200-2000像素，
+版本1-40）、8000像素的分块渲染、add_logo、add_logo_to_custom、蒙板合成、
+to_bytes 和 to_plain_png。
+每个用例报告耗时（最小值/中位数）和峰值内存，结果可保存为JSON，
+并与另一次提交的结果对比。
+
+用法:
+    python benchmarks/run.py                      # 完整运行
+    python benchmarks/run.py --quick              # 快速运行（较少的版本和尺寸）
+    python benchmarks/run.py -k custom --json new.json
+    python benchmarks/run.py --json new.json --compare old.json --fail-on-regression
+
+峰值内存由tracemalloc统计，包含Python对象和NumPy数组，不包含PIL在C层
+直接分配的像素缓冲区；进程级的最大常驻内存另见结果中的max_rss_kb。
+"""
+
+import argparse
+import gc
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+# 直接从源码目录运行时也能导入
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np  # noqa: E402
+import PIL  # noqa: E402
+from PIL import Image, ImageDraw  # noqa: E402
+
+import cool_qrcode  # noqa: E402
+from cool_qrcode import CoolQRCode  # noqa: E402
+from cool_qrcode.cache import logo_cache, matrix_cache, sprite_cache  # noqa: E402
+
+VERSIONS = [1, 5, 10, 20, 30, 40]
+SIZES = [200, 500, 1000, 2000]
+QUICK_VERSIONS = [1, 10, 40]
+QUICK_SIZES = [200, 1000]
+# 分块渲染用例的画布大小（印刷用的大图）
+LARGE_SIZE = 8000
+
+
+class Case(NamedTuple):
+    """一个基准用例：名称、参数和返回被测函数的准备函数"""
+    name: str
+    params: Dict[str, Any]
+    setup: Callable[[], Callable[[], Any]]
+
+
+def _qrcode(version: int, **kwargs: Any) -> CoolQRCode:
+    """创建指定版本的二维码（数据足够短，版本即为起始版本）"""
+    qr = CoolQRCode(version=version, **kwargs)
+    qr.add_data("https://example.com/benchmark")
+    return qr
+
+
+def _make_logo(directory: str) -> str:
+    """生成基准用的Logo文件"""
+    path = os.path.join(directory, "logo.png")
+    logo = Image.new("RGBA", (256, 256), (0, 0, 0, 0))
+    ImageDraw.Draw(logo).ellipse((16, 16, 240, 240), fill="orange")
+    logo.save(path)
+    return path
+
+
+def build_cases(versions: List[int], sizes: List[int], logo_path: str) -> List[Case]:
+    """生成所有基准用例"""
+    cases = []
+
+    for version in versions:
+        cases.append(Case(
+            "make_image", {"version": version},
+            lambda v=version: _qrcode(v).make_image,
+        ))
+
+    for version in versions:
+        for size in sizes:
+            for dot_shape in ("square", "circle"):
+                cases.append(Case(
+                    "make_custom_image", {"version": version, "size": size, "dot_shape": dot_shape},
+                    lambda v=version, s=size, d=dot_shape:
+                        lambda qr=_qrcode(v): qr.make_custom_image(size=s, dot_shape=d),
+                ))
+
+    for size in sizes:
+        cases.append(Case(
+            "make_custom_image_aa", {"version": 10, "size": size, "dot_shape": "circle"},
+            lambda s=size: lambda qr=_qrcode(10): qr.make_custom_image(
+                size=s, dot_shape="circle", quality="aa"),
+        ))
+
+    for version in versions:
+        cases.append(Case(
+            "add_logo", {"version": version},
+            lambda v=version: lambda qr=_qrcode(v, error_correction=3): qr.add_logo(logo_path),
+        ))
+
+    for size in sizes:
+        cases.append(Case(
+            "add_logo_to_custom", {"version": 10, "size": size},
+            lambda s=size: lambda qr=_qrcode(10, error_correction=3): qr.add_logo_to_custom(
+                logo_path, size=s, dot_shape="circle"),
+        ))
+
+    for workers in sorted({1, os.cpu_count() or 1}):
+        cases.append(Case(
+            "make_custom_image_tiled", {"version": 40, "size": LARGE_SIZE, "workers": workers},
+            lambda w=workers: lambda qr=_qrcode(40): qr.make_custom_image(
+                size=LARGE_SIZE, dot_shape="circle", workers=w),
+        ))
+        cases.append(Case(
+            "save_tiled_png", {"version": 40, "size": LARGE_SIZE, "workers": workers},
+            lambda w=workers: lambda qr=_qrcode(40): qr.save_tiled_png(
+                io.BytesIO(), size=LARGE_SIZE, dot_shape="circle", workers=w),
+        ))
+
+    for size in sizes:
+        cases.append(Case(
+            "mask", {"version": 10, "size": size},
+            lambda s=size: lambda: cool_qrcode.make_cool_qrcode(
+                "https://example.com/benchmark", size=s, dot_shape="circle",
+                mask_color="purple", mask_opacity=0.2),
+        ))
+
+    for size in sizes:
+        cases.append(Case(
+            "to_bytes", {"version": 10, "size": size},
+            lambda s=size: lambda qr=_qrcode(10): qr.to_bytes(render={"size": s}),
+        ))
+
+    for version in versions:
+        cases.append(Case(
+            "to_bytes_plain", {"version": version},
+            lambda v=version: _qrcode(v).to_bytes,
+        ))
+        cases.append(Case(
+            "to_plain_png", {"version": version},
+            lambda v=version: _qrcode(v).to_plain_png,
+        ))
+
+    return cases
+
+
+def _clear_caches() -> None:
+    """清空进程内的共享缓存"""
+    for cache in (logo_cache, matrix_cache, sprite_cache):
+        cache.clear()
+
+
+def measure(func: Callable[[], Any], repeat: int, cold: bool) -> Dict[str, float]:
+    """
+    测量一个函数的耗时和峰值内存
+
+    Args:
+        func: 被测函数
+        repeat: 计时次数
+        cold: 每次调用前是否清空共享缓存
+
+    Returns:
+        包含min_ms、median_ms和peak_kb的字典
+    """
+    # 预热一次，排除首次导入等一次性开销
+    func()
+
+    timings = []
+    for _ in range(repeat):
+        if cold:
+            _clear_caches()
+        gc.collect()
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    if cold:
+        _clear_caches()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "min_ms": round(min(timings) * 1000, 4),
+        "median_ms": round(statistics.median(timings) * 1000, 4),
+        "peak_kb": round(peak / 1024, 1),
+    }
+
+
+def _case_id(name: str, params: Dict[str, Any]) -> str:
+    """用例的唯一标识，用于对比两次结果"""
+    return name + "".join(f"[{key}={params[key]}]" for key in sorted(params))
+
+
+def _git_commit() -> Optional[str]:
+    """当前git提交，不在git仓库中时为None"""
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+            cwd=Path(__file__).resolve().parent, check=True,
+        )
+        return result.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _max_rss_kb() -> Optional[int]:
+    """进程的最大常驻内存（KB），不支持的平台为None"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS以字节为单位，Linux以KB为单位
+    return rss // 1024 if sys.platform == "darwin" else rss
+
+
+def run(cases: List[Case], repeat: int, cold: bool, verbose: bool = True) -> Dict[str, Any]:
+    """运行所有用例并汇总结果"""
+    results = []
+    for case in cases:
+        stats = measure(case.setup(), repeat, cold)
+        result = {"id": _case_id(case.name, case.params), "name": case.name,
+                  "params": case.params, **stats}
+        results.append(result)
+        if verbose:
+            print(f"{result['id']:<60} {stats['min_ms']:>10.3f} {stats['median_ms']:>10.3f} "
+                  f"{stats['peak_kb']:>10.1f}")
+
+    return {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "cool_qrcode": cool_qrcode.__version__,
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "pillow": PIL.__version__,
+            "platform": platform.platform(),
+            "repeat": repeat,
+            "cold": cold,
+            "max_rss_kb": _max_rss_kb(),
+        },
+        "results": results,
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """
+    与基线结果对比，打印每个用例的耗时变化
+
+    以最小耗时对比，比中位数更不容易受系统噪声影响。
+
+    Returns:
+        变慢超过阈值的用例标识列表
+    """
+    previous = {result["id"]: result for result in baseline["results"]}
+    regressions = []
+    print(f"\n对比基线 {baseline['meta'].get('commit')} -> {current['meta'].get('commit')}"
+          f"（阈值 {threshold:.0%}）")
+    for result in current["results"]:
+        old = previous.get(result["id"])
+        if old is None or old["min_ms"] <= 0:
+            continue
+        ratio = result["min_ms"] / old["min_ms"]
+        flag = ""
+        if ratio > 1 + threshold:
+            flag = "  变慢"
+            regressions.append(result["id"])
+        elif ratio < 1 - threshold:
+            flag = "  变快"
+        print(f"{result['id']:<60} {old['min_ms']:>10.3f} -> {result['min_ms']:>10.3f}"
+              f" {ratio:>7.2f}x{flag}")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """命令行入口"""
+    parser = argparse.ArgumentParser(description="Cool QRCode 性能基准")
+    parser.add_argument("--quick", action="store_true", help="只运行较少的版本和尺寸")
+    parser.add_argument("-k", dest="keyword", help="只运行名称包含该关键字的用例")
+    parser.add_argument("--repeat", type=int, default=5, help="每个用例的计时次数（默认5）")
+    parser.add_argument("--cold", action="store_true", help="每次调用前清空共享缓存")
+    parser.add_argument("--json", dest="json_path", help="把结果写入JSON文件")
+    parser.add_argument("--compare", help="与之前保存的JSON结果对比")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="对比时视为变化的比例（默认0.10）")
+    parser.add_argument("--fail-on-regression", action="store_true",
+                        help="有用例变慢超过阈值时返回非零退出码")
+    args = parser.parse_args(argv)
+
+    versions, sizes = (QUICK_VERSIONS, QUICK_SIZES) if args.quick else (VERSIONS, SIZES)
+    with tempfile.TemporaryDirectory() as directory:
+        cases = build_cases(versions, sizes, _make_logo(directory))
+        if args.keyword:
+            cases = [case for case in cases if args.keyword in case.name]
+        print(f"{'用例':<58} {'最小(ms)':>10} {'中位(ms)':>10} {'峰值(KB)':>10}")
+        report = run(cases, args.repeat, args.cold)
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n结果已写入 {args.json_path}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold)
+        if regressions and args.fail_on_regression:
+            print(f"\n{len(regressions)} 个用例变慢超过阈值")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
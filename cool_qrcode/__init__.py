@@ -6,21 +6,84 @@ __version__ = "0.1.1"
 __author__ = "Kelvin Xu"
 __email__ = "xxk59@hotmail.com"
 
-# 导入核心类（高级用户使用）
-from .core import CoolQRCode
 from .exceptions import CoolQRCodeError
 
-# 导入简化API（初学者使用）
-from .simple import (
-    make_cool_qrcode,        # 万能函数 - 支持所有功能组合的核心API
-    make_qrcode,
-    make_colorful_qrcode,
-    make_qrcode_with_logo,
-    make_qrcode_with_mask,
-    make_pretty_qrcode,
-    create_sample_logo,
-    PRETTY_COLORS
-)
+# 不导入typing（约十几毫秒），静态类型检查器按名称识别该常量
+TYPE_CHECKING = False
+
+# 公开API按需加载（PEP 562）：import cool_qrcode 时不导入qrcode、PIL和numpy，
+# 首次访问某个名称时才导入所在的子模块
+_LAZY_ATTRIBUTES = {
+    # 核心类（高级用户使用）
+    "CoolQRCode": ".core",
+
+    # 简化API（初学者使用）
+    "make_cool_qrcode": ".simple",
+    "make_cool_qrcode_batch": ".simple",
+    "make_qrcode": ".simple",
+    "make_colorful_qrcode": ".simple",
+    "make_qrcode_with_logo": ".simple",
+    "make_qrcode_with_mask": ".simple",
+    "make_pretty_qrcode": ".simple",
+    "create_sample_logo": ".simple",
+    "PRETTY_COLORS": ".simple",
+
+    # 模块矩阵与预编译样式模板
+    "QRMatrix": ".matrix",
+    "QRStyle": ".style",
+
+    # 多进程批量生成API
+    "make_cool_qrcode_parallel": ".parallel",
+    "BatchStats": ".parallel",
+
+    # 归档输出API
+    "make_cool_qrcode_archive": ".archive",
+    "ArchiveWriter": ".archive",
+
+    # 异步API
+    "amake_cool_qrcode": ".aio",
+    "AsyncRenderer": ".aio",
+
+    # 磁盘缓存与缓存统计（用于监控）
+    "DiskCache": ".cache",
+    "cache_stats": ".cache",
+}
+
+if TYPE_CHECKING:
+    from .core import CoolQRCode
+    from .simple import (
+        make_cool_qrcode,
+        make_cool_qrcode_batch,
+        make_qrcode,
+        make_colorful_qrcode,
+        make_qrcode_with_logo,
+        make_qrcode_with_mask,
+        make_pretty_qrcode,
+        create_sample_logo,
+        PRETTY_COLORS
+    )
+    from .matrix import QRMatrix
+    from .style import QRStyle
+    from .parallel import make_cool_qrcode_parallel, BatchStats
+    from .archive import make_cool_qrcode_archive, ArchiveWriter
+    from .aio import amake_cool_qrcode, AsyncRenderer
+    from .cache import DiskCache, cache_stats
+
+
+def __getattr__(name: str):
+    """首次访问公开API时导入对应的子模块，并缓存到包的命名空间"""
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
+
 
 __all__ = [
     # 核心类
@@ -29,11 +92,32 @@ __all__ = [
     
     # 简化API - 专为初学者设计
     "make_cool_qrcode",      # 💫 万能函数 - 支持所有效果组合的核心API
+    "make_cool_qrcode_batch",  # 批量生成相同样式的二维码
     "make_qrcode",           # 基本二维码
     "make_colorful_qrcode",  # 彩色二维码
     "make_qrcode_with_logo", # 带Logo二维码
     "make_qrcode_with_mask", # 带蒙板二维码
     "make_pretty_qrcode",    # 预设风格二维码
     "create_sample_logo",    # 创建示例Logo
-    "PRETTY_COLORS"          # 预设颜色
-] 
\ No newline at end of file
+    "PRETTY_COLORS",         # 预设颜色
+    
+    # 模块矩阵与预编译样式模板
+    "QRMatrix",
+    "QRStyle",
+    
+    # 多进程批量生成
+    "make_cool_qrcode_parallel",
+    "BatchStats",
+    
+    # 归档输出
+    "make_cool_qrcode_archive",
+    "ArchiveWriter",
+    
+    # 异步API
+    "amake_cool_qrcode",
+    "AsyncRenderer",
+    
+    # 缓存
+    "DiskCache",
+    "cache_stats",
+] 
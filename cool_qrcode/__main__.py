@@ -0,0 +1,9 @@
+"""
+支持以 ``python -m cool_qrcode`` 运行命令行工具
+"""
+
+import sys
+
+from .cli import main
+
+sys.exit(main())
@@ -0,0 +1,167 @@
+"""
+Cool QRCode 异步API
+
+生成二维码是CPU密集型操作，在事件循环中直接调用会阻塞其他协程数十毫秒。
+这里把渲染放到有界的线程池中执行，并用并发上限实现背压：超出上限的请求
+在事件循环中排队等待，不会提交到线程池，被取消时也就不会占用任何资源。
+"""
+
+import asyncio
+import functools
+import os
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional, TypeVar, Union
+
+from PIL import Image
+
+from .simple import make_cool_qrcode
+
+T = TypeVar("T")
+
+
+class AsyncRenderer:
+    """
+    有界的异步渲染执行器
+
+    max_workers 限制同时渲染的线程数，max_concurrency 限制已提交（正在渲染或
+    在线程池中排队）的任务数。其余调用在事件循环中等待，可以随时取消。
+    可在多个事件循环中共用，每个事件循环各自计数。
+
+    示例:
+        renderer = AsyncRenderer(max_workers=4, max_concurrency=16)
+        img = await amake_cool_qrcode("Hello", style="ocean", renderer=renderer)
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, max_concurrency: Optional[int] = None):
+        """
+        初始化执行器
+
+        Args:
+            max_workers: 渲染线程数，默认为CPU核心数（最多8个）
+            max_concurrency: 同时提交到线程池的任务上限，默认为渲染线程数的2倍
+
+        Raises:
+            ValueError: 当参数小于1时抛出
+        """
+        max_workers = max_workers or min(os.cpu_count() or 1, 8)
+        max_concurrency = max_concurrency or max_workers * 2
+        if max_workers < 1 or max_concurrency < 1:
+            raise ValueError("max_workers和max_concurrency必须大于0")
+        self.max_workers = max_workers
+        self.max_concurrency = max_concurrency
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="cool-qrcode")
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._lock = threading.Lock()
+        self.waiting = 0
+        self.running = 0
+
+    def _semaphore(self, loop: asyncio.AbstractEventLoop) -> asyncio.Semaphore:
+        """获取当前事件循环对应的并发信号量（在协程中调用）"""
+        with self._lock:
+            semaphore = self._semaphores.get(loop)
+            if semaphore is None:
+                semaphore = asyncio.Semaphore(self.max_concurrency)
+                self._semaphores[loop] = semaphore
+            return semaphore
+
+    async def run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        在线程池中执行func并等待结果
+
+        取消时：尚未开始执行的任务直接丢弃；已经在执行的任务无法中断，
+        它会在后台运行完毕，结果被丢弃，并发名额在它真正结束后才归还。
+
+        Args:
+            func: 要执行的函数
+            *args: 位置参数
+            **kwargs: 关键字参数
+
+        Returns:
+            func的返回值
+        """
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphore(loop)
+
+        self.waiting += 1
+        try:
+            await semaphore.acquire()
+        finally:
+            self.waiting -= 1
+
+        try:
+            future = self._executor.submit(functools.partial(func, *args, **kwargs))
+        except BaseException:
+            semaphore.release()
+            raise
+        self.running += 1
+
+        def release(_):
+            def done():
+                self.running -= 1
+                semaphore.release()
+            try:
+                loop.call_soon_threadsafe(done)
+            except RuntimeError:
+                # 事件循环已关闭，信号量也随之失效
+                pass
+
+        future.add_done_callback(release)
+        return await asyncio.wrap_future(future, loop=loop)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        关闭线程池
+
+        Args:
+            wait: 是否等待正在执行的任务完成
+        """
+        self._executor.shutdown(wait=wait)
+
+
+_default_renderer: Optional[AsyncRenderer] = None
+_default_lock = threading.Lock()
+
+
+def default_renderer() -> AsyncRenderer:
+    """
+    获取进程内共享的默认异步执行器，首次调用时创建
+
+    Returns:
+        默认的AsyncRenderer
+    """
+    global _default_renderer
+    with _default_lock:
+        if _default_renderer is None:
+            _default_renderer = AsyncRenderer()
+        return _default_renderer
+
+
+async def amake_cool_qrcode(
+    data: str,
+    *,
+    renderer: Optional[AsyncRenderer] = None,
+    **options: Any
+) -> Union[Image.Image, str]:
+    """
+    make_cool_qrcode 的异步版本，渲染在线程池中进行，不阻塞事件循环
+
+    参数:
+        data (str): 二维码内容
+        renderer (AsyncRenderer, 可选): 执行器，默认使用进程内共享的执行器
+        **options: 与 make_cool_qrcode 相同的参数
+
+    返回:
+        PIL.Image.Image，format为"svg"时返回SVG字符串
+
+    示例:
+        img = await amake_cool_qrcode("Hello", style="ocean", dot_shape="circle")
+
+        # 超时取消
+        img = await asyncio.wait_for(amake_cool_qrcode("Hello"), timeout=1.0)
+    """
+    renderer = renderer or default_renderer()
+    return await renderer.run(make_cool_qrcode, data, **options)
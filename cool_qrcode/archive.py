@@ -0,0 +1,220 @@
+"""
+Cool QRCode 归档输出模块
+
+把批量生成的图像直接流式写入一个zip或tar归档，代替成千上万个小文件。
+PNG本身已经压缩，归档条目一律不再压缩（zip为STORED），磁盘只有顺序写入。
+因此不支持tar.gz等整体压缩的tar格式：再压缩一遍PNG几乎不减小体积，却会占满CPU。
+"""
+
+import io
+import tarfile
+import time
+import zipfile
+from pathlib import Path
+from typing import Any, BinaryIO, Iterable, Optional, Tuple, Union
+
+from .parallel import make_cool_qrcode_parallel
+from .simple import make_cool_qrcode_batch
+
+ARCHIVE_FORMATS = ("zip", "tar")
+
+# 整体压缩的tar扩展名，会把已压缩的PNG再压缩一遍，明确拒绝而不是当作目录名
+COMPRESSED_TAR_SUFFIXES = (".tar.gz", ".tgz", ".tar.bz2", ".tbz2", ".tar.xz", ".txz")
+
+
+def archive_format_for(path: Union[str, Path]) -> Optional[str]:
+    """
+    按扩展名推断归档格式
+
+    Returns:
+        'zip' 或 'tar'，不是归档扩展名时返回None
+
+    Raises:
+        ValueError: 当扩展名为整体压缩的tar（如.tar.gz）时抛出
+    """
+    name = str(path).lower()
+    if name.endswith(".zip"):
+        return "zip"
+    if name.endswith(COMPRESSED_TAR_SUFFIXES):
+        raise ValueError(f"不支持压缩的tar归档（PNG已经压缩，不再重复压缩），请使用.tar或.zip: {path}")
+    if name.endswith(".tar"):
+        return "tar"
+    return None
+
+
+class _SequentialStream:
+    """
+    只追加写入的流包装
+
+    不提供seek，zipfile因此在每个条目后写数据描述符，而不是回头改写本地文件头；
+    写入位置由包装自己计数，目标也可以是管道或套接字。
+    """
+
+    def __init__(self, fileobj: BinaryIO):
+        self._fileobj = fileobj
+        self._offset = 0
+
+    def write(self, data: bytes) -> int:
+        self._fileobj.write(data)
+        self._offset += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._offset
+
+    def flush(self) -> None:
+        self._fileobj.flush()
+
+
+class ArchiveWriter:
+    """
+    流式归档写入器
+
+    每个条目写入后即可释放，内存占用与条目数量无关（zip只在内存中保留
+    每个条目一条中央目录记录，这是zip格式在文件末尾写目录所必需的）。
+    可以写入文件路径，也可以写入任意可写的二进制流（如标准输出）。
+
+    示例:
+        with ArchiveWriter("codes.zip") as archive:
+            for i, png in enumerate(make_cool_qrcode_batch(urls, format="PNG")):
+                archive.write(f"{i:06d}.png", png)
+    """
+
+    def __init__(
+        self,
+        target: Union[str, Path, BinaryIO],
+        archive_format: Optional[str] = None,
+        buffer_size: int = 1024 * 1024
+    ):
+        """
+        打开归档
+
+        Args:
+            target: 归档文件路径，或可写的二进制流
+            archive_format: 'zip' 或 'tar'，默认按文件扩展名推断，
+                写入流时默认为'tar'
+            buffer_size: 写文件时的缓冲区大小（字节），把小条目合并为大块顺序写入
+
+        Raises:
+            ValueError: 当归档格式无效或无法推断时抛出
+        """
+        if archive_format is None:
+            if isinstance(target, (str, Path)):
+                archive_format = archive_format_for(target)
+                if archive_format is None:
+                    raise ValueError(f"无法从文件名推断归档格式: {target}")
+            else:
+                archive_format = "tar"
+        if archive_format not in ARCHIVE_FORMATS:
+            raise ValueError(f"不支持的归档格式: {archive_format}，可选 {', '.join(ARCHIVE_FORMATS)}")
+
+        self.archive_format = archive_format
+        self.count = 0
+        self._owned: Optional[BinaryIO] = None
+        if isinstance(target, (str, Path)):
+            self._owned = open(target, "wb", buffering=buffer_size)
+            fileobj: BinaryIO = self._owned
+        else:
+            fileobj = target
+
+        # 同一归档内的条目使用相同的修改时间
+        self._mtime = time.time()
+        if archive_format == "zip":
+            self._archive: Any = zipfile.ZipFile(
+                _SequentialStream(fileobj), "w", compression=zipfile.ZIP_STORED
+            )
+        else:
+            self._archive = tarfile.open(fileobj=fileobj, mode="w|")
+
+    def write(self, name: str, payload: bytes) -> None:
+        """
+        写入一个条目
+
+        Args:
+            name: 条目在归档中的文件名
+            payload: 条目内容
+        """
+        if self.archive_format == "zip":
+            info = zipfile.ZipInfo(name, date_time=time.localtime(self._mtime)[:6])
+            info.compress_type = zipfile.ZIP_STORED
+            self._archive.writestr(info, payload)
+        else:
+            info = tarfile.TarInfo(name)
+            info.size = len(payload)
+            info.mtime = int(self._mtime)
+            self._archive.addfile(info, io.BytesIO(payload))
+            # 流式写入不需要回看成员列表，及时释放以保持内存恒定
+            self._archive.members.clear()
+        self.count += 1
+
+    def write_all(self, entries: Iterable[Tuple[str, bytes]]) -> int:
+        """
+        依次写入所有 (文件名, 内容) 条目
+
+        Returns:
+            本次写入的条目数
+        """
+        written = 0
+        for name, payload in entries:
+            self.write(name, payload)
+            written += 1
+        return written
+
+    def close(self) -> None:
+        """写入归档结尾（zip中央目录或tar结束块）并关闭自己打开的文件"""
+        try:
+            self._archive.close()
+        finally:
+            if self._owned is not None:
+                self._owned.close()
+
+    def __enter__(self) -> "ArchiveWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def make_cool_qrcode_archive(
+    datas: Iterable[str],
+    target: Union[str, Path, BinaryIO],
+    archive_format: Optional[str] = None,
+    name_template: str = "{index:06d}",
+    format: str = "PNG",
+    workers: int = 1,
+    **options: Any
+) -> int:
+    """
+    批量生成二维码并直接写入一个归档文件
+
+    生成与写入交替进行，任何时刻只有少量已编码的图像在内存中。
+
+    参数:
+        datas: 二维码内容序列，可以是列表或生成器
+        target: 归档文件路径（.zip/.tar），或可写的二进制流
+        archive_format: 归档格式，默认按扩展名推断
+        name_template: 条目文件名模板，{index}为从0开始的序号，扩展名自动添加
+        format: 图像格式，如 "PNG"
+        workers: 进程数，大于1时使用 make_cool_qrcode_parallel
+        **options: 传递给 make_cool_qrcode_batch 的样式参数
+
+    返回:
+        写入的二维码数量
+
+    示例:
+        urls = (f"https://example.com/{i}" for i in range(100000))
+        make_cool_qrcode_archive(urls, "codes.zip", style="ocean", workers=8)
+    """
+    extension = {"jpeg": "jpg"}.get(format.lower(), format.lower())
+
+    if workers > 1:
+        outputs = make_cool_qrcode_parallel(datas, workers=workers, format=format, **options)
+    else:
+        outputs = make_cool_qrcode_batch(datas, format=format, **options)
+
+    def entries() -> Iterable[Tuple[str, bytes]]:
+        for index, payload in enumerate(outputs):
+            yield f"{name_template.format(index=index)}.{extension}", payload
+
+    with ArchiveWriter(target, archive_format) as archive:
+        return archive.write_all(entries())
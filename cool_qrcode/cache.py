@@ -0,0 +1,350 @@
+"""
+Cool QRCode缓存模块
+"""
+
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, List, NamedTuple, Optional, Tuple, Union
+
+
+class CacheInfo(NamedTuple):
+    """缓存统计信息"""
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+    nbytes: int = 0
+    maxbytes: Optional[int] = None
+    evictions: int = 0
+
+
+class LRUCache:
+    """
+    线程安全的有界LRU缓存
+
+    超出容量时淘汰最久未使用的条目。指定sizeof后还可以按内存预算限制，
+    单个超出预算的值会照常返回，但不会留在缓存中。缓存的值会被多个调用方共享，
+    取出后不要原地修改。
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 128,
+        maxbytes: Optional[int] = None,
+        sizeof: Optional[Callable[[Any], int]] = None
+    ):
+        """
+        初始化缓存
+
+        Args:
+            maxsize: 最多缓存的条目数
+            maxbytes: 内存预算（字节），为None时只按条目数限制
+            sizeof: 计算单个值占用字节数的函数，指定maxbytes时必须提供
+        """
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._sizes: Dict[Hashable, int] = {}
+        self._lock = threading.Lock()
+        self._sizeof = sizeof
+        self._nbytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self.maxsize = 0
+        self.maxbytes: Optional[int] = None
+        self.resize(maxsize, maxbytes)
+
+    def resize(self, maxsize: Optional[int] = None, maxbytes: Optional[int] = None) -> None:
+        """
+        调整缓存容量和内存预算，超出部分立即淘汰
+
+        Args:
+            maxsize: 新的最大条目数，为None时保持不变
+            maxbytes: 新的内存预算（字节），为None时保持不变
+
+        Raises:
+            ValueError: 当容量或预算无效时抛出
+        """
+        if maxsize is not None and maxsize < 1:
+            raise ValueError("maxsize必须大于0")
+        if maxbytes is not None:
+            if maxbytes < 1:
+                raise ValueError("maxbytes必须大于0")
+            if self._sizeof is None:
+                raise ValueError("按内存预算限制时必须提供sizeof")
+        with self._lock:
+            if maxsize is not None:
+                self.maxsize = maxsize
+            if maxbytes is not None:
+                self.maxbytes = maxbytes
+            self._evict()
+
+    def _evict(self) -> None:
+        """淘汰最久未使用的条目，直到满足容量和内存预算（调用方需持有锁）"""
+        while self._data and (
+            len(self._data) > self.maxsize
+            or (self.maxbytes is not None and self._nbytes > self.maxbytes)
+        ):
+            key, _ = self._data.popitem(last=False)
+            self._nbytes -= self._sizes.pop(key, 0)
+            self._evictions += 1
+
+    def get_or_create(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """
+        获取缓存值，未命中时调用factory创建并写入缓存
+
+        factory在锁外执行，并发未命中同一个键时可能重复创建，
+        但只会保留先写入的那一份。
+
+        Args:
+            key: 缓存键
+            factory: 无参函数，返回要缓存的值
+
+        Returns:
+            缓存的值
+        """
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self._hits += 1
+                return self._data[key]
+            self._misses += 1
+
+        value = factory()
+        nbytes = self._sizeof(value) if self._sizeof is not None else 0
+
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                return self._data[key]
+            self._data[key] = value
+            self._sizes[key] = nbytes
+            self._nbytes += nbytes
+            self._evict()
+        return value
+
+    def info(self) -> CacheInfo:
+        """
+        获取缓存统计信息
+
+        Returns:
+            包含命中数、未命中数、容量、当前条目数、占用字节数、
+            内存预算和淘汰次数的CacheInfo
+        """
+        with self._lock:
+            return CacheInfo(
+                self._hits, self._misses, self.maxsize, len(self._data),
+                self._nbytes, self.maxbytes, self._evictions
+            )
+
+    def clear(self) -> None:
+        """
+        清空缓存并重置统计信息
+        """
+        with self._lock:
+            self._data.clear()
+            self._sizes.clear()
+            self._nbytes = 0
+            self._hits = 0
+            self._misses = 0
+            self._evictions = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+
+class DiskCache:
+    """
+    内容寻址的磁盘缓存，存放编码后的字节数据
+
+    键为内容摘要（十六进制字符串），文件按键的前两位分散到256个子目录，
+    避免单个目录下文件过多。写入先写临时文件再原子替换，多个进程可以
+    共用同一个缓存目录。总大小超过上限时按最近使用时间淘汰到上限的90%。
+    """
+
+    def __init__(self, directory: Union[str, Path], max_bytes: int = 256 * 1024 * 1024):
+        """
+        打开（必要时创建）缓存目录
+
+        Args:
+            directory: 缓存目录
+            max_bytes: 缓存总大小上限（字节）
+
+        Raises:
+            ValueError: 当max_bytes无效时抛出
+        """
+        if max_bytes < 1:
+            raise ValueError("max_bytes必须大于0")
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        entries = self._entries()
+        self._count = len(entries)
+        self._nbytes = sum(size for _, size, _ in entries)
+
+    def _path(self, key: str) -> Path:
+        """键对应的文件路径"""
+        if len(key) < 3 or not all(c in "0123456789abcdef" for c in key):
+            raise ValueError(f"无效的缓存键: {key!r}")
+        return self.directory / key[:2] / key
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        读取缓存内容
+
+        Args:
+            key: 内容摘要
+
+        Returns:
+            缓存的字节数据，未命中时为None
+        """
+        path = self._path(key)
+        try:
+            payload = path.read_bytes()
+        except FileNotFoundError:
+            with self._lock:
+                self._misses += 1
+            return None
+        try:
+            # 刷新修改时间，作为最近使用时间参与淘汰
+            os.utime(path)
+        except OSError:
+            pass
+        with self._lock:
+            self._hits += 1
+        return payload
+
+    def put(self, key: str, payload: bytes) -> None:
+        """
+        写入缓存内容，超出大小上限时淘汰最久未使用的条目
+
+        Args:
+            key: 内容摘要
+            payload: 字节数据
+        """
+        path = self._path(key)
+        path.parent.mkdir(exist_ok=True)
+        fd, temp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(payload)
+            # 替换已有条目时只计入大小的变化
+            try:
+                replaced = path.stat().st_size
+            except FileNotFoundError:
+                replaced = None
+            os.replace(temp, path)
+        except BaseException:
+            try:
+                os.unlink(temp)
+            except OSError:
+                pass
+            raise
+
+        with self._lock:
+            if replaced is None:
+                self._count += 1
+                self._nbytes += len(payload)
+            else:
+                self._nbytes += len(payload) - replaced
+            if self._nbytes > self.max_bytes:
+                self._evict()
+
+    def _entries(self) -> List[Tuple[int, int, str]]:
+        """扫描缓存目录，返回 (修改时间, 大小, 路径) 列表"""
+        entries = []
+        for shard in os.scandir(self.directory):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if entry.is_file() and not entry.name.endswith(".tmp"):
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+        return entries
+
+    def _evict(self) -> None:
+        """淘汰最久未使用的条目，直到总大小降到上限的90%（调用方需持有锁）"""
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        count = len(entries)
+        target = self.max_bytes * 9 // 10
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            count -= 1
+            self._evictions += 1
+        self._nbytes = total
+        self._count = count
+
+    def info(self) -> CacheInfo:
+        """
+        获取缓存统计信息
+
+        Returns:
+            CacheInfo，其中maxsize为0表示不限条目数，nbytes为估计的总大小
+        """
+        with self._lock:
+            return CacheInfo(
+                self._hits, self._misses, 0, self._count,
+                self._nbytes, self.max_bytes, self._evictions
+            )
+
+    def clear(self) -> None:
+        """
+        删除所有缓存文件并重置统计信息
+        """
+        with self._lock:
+            for _, _, path in self._entries():
+                try:
+                    os.unlink(path)
+                except FileNotFoundError:
+                    pass
+            self._count = 0
+            self._nbytes = 0
+            self._hits = 0
+            self._misses = 0
+            self._evictions = 0
+
+
+# 预处理后的Logo图块缓存，键为 (路径, 修改时间, 目标大小, 是否圆形, 边框大小)
+logo_cache = LRUCache(maxsize=32)
+
+# 模块矩阵（QRMatrix）缓存，键为 (数据, 起始版本, 纠错级别)。
+# 按打包数据的字节数计入内存预算，展开后的布尔数组不随矩阵缓存
+matrix_cache = LRUCache(maxsize=1024, maxbytes=32 * 1024 * 1024, sizeof=lambda matrix: matrix.nbytes)
+
+# Logo文件内容摘要缓存，键为 (路径, 修改时间, 文件大小)
+logo_digest_cache = LRUCache(maxsize=64)
+
+# 圆形码点图块缓存，键为 (形状, 码点尺寸, 亚像素相位, 相位间距, 渲染质量)，按图块数组的字节数计入内存预算。
+# 图块只记录覆盖率，颜色在上色时通过调色板统一处理，因此不同颜色共用同一图块
+sprite_cache = LRUCache(maxsize=256, maxbytes=16 * 1024 * 1024, sizeof=lambda sprite: sprite.nbytes)
+
+
+def cache_stats() -> Dict[str, CacheInfo]:
+    """
+    汇总进程内所有共享缓存的统计信息，便于监控
+
+    Returns:
+        缓存名称到CacheInfo的字典
+    """
+    return {
+        'logo': logo_cache.info(),
+        'matrix': matrix_cache.info(),
+        'sprite': sprite_cache.info(),
+    }
@@ -0,0 +1,287 @@
+"""
+Cool QRCode 命令行工具
+
+从CSV、JSONL或标准输入批量读取二维码内容，按统一样式生成图像，
+写入目录或tar/zip归档，结束时输出吞吐量和单个二维码耗时的百分位数。
+
+示例:
+    cool-qrcode urls.csv --column url --style ocean --dot-shape circle -o out/
+    cool-qrcode items.jsonl --logo logo.png --jobs 8 -o codes.zip
+    seq 1 1000 | cool-qrcode - -o - > codes.tar
+"""
+
+import argparse
+import csv
+import json
+import os
+import re
+import sys
+import time
+from array import array
+from collections import deque
+from pathlib import Path
+from typing import IO, Iterator, Optional, Sequence, Tuple
+
+from PIL import Image
+
+from . import __version__
+from .archive import ArchiveWriter, archive_format_for
+from .exceptions import CoolQRCodeError
+from .parallel import BatchStats, make_cool_qrcode_parallel, timed
+from .simple import PRETTY_COLORS, make_cool_qrcode_batch
+
+
+def read_records(
+    stream: IO[str],
+    input_format: str = "lines",
+    column: Optional[str] = None,
+    name_column: Optional[str] = None,
+) -> Iterator[Tuple[str, str]]:
+    """
+    逐条读取二维码内容
+
+    Args:
+        stream: 文本输入流
+        input_format: 'csv'、'jsonl' 或 'lines'（每行一条内容）
+        column: 内容所在的列（CSV）或键（JSONL），默认为 'data'，
+            CSV没有该列时使用第一列
+        name_column: 输出文件名所在的列或键，默认按序号命名
+
+    Returns:
+        生成器，逐条产生 (输出文件名, 二维码内容)，跳过空内容
+    """
+    if input_format == "csv":
+        reader = csv.DictReader(stream)
+        fields = reader.fieldnames or []
+        if column is None:
+            column = "data" if "data" in fields else (fields[0] if fields else None)
+        for key in (column, name_column):
+            if key is not None and key not in fields:
+                raise CoolQRCodeError(f"CSV中没有列: {key}")
+        rows = ((row.get(column) or "", row.get(name_column) if name_column else None)
+                for row in reader)
+    elif input_format == "jsonl":
+        rows = _jsonl_rows(stream, column or "data", name_column)
+    elif input_format == "lines":
+        rows = ((line.rstrip("\r\n"), None) for line in stream)
+    else:
+        raise ValueError(f"不支持的输入格式: {input_format}")
+
+    for index, (data, name) in enumerate(rows):
+        if not data:
+            continue
+        yield _safe_name(name) if name else f"{index:06d}", data
+
+
+def _jsonl_rows(
+    stream: IO[str], column: str, name_column: Optional[str]
+) -> Iterator[Tuple[str, Optional[str]]]:
+    """解析JSONL：每行是字符串，或包含内容键的对象"""
+    for number, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            raise CoolQRCodeError(f"第{number}行不是有效的JSON: {e}")
+        if isinstance(record, str):
+            yield record, None
+        elif isinstance(record, dict):
+            name = record.get(name_column) if name_column else None
+            yield str(record.get(column) or ""), None if name is None else str(name)
+        else:
+            raise CoolQRCodeError(f"第{number}行应为字符串或对象")
+
+
+def _safe_name(name: str) -> str:
+    """把文件名中的路径分隔符等字符替换掉，避免写出到输出目录之外"""
+    name = re.sub(r'[\\/:*?"<>|\x00-\x1f]', "_", name).strip(". ")
+    return name or "_"
+
+
+def _detect_input_format(path: str) -> str:
+    """按扩展名推断输入格式"""
+    suffix = Path(path).suffix.lower()
+    if suffix == ".csv":
+        return "csv"
+    if suffix in (".jsonl", ".ndjson"):
+        return "jsonl"
+    return "lines"
+
+
+class _DirectorySink:
+    """把每个二维码写成输出目录下的单独文件"""
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def write(self, name: str, payload: bytes) -> None:
+        (self.directory / name).write_bytes(payload)
+
+    def close(self) -> None:
+        pass
+
+
+def _open_sink(output: str):
+    """按输出路径选择写入方式：'-'为写到标准输出的tar流，.zip/.tar为归档，其余为目录"""
+    if output == "-":
+        return ArchiveWriter(sys.stdout.buffer, "tar")
+    if archive_format_for(output) is not None:
+        return ArchiveWriter(output)
+    return _DirectorySink(output)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """创建命令行参数解析器"""
+    parser = argparse.ArgumentParser(
+        prog="cool-qrcode",
+        description="从CSV/JSONL/标准输入批量生成酷炫二维码",
+    )
+    parser.add_argument("input", nargs="?", default="-",
+                        help="输入文件，'-'表示标准输入（默认）")
+    parser.add_argument("-o", "--output", default="qrcodes",
+                        help="输出目录，或 .zip/.tar 归档，'-'表示把tar流写到标准输出"
+                             "（默认: qrcodes）")
+    parser.add_argument("--input-format", choices=["auto", "csv", "jsonl", "lines"],
+                        default="auto", help="输入格式，默认按扩展名推断，标准输入为每行一条")
+    parser.add_argument("--column", help="内容所在的CSV列或JSON键（默认: data）")
+    parser.add_argument("--name-column", help="输出文件名所在的CSV列或JSON键（默认按序号命名）")
+
+    style = parser.add_argument_group("样式")
+    style.add_argument("--size", type=int, default=500, help="图片大小（像素，默认500）")
+    style.add_argument("--style", choices=sorted(PRETTY_COLORS), help="预设风格")
+    style.add_argument("--fill-color", default="black", help="前景色（默认black）")
+    style.add_argument("--back-color", default="white", help="背景色（默认white）")
+    style.add_argument("--dot-shape", choices=["square", "circle"], default="square",
+                       help="码点形状（默认square）")
+    style.add_argument("--quality", default="fast",
+                       help="渲染质量：fast、aa 或 supersample-N（默认fast）")
+    style.add_argument("--logo", help="Logo图片路径")
+    style.add_argument("--square-logo", action="store_true", help="Logo保持方形，不裁剪为圆形")
+    style.add_argument("--mask-color", help="蒙板颜色")
+    style.add_argument("--mask-opacity", type=float, default=0.3, help="蒙板透明度（默认0.3）")
+    style.add_argument("--format", default="PNG", help="图像格式，PIL支持写出的格式名或扩展名（默认PNG）")
+
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="并行进程数，大于1时使用多进程（默认1）")
+    parser.add_argument("--chunksize", type=int, default=64,
+                        help="多进程时每个任务块的条数（默认64）")
+    parser.add_argument("-q", "--quiet", action="store_true", help="不输出统计信息")
+    parser.add_argument("--version", action="version", version=f"%(prog)s {__version__}")
+    return parser
+
+
+def _image_format(name: str) -> Optional[str]:
+    """把 --format 的值规范化为PIL可写出的格式名，不支持时为None"""
+    Image.init()
+    fmt = name.upper()
+    if fmt in Image.SAVE:
+        return fmt
+    # 也接受扩展名写法，如 jpg、tif
+    fmt = Image.registered_extensions().get(f".{name.lower()}")
+    return fmt if fmt in Image.SAVE else None
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """
+    命令行入口
+
+    Args:
+        argv: 命令行参数，默认读取 sys.argv
+
+    Returns:
+        进程退出码
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.jobs < 1:
+        parser.error("--jobs必须大于0")
+    if args.input != "-" and not Path(args.input).is_file():
+        parser.error(f"输入文件不存在: {args.input}")
+    if args.logo and not Path(args.logo).is_file():
+        parser.error(f"Logo文件不存在: {args.logo}")
+    image_format = _image_format(args.format)
+    if image_format is None:
+        parser.error(f"不支持的图像格式: {args.format}")
+    if args.output != "-":
+        try:
+            archive_format_for(args.output)
+        except ValueError as e:
+            parser.error(str(e))
+
+    input_format = args.input_format
+    if input_format == "auto":
+        input_format = "lines" if args.input == "-" else _detect_input_format(args.input)
+
+    options = dict(
+        size=args.size,
+        fill_color=args.fill_color,
+        back_color=args.back_color,
+        style=args.style,
+        dot_shape=args.dot_shape,
+        quality=args.quality,
+        logo_path=args.logo,
+        logo_circular=not args.square_logo,
+        mask_color=args.mask_color,
+        mask_opacity=args.mask_opacity,
+        format=image_format,
+    )
+    extension = {"jpeg": "jpg"}.get(image_format.lower(), image_format.lower())
+
+    stream = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8", newline="")
+    sink = None
+    stats = BatchStats()
+    start = time.perf_counter()
+    try:
+        # 文件名与内容分开传递：生成结果保持输入顺序，按顺序取回对应的文件名
+        names: "deque[str]" = deque()
+
+        def datas() -> Iterator[str]:
+            for name, data in read_records(stream, input_format, args.column, args.name_column):
+                names.append(name)
+                yield data
+
+        if args.jobs > 1:
+            outputs = make_cool_qrcode_parallel(
+                datas(), workers=args.jobs, chunksize=args.chunksize, stats=stats, **options
+            )
+        else:
+            latencies = array("d")
+            outputs = timed(make_cool_qrcode_batch(datas(), **options), latencies)
+
+        sink = _open_sink(args.output)
+        for payload in outputs:
+            sink.write(f"{names.popleft()}.{extension}", payload)
+        sink.close()
+
+        if args.jobs == 1:
+            stats.record(os.getpid(), len(latencies), sum(latencies), latencies)
+        stats.wall_seconds = time.perf_counter() - start
+    except (CoolQRCodeError, OSError, ValueError) as e:
+        print(f"cool-qrcode: 错误: {e}", file=sys.stderr)
+        if sink is not None:
+            # 已写出的部分尽量保留，输出端已断开时忽略
+            try:
+                sink.close()
+            except OSError:
+                pass
+        return 1
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+    if not args.quiet:
+        print(
+            f"已生成 {stats.items} 个二维码，用时 {stats.wall_seconds:.2f} 秒，"
+            f"吞吐量 {stats.throughput:.1f} 个/秒，"
+            f"单个耗时 p50={stats.percentile(50) * 1000:.1f}ms "
+            f"p99={stats.percentile(99) * 1000:.1f}ms",
+            file=sys.stderr,
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,85 @@
+"""
+Cool QRCode颜色解析模块
+"""
+
+from functools import lru_cache
+from typing import Optional, Tuple, Union
+
+from PIL import ImageColor
+
+from .exceptions import InvalidColorError
+
+ColorType = Union[str, Tuple[int, ...]]
+
+
+TRANSPARENT = (0, 0, 0, 0)
+
+
+def resolve_color(color: Optional[ColorType]) -> Tuple[int, int, int, int]:
+    """
+    将颜色解析为RGBA元组，每种颜色每个进程只解析一次
+
+    支持完整的CSS颜色名称（如"rebeccapurple"）及CSS关键字"transparent"、
+    十六进制（"#FFF"、"#FFF8"、"#FF5733"、"#FF573380"）、
+    "rgb()"/"rgba()"/"hsl()"/"hsv()"函数写法，以及3或4个整数组成的元组。
+    None视为透明（与PIL的 Image.new 一致）。
+
+    Args:
+        color: 颜色
+
+    Returns:
+        (r, g, b, a) 元组
+
+    Raises:
+        InvalidColorError: 当颜色无法识别时抛出
+    """
+    try:
+        return _resolve_color(color)
+    except TypeError:
+        # 列表等不可哈希的值无法作为缓存键
+        raise InvalidColorError(f"无效的颜色: {color!r}") from None
+
+
+@lru_cache(maxsize=1024)
+def _resolve_color(color: Optional[ColorType]) -> Tuple[int, int, int, int]:
+    """带缓存的颜色解析，见 ``resolve_color``"""
+    if color is None:
+        return TRANSPARENT
+
+    if isinstance(color, tuple):
+        if len(color) in (3, 4) and all(isinstance(v, int) and 0 <= v <= 255 for v in color):
+            return tuple(color) + (255,) * (4 - len(color))
+        raise InvalidColorError(f"无效的颜色: {color!r}")
+
+    if not isinstance(color, str):
+        raise InvalidColorError(f"无效的颜色: {color!r}")
+
+    if color.strip().lower() == "transparent":
+        return TRANSPARENT
+
+    try:
+        rgba = ImageColor.getrgb(color.strip())
+    except ValueError:
+        raise InvalidColorError(f"无效的颜色: {color!r}") from None
+    return rgba + (255,) * (4 - len(rgba))
+
+
+# 保留lru_cache的统计与清空接口
+resolve_color.cache_info = _resolve_color.cache_info
+resolve_color.cache_clear = _resolve_color.cache_clear
+
+
+def to_hex(color: ColorType) -> str:
+    """
+    将颜色转换为十六进制写法，不透明时为"#rrggbb"，否则为"#rrggbbaa"
+
+    Args:
+        color: 任意 ``resolve_color`` 支持的颜色
+
+    Returns:
+        十六进制颜色字符串
+    """
+    r, g, b, a = resolve_color(color)
+    if a == 255:
+        return f"#{r:02x}{g:02x}{b:02x}"
+    return f"#{r:02x}{g:02x}{b:02x}{a:02x}"
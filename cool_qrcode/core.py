@@ -4,18 +4,195 @@ Cool QRCode核心模块
 
 import qrcode
 from qrcode.constants import ERROR_CORRECT_M
+from qrcode.exceptions import DataOverflowError
 from PIL import Image, ImageDraw, ImageChops
 import io
-import numpy as np
-from typing import Union, Optional, Literal
+from typing import TYPE_CHECKING, Any, BinaryIO, Dict, Tuple, Union, Optional, Literal
 from pathlib import Path
+from qrcode.image.pil import PilImage
+from qrcode.util import QRData
 
 from .exceptions import InvalidDataError, InvalidLogoError, ImageGenerationError
+from .raster import rasterize_dots, colorize
+from .cache import logo_cache, matrix_cache
+from .svg import render_svg
+from .png import matrix_to_png, scale_matrix
+from .tiled import render_tiled, write_tiled_png
+from .colors import resolve_color
+from .matrix import QRMatrix
+
+if TYPE_CHECKING:
+    from .aio import AsyncRenderer
+
+
+def load_logo(
+    logo_path: Union[str, Path],
+    logo_size: int,
+    circular: bool = False,
+    border_size: int = 0
+) -> Image.Image:
+    """
+    加载并预处理Logo，结果按 (路径, 修改时间, 大小, 是否圆形, 边框) 缓存
+    
+    Args:
+        logo_path: Logo文件路径
+        logo_size: Logo缩放后的边长（不含边框）
+        circular: 是否将Logo处理成圆形
+        border_size: Logo周围的白色边框大小
+        
+    Returns:
+        RGBA模式的Logo图像。该图像在调用方之间共享，请勿原地修改
+    """
+    logo_path = Path(logo_path)
+    key = (
+        str(logo_path.resolve()),
+        logo_path.stat().st_mtime_ns,
+        logo_size,
+        circular,
+        border_size,
+    )
+    return logo_cache.get_or_create(
+        key, lambda: _prepare_logo(logo_path, logo_size, circular, border_size)
+    )
+
+
+def encode_matrix(
+    data: Union[str, bytes],
+    version: int = 1,
+    error_correction: int = ERROR_CORRECT_M
+) -> QRMatrix:
+    """
+    将数据编码为模块矩阵（不含空白边框），结果在进程内共享缓存
+    
+    与CoolQRCode使用同一个缓存：相同的 (数据, 版本, 纠错级别) 只编码一次。
+    
+    Args:
+        data: 要编码的数据
+        version: 起始版本（1-40），数据放不下时自动增大
+        error_correction: 纠错级别
+        
+    Returns:
+        QRMatrix对象
+        
+    Raises:
+        InvalidDataError: 当数据为空或超出二维码容量时抛出
+    """
+    if not data:
+        raise InvalidDataError("数据不能为空")
+    try:
+        return _cached_matrix((data,), version, error_correction)
+    except Exception as e:
+        raise InvalidDataError(f"编码数据失败: {str(e)}")
+
+
+def _encode(
+    chunks: Tuple[Union[str, bytes], ...],
+    version: int,
+    error_correction: int,
+    fit: bool
+) -> QRMatrix:
+    """
+    用一个临时的qrcode.QRCode编码数据
+
+    fit为False时使用指定的版本；数据放不下时与qrcode首次生成图像时一样
+    自动选择能容纳数据的版本，而不是抛出异常。
+    """
+    qr = qrcode.QRCode(version=version, error_correction=error_correction)
+    for chunk in chunks:
+        qr.add_data(chunk)
+    try:
+        qr.make(fit=fit)
+    except DataOverflowError:
+        if fit:
+            raise
+        qr.make(fit=True)
+    return QRMatrix.from_modules(qr.modules)
+
+
+def _cached_matrix(
+    chunks: Tuple[Union[str, bytes], ...],
+    version: int,
+    error_correction: int,
+    fit: bool = True
+) -> QRMatrix:
+    """
+    编码数据并按 (数据, 版本, 纠错级别) 共享缓存
+    
+    编码（尤其是8种掩码图案的评估）是长数据最耗时的部分。编码不修改任何
+    共享状态，可以在多个线程中同时调用；QRMatrix不可变，可以安全共享。
+    """
+    key = (chunks, version, error_correction) if fit else (chunks, version, error_correction, False)
+    return matrix_cache.get_or_create(key, lambda: _encode(chunks, version, error_correction, fit))
+
+
+def _encoder_options(
+    compress_level: Optional[int],
+    optimize: bool,
+    extra: Dict[str, Any]
+) -> Dict[str, Any]:
+    """合并编码器参数，只传递显式指定的选项"""
+    options = dict(extra)
+    if compress_level is not None:
+        options['compress_level'] = compress_level
+    if optimize:
+        options['optimize'] = True
+    return options
+
+
+def _prepare_logo(
+    logo_path: Path,
+    logo_size: int,
+    circular: bool,
+    border_size: int
+) -> Image.Image:
+    """从磁盘读取Logo并完成缩放、圆形裁剪和加边框"""
+    # 打开logo图像
+    with Image.open(logo_path) as source:
+        logo = source.convert('RGBA')
+    
+    # 调整logo大小
+    logo = logo.resize((logo_size, logo_size), Image.Resampling.LANCZOS)
+    
+    # 如果需要圆形处理
+    if circular:
+        # 获取logo原有alpha通道
+        logo_alpha = logo.split()[-1]
+        
+        # 创建圆形遮罩
+        mask = Image.new('L', (logo_size, logo_size), 0)
+        draw_mask = ImageDraw.Draw(mask)
+        draw_mask.ellipse((0, 0, logo_size, logo_size), fill=255)
+        
+        # 合并原alpha和圆形遮罩
+        final_alpha = ImageChops.multiply(logo_alpha, mask)
+        logo.putalpha(final_alpha)
+    
+    # 创建带白色边框的logo
+    if border_size > 0:
+        bordered_size = logo_size + 2 * border_size
+        if circular:
+            # 圆形边框
+            bordered_logo = Image.new('RGBA', (bordered_size, bordered_size), (0, 0, 0, 0))
+            draw_border = ImageDraw.Draw(bordered_logo)
+            draw_border.ellipse((0, 0, bordered_size, bordered_size), fill='white')
+        else:
+            # 方形边框
+            bordered_logo = Image.new('RGBA', (bordered_size, bordered_size), 'white')
+        
+        # 计算logo在边框中的位置
+        bordered_logo.paste(logo, (border_size, border_size), logo)
+        logo = bordered_logo
+    
+    return logo
 
 
 class CoolQRCode:
     """
     Cool QRCode主类，用于生成个性化二维码
+    
+    数据以不可变元组保存，编码结果是不可变的QRMatrix，所有生成方法都不修改
+    对象状态，因此同一个对象可以在线程池中被多个线程同时用于生成图像。
+    add_data和clear会修改数据，不要与生成同时调用。
     """
     
     def __init__(
@@ -35,9 +212,15 @@ class CoolQRCode:
             error_correction: 纠错级别
             box_size: 每个小方块的像素大小
             border: 边框大小
-            fill_color: 前景色
+            fill_color: 前景色，支持CSS颜色名称、十六进制（含透明度）和rgb()等写法
             back_color: 背景色
+            
+        Raises:
+            InvalidColorError: 当颜色无法识别时抛出
         """
+        resolve_color(fill_color)
+        resolve_color(back_color)
+        
         self.qr = qrcode.QRCode(
             version=version,
             error_correction=error_correction,
@@ -46,7 +229,14 @@ class CoolQRCode:
         )
         self.fill_color = fill_color
         self.back_color = back_color
-        self._data_added = False
+        self._version = version
+        self._error_correction = error_correction
+        self._data_chunks: Tuple[Union[str, bytes], ...] = ()
+    
+    @property
+    def _data_added(self) -> bool:
+        """是否已添加数据"""
+        return bool(self._data_chunks)
     
     def add_data(self, data: Union[str, bytes]) -> None:
         """
@@ -62,17 +252,44 @@ class CoolQRCode:
             raise InvalidDataError("数据不能为空")
         
         try:
-            self.qr.add_data(data)
-            self._data_added = True
+            QRData(data)
         except Exception as e:
             raise InvalidDataError(f"添加数据失败: {str(e)}")
+        
+        # 替换而不是原地追加，正在生成的线程仍使用它取到的旧元组
+        self._data_chunks = self._data_chunks + (data,)
     
-    def make_image(self, fit: bool = True) -> Image.Image:
+    def encode(self, fit: bool = True) -> QRMatrix:
+        """
+        编码当前数据，返回不可变的模块矩阵
+        
+        结果可以传给各生成方法的matrix参数，多次生成同一个二维码时只取一次数据。
+        
+        Args:
+            fit: 是否自动调整二维码大小；为False时使用构造时指定的版本，
+                数据放不下时仍自动选择版本（与qrcode首次生成时相同）
+            
+        Returns:
+            QRMatrix对象
+            
+        Raises:
+            ImageGenerationError: 当未添加数据或数据超出容量时抛出
+        """
+        chunks = self._data_chunks
+        if not chunks:
+            raise ImageGenerationError("请先添加数据再生成图像")
+        try:
+            return _cached_matrix(chunks, self._version, self._error_correction, fit)
+        except Exception as e:
+            raise ImageGenerationError(f"编码数据失败: {str(e)}")
+    
+    def make_image(self, fit: bool = True, matrix: Optional[QRMatrix] = None) -> Image.Image:
         """
         生成二维码图像
         
         Args:
             fit: 是否自动调整二维码大小
+            matrix: 已编码的模块矩阵（见 ``encode``），指定时不再取数据编码
             
         Returns:
             PIL Image对象
@@ -80,17 +297,22 @@ class CoolQRCode:
         Raises:
             ImageGenerationError: 当图像生成失败时抛出
         """
-        if not self._data_added:
-            raise ImageGenerationError("请先添加数据再生成图像")
+        if matrix is None:
+            matrix = self.encode(fit)
         
         try:
-            if fit:
-                self.qr.make(fit=True)
-            
-            img = self.qr.make_image(
+            # 与qrcode的make_image逐像素一致，但深色模块由放大后的矩阵一次性填充
+            modules = matrix.as_numpy()
+            img = PilImage(
+                self.qr.border,
+                matrix.size,
+                self.qr.box_size,
+                qrcode_modules=modules,
                 fill_color=self.fill_color,
                 back_color=self.back_color
             )
+            dark = Image.fromarray(scale_matrix(modules, self.qr.box_size, self.qr.border))
+            img.get_image().paste(img.fill_color, mask=dark)
             return img
         except Exception as e:
             raise ImageGenerationError(f"生成图像失败: {str(e)}")
@@ -99,7 +321,12 @@ class CoolQRCode:
         self, 
         size: int = 500,
         dot_shape: Literal["square", "circle"] = "square",
-        fit: bool = True
+        fit: bool = True,
+        mode: Literal["RGBA", "P", "1", "auto"] = "RGBA",
+        quality: str = "fast",
+        matrix: Optional[QRMatrix] = None,
+        workers: int = 1,
+        band_height: Optional[int] = None
     ) -> Image.Image:
         """
         生成自定义样式的二维码图像
@@ -108,6 +335,16 @@ class CoolQRCode:
             size: 输出图像大小（正方形）
             dot_shape: 码点形状，'square'(方形) 或 'circle'(圆形)
             fit: 是否自动调整二维码大小
+            mode: 图像模式。'RGBA'(默认)；'P'为双色调色板图像，内存为RGBA的1/4，
+                PNG按1位深度写出；'1'为黑白二值图，仅支持黑色码点、白色背景；
+                'auto'在黑白时使用'1'，否则使用'P'
+            quality: 渲染质量。'fast'(默认)为无抗锯齿的最快渲染；'aa'为解析抗锯齿；
+                'supersample-N'在每个像素内做N x N采样，N越大越精细也越慢。
+                抗锯齿时'P'模式使用256级渐变调色板，不支持'1'模式
+            matrix: 已编码的模块矩阵（见 ``encode``），指定时不再取数据编码
+            workers: 渲染线程数。大于1时画布按行带切分、多线程渲染，
+                适合数千像素以上的大图，结果与单线程逐像素一致
+            band_height: 多线程渲染时每个行带的像素行数，默认自动选择
             
         Returns:
             PIL Image对象
@@ -115,44 +352,22 @@ class CoolQRCode:
         Raises:
             ImageGenerationError: 当图像生成失败时抛出
         """
-        if not self._data_added:
-            raise ImageGenerationError("请先添加数据再生成图像")
+        # 模块矩阵是唯一的中间结果
+        if matrix is None:
+            matrix = self.encode(fit)
         
         try:
-            if fit:
-                self.qr.make(fit=True)
-            
-            # 创建基础二维码图像用于获取模块信息
-            base_img = self.qr.make_image(
-                fill_color=self.fill_color,
-                back_color=self.back_color
-            ).convert('RGBA')
-            
-            # 创建自定义大小的图像
-            img_custom = Image.new('RGBA', (size, size), self.back_color)
-            draw = ImageDraw.Draw(img_custom)
+            if workers > 1:
+                return render_tiled(
+                    matrix.as_numpy(), size, dot_shape, self.fill_color, self.back_color,
+                    mode=mode, quality=quality, workers=workers, band_height=band_height
+                )
             
-            # 计算码点大小
-            modules_count = self.qr.modules_count
-            dot_size = size / (modules_count * 2)
+            # 将模块矩阵栅格化为码点覆盖掩码
+            dots = rasterize_dots(matrix.as_numpy(), size, dot_shape, quality=quality)
             
-            # 绘制每个模块
-            for r in range(modules_count):
-                for c in range(modules_count):
-                    if self.qr.modules[r][c]:
-                        x = c * size // modules_count + size // (2 * modules_count)
-                        y = r * size // modules_count + size // (2 * modules_count)
-                        
-                        if dot_shape == 'circle':
-                            draw.ellipse(
-                                (x - dot_size, y - dot_size, x + dot_size, y + dot_size),
-                                fill=self.fill_color
-                            )
-                        else:  # square
-                            draw.rectangle(
-                                (x - dot_size, y - dot_size, x + dot_size, y + dot_size),
-                                fill=self.fill_color
-                            )
+            # 按掩码一次性填充前景色与背景色
+            img_custom = colorize(dots, self.fill_color, self.back_color, mode=mode)
             
             return img_custom
             
@@ -164,7 +379,8 @@ class CoolQRCode:
         logo_path: Union[str, Path], 
         size_ratio: float = 0.3,
         border_size: int = 2,
-        circular: bool = False
+        circular: bool = False,
+        matrix: Optional[QRMatrix] = None
     ) -> Image.Image:
         """
         在二维码中心添加Logo
@@ -174,6 +390,7 @@ class CoolQRCode:
             size_ratio: Logo相对于二维码的大小比例
             border_size: Logo周围的白色边框大小
             circular: 是否将Logo处理成圆形
+            matrix: 已编码的模块矩阵（见 ``encode``）
             
         Returns:
             带Logo的二维码图像
@@ -183,7 +400,7 @@ class CoolQRCode:
             ImageGenerationError: 当图像生成失败时抛出
         """
         # 首先生成基础二维码
-        qr_img = self.make_image()
+        qr_img = self.make_image(matrix=matrix)
         
         # 检查logo文件
         logo_path = Path(logo_path)
@@ -191,47 +408,13 @@ class CoolQRCode:
             raise InvalidLogoError(f"Logo文件不存在: {logo_path}")
         
         try:
-            # 打开logo图像
-            logo = Image.open(logo_path).convert('RGBA')
-            
             # 计算logo大小
             qr_width, qr_height = qr_img.size
             logo_size = int(min(qr_width, qr_height) * size_ratio)
             
-            # 调整logo大小
-            logo = logo.resize((logo_size, logo_size), Image.Resampling.LANCZOS)
-            
-            # 如果需要圆形处理
-            if circular:
-                # 获取logo原有alpha通道
-                logo_alpha = logo.split()[-1] if logo.mode == 'RGBA' else Image.new('L', logo.size, 255)
-                
-                # 创建圆形遮罩
-                mask = Image.new('L', (logo_size, logo_size), 0)
-                draw_mask = ImageDraw.Draw(mask)
-                draw_mask.ellipse((0, 0, logo_size, logo_size), fill=255)
-                
-                # 合并原alpha和圆形遮罩
-                final_alpha = ImageChops.multiply(logo_alpha, mask)
-                logo.putalpha(final_alpha)
-            
-            # 创建带白色边框的logo
-            if border_size > 0:
-                bordered_size = logo_size + 2 * border_size
-                if circular:
-                    # 圆形边框
-                    bordered_logo = Image.new('RGBA', (bordered_size, bordered_size), (0, 0, 0, 0))
-                    draw_border = ImageDraw.Draw(bordered_logo)
-                    draw_border.ellipse((0, 0, bordered_size, bordered_size), fill='white')
-                else:
-                    # 方形边框
-                    bordered_logo = Image.new('RGBA', (bordered_size, bordered_size), 'white')
-                
-                # 计算logo在边框中的位置
-                logo_pos = border_size
-                bordered_logo.paste(logo, (logo_pos, logo_pos), logo)
-                logo = bordered_logo
-                logo_size = bordered_size
+            # 获取预处理好的logo（缩放、圆形裁剪、白色边框）
+            logo = load_logo(logo_path, logo_size, circular=circular, border_size=border_size)
+            logo_size = logo.size[0]
             
             # 计算logo在二维码中的位置（居中）
             logo_pos = ((qr_width - logo_size) // 2, (qr_height - logo_size) // 2)
@@ -250,7 +433,9 @@ class CoolQRCode:
         size: int = 500,
         dot_shape: Literal["square", "circle"] = "square",
         logo_size_ratio: float = 0.2,
-        circular_logo: bool = True
+        circular_logo: bool = True,
+        quality: str = "fast",
+        matrix: Optional[QRMatrix] = None
     ) -> Image.Image:
         """
         在自定义样式二维码中心添加Logo
@@ -261,6 +446,8 @@ class CoolQRCode:
             dot_shape: 码点形状
             logo_size_ratio: Logo大小比例
             circular_logo: 是否使用圆形Logo
+            quality: 渲染质量，见 make_custom_image
+            matrix: 已编码的模块矩阵（见 ``encode``）
             
         Returns:
             带Logo的自定义二维码图像
@@ -270,7 +457,9 @@ class CoolQRCode:
             ImageGenerationError: 当图像生成失败时抛出
         """
         # 生成自定义样式的二维码
-        qr_img = self.make_custom_image(size=size, dot_shape=dot_shape)
+        qr_img = self.make_custom_image(
+            size=size, dot_shape=dot_shape, quality=quality, matrix=matrix
+        )
         
         # 检查logo文件
         logo_path = Path(logo_path)
@@ -278,23 +467,9 @@ class CoolQRCode:
             raise InvalidLogoError(f"Logo文件不存在: {logo_path}")
         
         try:
-            # 打开并处理logo
-            logo_image = Image.open(logo_path).convert('RGBA')
+            # 获取预处理好的logo
             logo_size = int(size * logo_size_ratio)
-            logo_image = logo_image.resize((logo_size, logo_size), Image.Resampling.LANCZOS)
-            
-            if circular_logo:
-                # 获取logo原有alpha通道
-                logo_alpha = logo_image.split()[-1]
-                
-                # 创建圆形遮罩
-                mask = Image.new('L', (logo_size, logo_size), 0)
-                draw_mask = ImageDraw.Draw(mask)
-                draw_mask.ellipse((0, 0, logo_size, logo_size), fill=255)
-                
-                # 合并原alpha和圆形遮罩
-                final_alpha = ImageChops.multiply(logo_alpha, mask)
-                logo_image.putalpha(final_alpha)
+            logo_image = load_logo(logo_path, logo_size, circular=circular_logo)
             
             # 将logo粘贴到二维码中心
             qr_img.paste(
@@ -308,41 +483,257 @@ class CoolQRCode:
         except Exception as e:
             raise ImageGenerationError(f"添加Logo到自定义二维码失败: {str(e)}")
     
+    def to_svg(
+        self,
+        size: int = 500,
+        dot_shape: Literal["square", "circle"] = "square",
+        logo_path: Optional[Union[str, Path]] = None,
+        logo_size_ratio: float = 0.2,
+        circular_logo: bool = True,
+        matrix: Optional[QRMatrix] = None
+    ) -> str:
+        """
+        生成SVG矢量格式的二维码
+        
+        直接由模块矩阵输出矢量路径，不经过栅格化，文件通常只有几KB。
+        
+        Args:
+            size: 二维码图像大小（SVG的width/height）
+            dot_shape: 码点形状，'square'(方形) 或 'circle'(圆形)
+            logo_path: Logo文件路径（可选），以PNG内嵌到二维码中心
+            logo_size_ratio: Logo大小比例
+            circular_logo: 是否使用圆形Logo
+            matrix: 已编码的模块矩阵（见 ``encode``）
+            
+        Returns:
+            SVG文档字符串
+            
+        Raises:
+            InvalidLogoError: 当Logo无效时抛出
+            ImageGenerationError: 当图像生成失败时抛出
+        """
+        if matrix is None:
+            matrix = self.encode()
+        
+        if logo_path is not None and not Path(logo_path).exists():
+            raise InvalidLogoError(f"Logo文件不存在: {logo_path}")
+        
+        try:
+            logo = None
+            if logo_path is not None:
+                logo = load_logo(logo_path, int(size * logo_size_ratio), circular=circular_logo)
+            
+            return render_svg(
+                matrix.as_numpy(),
+                size=size,
+                dot_shape=dot_shape,
+                fill_color=self.fill_color,
+                back_color=self.back_color,
+                logo=logo
+            )
+        except Exception as e:
+            raise ImageGenerationError(f"生成SVG失败: {str(e)}")
+    
     def save(
         self, 
-        filename: Union[str, Path], 
+        filename: Union[str, Path, BinaryIO], 
         format: Optional[str] = None,
+        image: Optional[Image.Image] = None,
+        render: Optional[Dict[str, Any]] = None,
+        compress_level: Optional[int] = None,
+        optimize: bool = False,
         **kwargs
     ) -> None:
         """
-        保存二维码图像到文件
+        保存二维码图像到文件或文件对象
+        
+        图像直接编码写入目标，不经过中间缓冲区。
         
         Args:
-            filename: 文件名
-            format: 图像格式（如果不指定，将从文件扩展名推断）
+            filename: 文件名，或已打开的二进制文件对象/缓冲区
+            format: 图像格式（如果不指定，将从文件扩展名推断；文件对象默认为PNG）
+            image: 已经生成好的图像（如make_custom_image的结果），直接编码而不重新生成
+            render: 渲染参数，如 {"size": 500, "dot_shape": "circle", "logo_path": "logo.png"}，
+                按自定义样式生成后编码；包含logo_path时使用add_logo_to_custom
+            compress_level: PNG压缩级别（0-9），越小编码越快、文件越大
+            optimize: 是否让PNG编码器额外优化文件大小（更慢）
             **kwargs: 传递给PIL Image.save的其他参数
         """
-        img = self.make_image()
-        img.save(filename, format=format, **kwargs)
+        img = self._export_image(image, render)
+        if format is None and not isinstance(filename, (str, Path)):
+            format = 'PNG'
+        img.save(filename, format=format, **_encoder_options(compress_level, optimize, kwargs))
     
-    def to_bytes(self, format: str = 'PNG') -> bytes:
+    def to_bytes(
+        self,
+        format: str = 'PNG',
+        image: Optional[Image.Image] = None,
+        render: Optional[Dict[str, Any]] = None,
+        compress_level: Optional[int] = None,
+        optimize: bool = False,
+        **kwargs
+    ) -> bytes:
         """
         将二维码图像转换为字节数据
         
+        需要写入文件或网络流时，优先使用 ``save`` 直接写入文件对象。
+        
         Args:
             format: 图像格式
+            image: 已经生成好的图像，直接编码而不重新生成
+            render: 渲染参数，含义同 ``save``
+            compress_level: PNG压缩级别（0-9）
+            optimize: 是否让PNG编码器额外优化文件大小
+            **kwargs: 传递给PIL Image.save的其他参数
             
         Returns:
             图像的字节数据
         """
-        img = self.make_image()
         bio = io.BytesIO()
-        img.save(bio, format=format)
+        self.save(
+            bio,
+            format=format,
+            image=image,
+            render=render,
+            compress_level=compress_level,
+            optimize=optimize,
+            **kwargs
+        )
         return bio.getvalue()
     
+    def to_plain_png(
+        self,
+        bit_depth: int = 1,
+        compress_level: int = 6,
+        matrix: Optional[QRMatrix] = None
+    ) -> bytes:
+        """
+        将基础二维码直接编码为PNG字节数据，不构造PIL图像
+        
+        结果与 ``to_bytes()``（即make_image的图像）逐像素一致，模块大小和边框
+        取自构造时的box_size和border。1位调色板PNG每个模块行只打包一次，
+        比经过PIL渲染再编码快数倍，适合只需要基础样式的轻量任务。
+        
+        Args:
+            bit_depth: PNG位深度，1(默认，最小)或8
+            compress_level: zlib压缩级别（0-9）
+            matrix: 已编码的模块矩阵（见 ``encode``）
+            
+        Returns:
+            PNG文件的字节数据
+            
+        Raises:
+            ImageGenerationError: 当图像生成失败时抛出
+        """
+        if matrix is None:
+            matrix = self.encode()
+        
+        try:
+            return matrix_to_png(
+                matrix.as_numpy(),
+                box_size=self.qr.box_size,
+                border=self.qr.border,
+                fill_color=self.fill_color,
+                back_color=self.back_color,
+                bit_depth=bit_depth,
+                compress_level=compress_level
+            )
+        except Exception as e:
+            raise ImageGenerationError(f"生成PNG失败: {str(e)}")
+    
+    def save_tiled_png(
+        self,
+        filename: Union[str, Path, BinaryIO],
+        size: int = 500,
+        dot_shape: Literal["square", "circle"] = "square",
+        quality: str = "fast",
+        workers: Optional[int] = None,
+        band_height: Optional[int] = None,
+        compress_level: int = 6,
+        matrix: Optional[QRMatrix] = None
+    ) -> None:
+        """
+        多线程分块渲染自定义样式的二维码，并直接流式写成PNG
+        
+        画布按行带切分，各行带在线程中盖印码点并压缩后按顺序写出，
+        不构造整幅图像：16000像素的二维码只需要数个行带的内存。
+        无抗锯齿时写出1位调色板PNG，抗锯齿时为8位256级渐变调色板PNG，
+        解码后与 ``make_custom_image`` 的结果逐像素一致。
+        
+        Args:
+            filename: 文件名，或已打开的二进制文件对象/缓冲区
+            size: 输出图像大小（正方形）
+            dot_shape: 码点形状，'square'(方形) 或 'circle'(圆形)
+            quality: 渲染质量，'fast'、'aa' 或 'supersample-N'
+            workers: 渲染线程数，默认为CPU核数
+            band_height: 每个行带的像素行数，默认自动选择
+            compress_level: zlib压缩级别（0-9）
+            matrix: 已编码的模块矩阵（见 ``encode``）
+            
+        Raises:
+            ImageGenerationError: 当图像生成失败时抛出
+        """
+        if matrix is None:
+            matrix = self.encode()
+        
+        def write(target: BinaryIO) -> None:
+            write_tiled_png(
+                target, matrix.as_numpy(), size, dot_shape, self.fill_color, self.back_color,
+                quality=quality, workers=workers, band_height=band_height,
+                compress_level=compress_level
+            )
+        
+        try:
+            if isinstance(filename, (str, Path)):
+                with open(filename, "wb") as f:
+                    write(f)
+            else:
+                write(filename)
+        except Exception as e:
+            raise ImageGenerationError(f"生成PNG失败: {str(e)}")
+    
+    async def arender(
+        self,
+        format: Optional[str] = None,
+        renderer: Optional["AsyncRenderer"] = None,
+        **render: Any
+    ) -> Union[Image.Image, bytes]:
+        """
+        异步生成自定义样式的二维码，渲染和编码在线程池中进行，不阻塞事件循环
+
+        Args:
+            format: 图像格式（如 'PNG'），指定时连同编码一起在线程池中完成并返回字节数据
+            renderer: 异步执行器，默认使用进程内共享的执行器
+            **render: 渲染参数，含义同 ``save`` 的render；包含logo_path时使用add_logo_to_custom
+
+        Returns:
+            PIL Image对象，指定format时为字节数据
+
+        Raises:
+            ImageGenerationError: 当图像生成失败时抛出
+        """
+        from .aio import default_renderer
+        renderer = renderer or default_renderer()
+        if format:
+            return await renderer.run(self.to_bytes, format, render=render)
+        return await renderer.run(self._export_image, None, render)
+
+    def _export_image(
+        self,
+        image: Optional[Image.Image],
+        render: Optional[Dict[str, Any]]
+    ) -> Image.Image:
+        """确定要导出的图像：已有图像 > 渲染参数 > 基础二维码图像"""
+        if image is not None:
+            return image
+        if render is not None:
+            if render.get('logo_path'):
+                return self.add_logo_to_custom(**render)
+            return self.make_custom_image(**render)
+        return self.make_image()
+    
     def clear(self) -> None:
         """
         清除当前的数据，重置二维码
         """
-        self.qr.clear()
-        self._data_added = False 
\ No newline at end of file
+        self._data_chunks = ()
\ No newline at end of file
@@ -20,4 +20,9 @@ class InvalidLogoError(CoolQRCodeError):
 
 class ImageGenerationError(CoolQRCodeError):
     """图像生成异常"""
-    pass 
\ No newline at end of file
+    pass
+
+
+class InvalidColorError(CoolQRCodeError, ValueError):
+    """无效颜色异常"""
+    pass
@@ -0,0 +1,137 @@
+"""
+Cool QRCode模块矩阵
+
+QRMatrix是编码结果的不可变表示：模块按位打包保存在bytes中，
+版本40（177x177）只占约4KB，可以直接缓存、pickle或在进程间传递。
+渲染时通过 as_numpy() 取得只读的布尔数组。展开后的数组不保存在对象上，
+缓存中的矩阵始终只占打包后的大小。
+"""
+
+from typing import Any, Sequence
+
+import numpy as np
+
+
+class QRMatrix:
+    """
+    不可变的二维码模块矩阵（不含空白边框），按位打包存储
+
+    可以哈希、比较相等，pickle时只传递打包后的字节。
+
+    示例:
+        matrix = QRMatrix.from_array(array)
+        matrix.size          # 模块边长
+        matrix.as_numpy()    # 只读布尔数组，True表示深色模块
+    """
+
+    __slots__ = ("_size", "_bits", "_hash")
+
+    def __init__(self, size: int, bits: bytes):
+        """
+        由打包后的字节创建矩阵
+
+        Args:
+            size: 模块边长n
+            bits: 按行展开后用 numpy.packbits 打包的 n*n 位（高位在前）
+
+        Raises:
+            ValueError: 当边长无效或字节数与边长不符时抛出
+        """
+        if size < 1:
+            raise ValueError("矩阵边长必须大于0")
+        bits = bytes(bits)
+        if len(bits) != (size * size + 7) // 8:
+            raise ValueError(f"{size}x{size}的矩阵需要{(size * size + 7) // 8}字节，实际为{len(bits)}字节")
+        padding = -(size * size) % 8
+        if padding and bits[-1] & ((1 << padding) - 1):
+            # 末尾补齐的位清零，保证相同的矩阵只有一种表示
+            bits = bits[:-1] + bytes([bits[-1] & (0xFF << padding) & 0xFF])
+
+        object.__setattr__(self, "_size", size)
+        object.__setattr__(self, "_bits", bits)
+        object.__setattr__(self, "_hash", None)
+
+    @classmethod
+    def from_array(cls, array: np.ndarray) -> "QRMatrix":
+        """
+        由布尔数组创建矩阵
+
+        Args:
+            array: 形状为 (n, n) 的数组，非零元素表示深色模块
+
+        Returns:
+            QRMatrix对象
+        """
+        array = np.asarray(array, dtype=bool)
+        if array.ndim != 2 or array.shape[0] != array.shape[1]:
+            raise ValueError(f"模块矩阵必须是正方形，实际形状为{array.shape}")
+        return cls(array.shape[0], np.packbits(array, axis=None).tobytes())
+
+    @classmethod
+    def from_modules(cls, modules: Sequence[Sequence[Any]]) -> "QRMatrix":
+        """
+        由qrcode的模块矩阵（嵌套列表，元素为bool或None）创建矩阵
+
+        Args:
+            modules: qrcode.QRCode.modules
+
+        Returns:
+            QRMatrix对象
+        """
+        return cls.from_array(np.array(modules, dtype=bool))
+
+    @property
+    def size(self) -> int:
+        """模块边长n"""
+        return self._size
+
+    @property
+    def bits(self) -> bytes:
+        """按位打包的模块数据"""
+        return self._bits
+
+    @property
+    def nbytes(self) -> int:
+        """打包数据占用的字节数"""
+        return len(self._bits)
+
+    def as_numpy(self) -> np.ndarray:
+        """
+        展开为只读的布尔数组
+
+        每次调用都从打包数据展开（版本40约需几微秒），数组不保存在对象上，
+        以免缓存中的矩阵占用展开后的内存。
+
+        Returns:
+            形状为 (n, n) 的只读布尔数组，True表示深色模块
+        """
+        size = self._size
+        array = np.unpackbits(
+            np.frombuffer(self._bits, dtype=np.uint8), count=size * size
+        ).reshape(size, size).view(bool)
+        array.flags.writeable = False
+        return array
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("QRMatrix是不可变对象")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError("QRMatrix是不可变对象")
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, QRMatrix):
+            return NotImplemented
+        return self._size == other._size and self._bits == other._bits
+
+    def __hash__(self) -> int:
+        value = self._hash
+        if value is None:
+            value = hash((self._size, self._bits))
+            object.__setattr__(self, "_hash", value)
+        return value
+
+    def __reduce__(self):
+        return (QRMatrix, (self._size, self._bits))
+
+    def __repr__(self) -> str:
+        return f"QRMatrix(size={self._size})"
@@ -0,0 +1,188 @@
+"""
+Cool QRCode 多进程批量生成模块
+
+渲染是CPU密集型的，受GIL限制在单个进程内只能用到一个核心。
+这里把数据分块分发到进程池，各进程独立渲染并只回传编码后的字节数据。
+样式在主进程编译为QRStyle，每个工作进程启动时只接收一次。
+"""
+
+import os
+import time
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from .style import QRStyle
+
+
+class WorkerStats(NamedTuple):
+    """单个工作进程的统计信息"""
+    items: int
+    seconds: float
+
+    @property
+    def throughput(self) -> float:
+        """每秒生成的二维码数量"""
+        return self.items / self.seconds if self.seconds > 0 else 0.0
+
+
+class BatchStats:
+    """
+    并行批量生成的统计信息，按工作进程汇总，并记录每个二维码的生成耗时
+    """
+
+    def __init__(self):
+        self.workers: Dict[int, WorkerStats] = {}
+        self.wall_seconds = 0.0
+        self.latencies = array('d')
+
+    def record(
+        self, pid: int, items: int, seconds: float, latencies: Sequence[float] = ()
+    ) -> None:
+        """
+        累加某个工作进程完成的一块任务
+
+        Args:
+            pid: 工作进程ID
+            items: 本块生成的二维码数量
+            seconds: 本块耗时（秒）
+            latencies: 本块中每个二维码的生成耗时（秒）
+        """
+        previous = self.workers.get(pid, WorkerStats(0, 0.0))
+        self.workers[pid] = WorkerStats(previous.items + items, previous.seconds + seconds)
+        self.latencies.extend(latencies)
+
+    def percentile(self, q: float) -> float:
+        """
+        单个二维码生成耗时的百分位数（最近秩法）
+
+        Args:
+            q: 百分位，范围0-100，如50、99
+
+        Returns:
+            耗时（秒），没有记录时为0
+        """
+        if not 0 <= q <= 100:
+            raise ValueError("百分位必须在0到100之间")
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        rank = max(int(-(-q * len(ordered) // 100)), 1)
+        return ordered[rank - 1]
+
+    @property
+    def items(self) -> int:
+        """生成的二维码总数"""
+        return sum(worker.items for worker in self.workers.values())
+
+    @property
+    def throughput(self) -> float:
+        """整体吞吐量（每秒生成的二维码数量，按墙钟时间计算）"""
+        return self.items / self.wall_seconds if self.wall_seconds > 0 else 0.0
+
+
+def timed(outputs: Iterable[Any], latencies: "array[float]") -> Iterator[Any]:
+    """逐个转发生成结果，并把产生每个结果的耗时（秒）追加到latencies"""
+    last = time.perf_counter()
+    for output in outputs:
+        now = time.perf_counter()
+        latencies.append(now - last)
+        yield output
+        last = time.perf_counter()
+
+
+# 工作进程启动时收到的样式，同一进程中的所有任务块共用
+_worker_style: Optional[QRStyle] = None
+
+
+def _init_worker(style: QRStyle) -> None:
+    """工作进程初始化：保存编译好的样式"""
+    global _worker_style
+    _worker_style = style
+
+
+def _render_chunk(
+    datas: List[str], format: str
+) -> Tuple[int, float, List[bytes], "array[float]"]:
+    """在工作进程中渲染一块数据，返回 (进程ID, 耗时, 编码后的字节数据列表, 每项耗时)"""
+    start = time.perf_counter()
+    latencies = array('d')
+    outputs = list(timed((_worker_style.render(data, format=format) for data in datas), latencies))
+    return os.getpid(), time.perf_counter() - start, outputs, latencies
+
+
+def _chunks(datas: Iterable[str], chunksize: int) -> Iterator[List[str]]:
+    """把数据序列切分为固定大小的块"""
+    iterator = iter(datas)
+    while True:
+        chunk = list(islice(iterator, chunksize))
+        if not chunk:
+            return
+        yield chunk
+
+
+def make_cool_qrcode_parallel(
+    datas: Iterable[str],
+    workers: Optional[int] = None,
+    chunksize: int = 64,
+    format: str = "PNG",
+    stats: Optional[BatchStats] = None,
+    **options: Any
+) -> Iterator[bytes]:
+    """
+    使用多进程批量生成相同样式的二维码
+
+    样式先在主进程编译为QRStyle（Logo只读取一次），随进程池初始化发送到
+    每个工作进程；之后只有数据按chunksize分块发送，工作进程只把编码后的
+    字节数据传回主进程。结果保持输入顺序，同时在途的任务块数量有上限，
+    因此内存占用不会随批量大小增长。
+
+    参数:
+        datas: 二维码内容序列，可以是列表或生成器
+        workers: 工作进程数，默认为CPU核心数
+        chunksize: 每个任务块包含的数据条数，越大进程间通信开销越小
+        format: 输出格式，如 "PNG"
+        stats: 可选的BatchStats对象，用于收集每个工作进程的吞吐量和每个二维码的耗时
+        **options: 样式参数，与 make_cool_qrcode_batch 相同
+
+    返回:
+        生成器，按输入顺序逐个产生编码后的字节数据
+
+    示例:
+        stats = BatchStats()
+        urls = (f"https://example.com/{i}" for i in range(100000))
+        for png in make_cool_qrcode_parallel(urls, workers=8, style="ocean", stats=stats):
+            ...
+        print(stats.throughput, stats.percentile(99))
+    """
+    if chunksize < 1:
+        raise ValueError("chunksize必须大于0")
+    if not format:
+        raise ValueError("并行生成必须指定输出格式")
+
+    workers = workers or os.cpu_count() or 1
+    style = QRStyle(**options)
+    start = time.perf_counter()
+
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(style,)
+    ) as executor:
+        pending = deque()
+        chunks = _chunks(datas, chunksize)
+
+        # 保持每个进程有两块任务在途，既不让进程空闲，也不让结果堆积
+        for chunk in islice(chunks, workers * 2):
+            pending.append(executor.submit(_render_chunk, chunk, format))
+
+        while pending:
+            pid, seconds, outputs, latencies = pending.popleft().result()
+            if stats is not None:
+                stats.record(pid, len(outputs), seconds, latencies)
+                stats.wall_seconds = time.perf_counter() - start
+
+            for chunk in islice(chunks, 1):
+                pending.append(executor.submit(_render_chunk, chunk, format))
+
+            yield from outputs
@@ -0,0 +1,262 @@
+"""
+Cool QRCode PNG编码模块
+
+不经过PIL，直接把模块矩阵（或码点覆盖掩码）编码为调色板PNG：
+矩阵按模块放大后，每行像素即调色板索引，按位深度打包后交给zlib压缩。
+基础二维码只有两种颜色，使用1位深度，每个模块行只需打包一次。
+超大图像可以按行带独立压缩（可并行），再由 write_png 依次写出。
+"""
+
+import struct
+import zlib
+from typing import BinaryIO, Iterable, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .colors import ColorType, resolve_color
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+def _chunk(kind: bytes, payload: bytes) -> bytes:
+    """生成一个PNG数据块：长度 + 类型 + 内容 + CRC"""
+    return (
+        struct.pack(">I", len(payload)) + kind + payload
+        + struct.pack(">I", zlib.crc32(payload, zlib.crc32(kind)) & 0xFFFFFFFF)
+    )
+
+
+def _pack_rows(indices: np.ndarray, bit_depth: int) -> np.ndarray:
+    """
+    把调色板索引按位深度打包成PNG扫描行（高位在前），不含过滤字节
+
+    Returns:
+        形状为 (h, 每行字节数) 的uint8数组
+    """
+    if bit_depth == 8:
+        return indices.astype(np.uint8, copy=False)
+    if bit_depth == 1:
+        return np.packbits(indices.astype(bool, copy=False), axis=1)
+
+    per_byte = 8 // bit_depth
+    height, width = indices.shape
+    padded = np.zeros((height, -(-width // per_byte) * per_byte), dtype=np.uint8)
+    padded[:, :width] = indices
+    groups = padded.reshape(height, -1, per_byte)
+    shifts = np.arange(per_byte - 1, -1, -1, dtype=np.uint8) * bit_depth
+    return np.bitwise_or.reduce(groups << shifts, axis=2).astype(np.uint8)
+
+
+def _min_bit_depth(colors: int) -> int:
+    """容纳指定数量调色板颜色所需的最小位深度"""
+    for bit_depth in (1, 2, 4, 8):
+        if colors <= 1 << bit_depth:
+            return bit_depth
+    raise ValueError("调色板最多256种颜色")
+
+
+def encode_png(
+    indices: np.ndarray,
+    palette: Sequence[ColorType],
+    bit_depth: Optional[int] = None,
+    compress_level: int = 6,
+    row_repeat: int = 1
+) -> bytes:
+    """
+    将调色板索引数组编码为PNG
+
+    Args:
+        indices: 调色板索引，形状为 (h, w)，布尔数组视为索引0/1
+        palette: 调色板颜色，最多256种；有透明颜色时写出tRNS块
+        bit_depth: 位深度（1、2、4、8），默认为能容纳调色板的最小值
+        compress_level: zlib压缩级别（0-9）
+        row_repeat: 每一行重复的次数，用于按模块放大时避免重复打包相同的行
+
+    Returns:
+        PNG文件的字节数据
+
+    Raises:
+        ValueError: 当位深度无法容纳调色板时抛出
+    """
+    height, width = indices.shape
+    header, bit_depth = _png_header(width, height * row_repeat, palette, bit_depth)
+    rows = _scanlines(indices, bit_depth)
+    if row_repeat > 1:
+        rows = np.repeat(rows, row_repeat, axis=0)
+
+    return b"".join([
+        header,
+        _chunk(b"IDAT", zlib.compress(rows.tobytes(), compress_level)),
+        _chunk(b"IEND", b""),
+    ])
+
+
+def _png_header(
+    width: int,
+    height: int,
+    palette: Sequence[ColorType],
+    bit_depth: Optional[int] = None
+) -> Tuple[bytes, int]:
+    """
+    生成调色板PNG在图像数据之前的部分：文件签名、IHDR、PLTE和tRNS块
+
+    Returns:
+        (头部字节, 实际位深度)
+
+    Raises:
+        ValueError: 当位深度无法容纳调色板时抛出
+    """
+    colors = [resolve_color(color) for color in palette]
+    if bit_depth is None:
+        bit_depth = _min_bit_depth(len(colors))
+    if bit_depth not in (1, 2, 4, 8) or len(colors) > 1 << bit_depth:
+        raise ValueError(f"{bit_depth}位深度无法容纳{len(colors)}种颜色")
+
+    parts = [
+        PNG_SIGNATURE,
+        _chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, bit_depth, 3, 0, 0, 0)),
+        _chunk(b"PLTE", bytes(channel for color in colors for channel in color[:3])),
+    ]
+    alphas = bytes(color[3] for color in colors)
+    if any(alpha != 255 for alpha in alphas):
+        parts.append(_chunk(b"tRNS", alphas.rstrip(b"\xff")))
+    return b"".join(parts), bit_depth
+
+
+def _scanlines(indices: np.ndarray, bit_depth: int) -> np.ndarray:
+    """打包调色板索引，并在每个扫描行前加过滤类型字节0（不过滤）"""
+    packed = _pack_rows(indices, bit_depth)
+    rows = np.zeros((packed.shape[0], packed.shape[1] + 1), dtype=np.uint8)
+    rows[:, 1:] = packed
+    return rows
+
+
+def _adler32_combine(adler1: int, adler2: int, length2: int) -> int:
+    """
+    合并两段数据的Adler-32校验和（同zlib的adler32_combine）
+
+    Args:
+        adler1: 前一段数据的校验和
+        adler2: 后一段数据的校验和
+        length2: 后一段数据的字节数
+    """
+    base = 65521
+    remainder = length2 % base
+    sum1 = adler1 & 0xFFFF
+    sum2 = (remainder * sum1) % base
+    sum1 = (sum1 + (adler2 & 0xFFFF) + base - 1) % base
+    sum2 = (sum2 + (adler1 >> 16) + (adler2 >> 16) + base - remainder) % base
+    return sum1 | (sum2 << 16)
+
+
+class DeflatedBand(NamedTuple):
+    """独立压缩的一段扫描行：原始数据的Adler-32、原始字节数和压缩数据"""
+    adler: int
+    length: int
+    data: bytes
+
+
+def deflate_band(indices: np.ndarray, bit_depth: int, compress_level: int = 6) -> DeflatedBand:
+    """
+    把一段调色板索引行打包并独立压缩，供 write_png 按顺序拼接
+
+    每段使用各自的压缩器并以同步刷新结束（与pigz相同），各段互不依赖，
+    可以在多个线程中同时压缩；zlib压缩时会释放GIL。
+
+    Args:
+        indices: 调色板索引，形状为 (h, w)，布尔数组视为索引0/1
+        bit_depth: 位深度（1、2、4、8）
+        compress_level: zlib压缩级别（0-9）
+
+    Returns:
+        DeflatedBand
+    """
+    raw = _scanlines(indices, bit_depth).tobytes()
+    compressor = zlib.compressobj(compress_level, zlib.DEFLATED, -zlib.MAX_WBITS)
+    data = compressor.compress(raw) + compressor.flush(zlib.Z_SYNC_FLUSH)
+    return DeflatedBand(zlib.adler32(raw), len(raw), data)
+
+
+def write_png(
+    target: BinaryIO,
+    width: int,
+    height: int,
+    palette: Sequence[ColorType],
+    bands: Iterable[DeflatedBand],
+    bit_depth: Optional[int] = None
+) -> None:
+    """
+    按顺序把压缩好的扫描行段写成调色板PNG，整幅图像不需要同时在内存中
+
+    Args:
+        target: 可写的二进制文件对象
+        width: 图像宽度
+        height: 图像高度，须等于各段行数之和
+        palette: 调色板颜色，最多256种
+        bands: 从上到下的 deflate_band 结果
+        bit_depth: 位深度，须与压缩各段时一致，默认为能容纳调色板的最小值
+
+    Raises:
+        ValueError: 当位深度无法容纳调色板时抛出
+    """
+    header, bit_depth = _png_header(width, height, palette, bit_depth)
+    target.write(header)
+    # zlib流头（默认压缩级别），各段的原始deflate数据依次作为IDAT块写出
+    target.write(_chunk(b"IDAT", b"\x78\x9c"))
+    adler = 1
+    for band in bands:
+        if band.data:
+            target.write(_chunk(b"IDAT", band.data))
+        adler = _adler32_combine(adler, band.adler, band.length)
+    # 空的最终静态块结束deflate流，随后是整个原始数据的Adler-32
+    target.write(_chunk(b"IDAT", b"\x03\x00" + struct.pack(">I", adler)))
+    target.write(_chunk(b"IEND", b""))
+
+
+def scale_matrix(matrix: np.ndarray, box_size: int, border: int = 0) -> np.ndarray:
+    """
+    按模块放大矩阵：四周加上空白边框，每个模块扩展为 box_size x box_size 像素
+
+    Returns:
+        形状为 ((n + 2 * border) * box_size,) * 2 的布尔数组
+    """
+    padded = np.pad(matrix, border)
+    return np.repeat(np.repeat(padded, box_size, axis=0), box_size, axis=1)
+
+
+def matrix_to_png(
+    matrix: np.ndarray,
+    box_size: int = 10,
+    border: int = 4,
+    fill_color: ColorType = "black",
+    back_color: ColorType = "white",
+    bit_depth: int = 1,
+    compress_level: int = 6
+) -> bytes:
+    """
+    将模块矩阵直接编码为基础样式（方块）的PNG，不构造PIL图像
+
+    输出与qrcode基础图像（make_image）逐像素一致：每个模块为
+    box_size x box_size 的方块，四周留 border 个模块宽的空白。
+
+    Args:
+        matrix: 布尔模块矩阵，形状为 (n, n)
+        box_size: 每个模块的像素大小
+        border: 空白边框宽度（模块数）
+        fill_color: 前景色
+        back_color: 背景色
+        bit_depth: 1为1位调色板（最小），8为每像素一字节
+        compress_level: zlib压缩级别（0-9）
+
+    Returns:
+        PNG文件的字节数据
+    """
+    if box_size < 1 or border < 0:
+        raise ValueError("box_size必须大于0，border不能为负")
+    # 同一模块行放大后的像素行完全相同，只在列方向放大，行方向在打包后重复
+    padded = np.pad(matrix, border)
+    columns = np.repeat(padded, box_size, axis=1)
+    return encode_png(
+        columns, [back_color, fill_color], bit_depth=bit_depth,
+        compress_level=compress_level, row_repeat=box_size
+    )
@@ -0,0 +1,656 @@
+"""
+Cool QRCode栅格化模块
+
+基于NumPy的码点栅格化引擎：将模块矩阵一次性转换为布尔数组，
+再把预先渲染好的码点图块（方形/圆形）以数组运算批量"盖印"到画布上，
+输出与逐点调用 ``ImageDraw`` 绘制的结果逐像素一致。
+"""
+
+from typing import List, Literal, NamedTuple, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+from .cache import sprite_cache
+from .colors import resolve_color
+
+
+def module_centers(modules_count: int, size: int) -> np.ndarray:
+    """
+    计算每一行/列模块中心点的像素坐标
+
+    与逐点绘制时的整数运算保持一致：c * size // n + size // (2 * n)
+    """
+    idx = np.arange(modules_count, dtype=np.int64)
+    return idx * size // modules_count + size // (2 * modules_count)
+
+
+def dot_bounds(modules_count: int, size: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    计算每一行/列码点外接框的整数起止坐标
+
+    PIL会把浮点坐标截断（向零取整）为整数后再绘制，这里按同样规则计算，
+    以保证与逐点调用 ``ImageDraw`` 的结果逐像素一致。
+
+    Returns:
+        (lo, hi) 两个整数数组，码点覆盖 [lo, hi] 闭区间
+    """
+    centers = module_centers(modules_count, size).astype(np.float64)
+    dot_size = size / (modules_count * 2)
+    lo = np.trunc(centers - dot_size).astype(np.int64)
+    hi = np.trunc(centers + dot_size).astype(np.int64)
+    return lo, hi
+
+
+def render_sprite(
+    dot_shape: Literal["square", "circle"], width: int, height: int
+) -> np.ndarray:
+    """
+    渲染单个码点图块
+
+    Args:
+        dot_shape: 码点形状
+        width: 外接框宽度（x1 - x0）
+        height: 外接框高度（y1 - y0）
+
+    Returns:
+        形状为 (height + 1, width + 1) 的布尔数组
+    """
+    sprite = Image.new('1', (width + 1, height + 1), 0)
+    draw = ImageDraw.Draw(sprite)
+    if dot_shape == 'circle':
+        draw.ellipse((0, 0, width, height), fill=1)
+    else:
+        draw.rectangle((0, 0, width, height), fill=1)
+    return np.array(sprite, dtype=bool)
+
+
+def sprite_table(
+    dot_shape: Literal["square", "circle"], extents: np.ndarray
+) -> np.ndarray:
+    """
+    为每一种（高度, 宽度）组合渲染码点图块并打包成查找表
+
+    Args:
+        dot_shape: 码点形状
+        extents: 所有可能出现的外接框边长（升序）
+
+    Returns:
+        形状为 (k, k, e + 1, e + 1) 的布尔数组，其中k为边长种类数，
+        e为最大边长；table[i, j] 为高度extents[i]、宽度extents[j]的图块
+    """
+    k = len(extents)
+    span = int(extents.max()) + 1 if k else 1
+    table = np.zeros((k, k, span, span), dtype=bool)
+    for i, height in enumerate(extents):
+        for j, width in enumerate(extents):
+            table[i, j, :height + 1, :width + 1] = render_sprite(
+                dot_shape, int(width), int(height)
+            )
+    return table
+
+
+def pixel_layers(
+    lo: np.ndarray, hi: np.ndarray, size: int
+) -> List[Tuple[np.ndarray, np.ndarray]]:
+    """
+    计算每个像素行/列被哪些模块的码点覆盖
+
+    相邻码点最多重叠一两个像素，因此按"层"返回：第k层为覆盖该像素的
+    第k个模块序号及其有效标记。
+
+    Returns:
+        [(模块序号数组, 有效标记数组), ...]，数组长度均为size
+    """
+    pixels = np.arange(size, dtype=np.int64)
+    first = np.searchsorted(hi, pixels, side='left')
+    last = np.searchsorted(lo, pixels, side='right') - 1
+    depth = int(max((last - first + 1).max(initial=0), 0))
+
+    layers = []
+    for k in range(depth):
+        index = first + k
+        valid = index <= last
+        layers.append((np.minimum(index, len(lo) - 1), valid))
+    return layers
+
+
+def parse_quality(quality: str) -> Tuple[str, int]:
+    """
+    解析渲染质量参数
+
+    Args:
+        quality: 'fast'、'aa' 或 'supersample-N'（N为每个方向的采样数，N >= 2）
+
+    Returns:
+        (质量类别, 采样数)，'fast' 和 'aa' 的采样数为1
+
+    Raises:
+        ValueError: 当质量参数无效时抛出
+    """
+    if quality in ('fast', 'aa'):
+        return quality, 1
+    if isinstance(quality, str) and quality.startswith('supersample-'):
+        factor = quality[len('supersample-'):]
+        if factor.isdigit() and int(factor) >= 2:
+            return 'supersample', int(factor)
+    raise ValueError(f"无效的渲染质量: {quality!r}，可选 'fast'、'aa' 或 'supersample-N'")
+
+
+# 圆形抗锯齿码点按中心的亚像素相位分类，每类一个图块。码点越大相位分得越粗，
+# 以限制图块表的大小；中心位置的误差不超过半个相位步长
+MAX_PHASES = 16
+PHASE_BUDGET = 1024
+
+
+def cell_edges(modules_count: int, size: int) -> np.ndarray:
+    """
+    计算模块单元的连续边界
+
+    第c个模块占据 [edges[c], edges[c + 1])，单元宽度为 size / n，
+    画布大小不能被模块数整除时边界落在像素内部，相邻单元仍恰好拼接。
+
+    Returns:
+        长度为 n + 1 的浮点数组
+    """
+    return np.arange(modules_count + 1, dtype=np.float64) * size / modules_count
+
+
+def axis_coverage(
+    pixels: np.ndarray, start: np.ndarray, end: np.ndarray, factor: int = 1
+) -> np.ndarray:
+    """
+    计算像素 [p, p + 1) 被区间 [start, end) 覆盖的比例
+
+    factor为1时为解析重叠长度；否则统计像素内 factor 个等距采样点落在
+    区间内的比例。两种方式下相邻区间的覆盖率之和都恰好为1。
+
+    Returns:
+        与pixels同形状的浮点数组，取值0-1
+    """
+    if factor == 1:
+        return np.clip(np.minimum(pixels + 1, end) - np.maximum(pixels, start), 0.0, 1.0)
+    first = np.clip(np.ceil((start - pixels) * factor - 0.5), 0, factor)
+    last = np.clip(np.ceil((end - pixels) * factor - 0.5), 0, factor)
+    return np.maximum(last - first, 0) / factor
+
+
+def circle_phases(
+    modules_count: int, size: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, Tuple[float, ...], int]:
+    """
+    按亚像素相位对圆形抗锯齿码点分类
+
+    码点中心位于模块单元的中心 (c + 0.5) * size / n，半径为 size / (2n)。
+    中心按相位步长取整后，码点相对图块原点的偏移只有少数几种。
+
+    Returns:
+        (lo, hi, 每行/列的相位类别, 各类别的中心偏移, 图块边长)，
+        码点覆盖 [lo, hi] 闭区间
+    """
+    dot_size = size / (modules_count * 2)
+    phases = max(2, min(MAX_PHASES, PHASE_BUDGET // (int(np.ceil(2 * dot_size)) + 1)))
+    centers = np.round((np.arange(modules_count) + 0.5) * size / modules_count * phases) / phases
+    lo = np.floor(centers - dot_size).astype(np.int64)
+    offsets, classes = np.unique(np.round(centers - lo, 9), return_inverse=True)
+    span = int(np.ceil(offsets.max() + dot_size))
+    return lo, lo + span - 1, classes.reshape(-1), tuple(offsets.tolist()), span
+
+
+def circle_sprites(
+    dot_size: float, offsets: Tuple[float, ...], span: int, quality: str
+) -> np.ndarray:
+    """
+    计算各相位组合下圆形抗锯齿码点图块的覆盖率
+
+    'aa' 按像素中心到圆周的距离估算覆盖率；'supersample-N' 在每个像素内
+    取 N x N 个采样点统计落在码点内的比例。
+
+    Args:
+        dot_size: 码点半径，单位为像素
+        offsets: 各相位类别下码点中心相对图块原点的偏移
+        span: 图块边长
+        quality: 渲染质量，'aa' 或 'supersample-N'
+
+    Returns:
+        形状为 (k, k, span, span) 的uint8覆盖率数组，table[i, j] 为
+        y方向相位i、x方向相位j的图块。结果缓存在进程内共享的
+        ``sprite_cache`` 中，不要原地修改
+    """
+    return sprite_cache.get_or_create(
+        ('circle', dot_size, offsets, span, quality),
+        lambda: _compute_circle_sprites(dot_size, offsets, span, quality)
+    )
+
+
+def _compute_circle_sprites(
+    dot_size: float, offsets: Tuple[float, ...], span: int, quality: str
+) -> np.ndarray:
+    """计算圆形抗锯齿码点图块，见 ``circle_sprites``"""
+    kind, factor = parse_quality(quality)
+    # 每个像素内采样点的坐标（'aa'时为像素中心）
+    samples = (np.arange(span)[:, None] + (np.arange(factor) + 0.5) / factor).reshape(-1)
+
+    table = np.zeros((len(offsets), len(offsets), span, span), dtype=np.uint8)
+    for i, offset_y in enumerate(offsets):
+        for j, offset_x in enumerate(offsets):
+            distance = np.hypot((samples - offset_y)[:, None], (samples - offset_x)[None, :])
+            if kind == 'aa':
+                coverage = np.clip(dot_size + 0.5 - distance, 0.0, 1.0)
+            else:
+                inside = distance <= dot_size
+                coverage = inside.reshape(span, factor, span, factor).mean(axis=(1, 3))
+            table[i, j] = np.round(coverage * 255)
+    return table
+
+
+class StampPlan(NamedTuple):
+    """
+    盖印码点所需的预计算结果
+
+    只与模块矩阵、画布大小和图块有关，与要生成的像素行无关，
+    因此可以在多个线程中共享，分别生成不同的行带。
+    """
+    modules_count: int
+    size: int
+    span: int
+    binary: bool
+    lo: np.ndarray
+    classes: np.ndarray
+    layers: List[Tuple[np.ndarray, np.ndarray]]
+    columns: List[Tuple[np.ndarray, Optional[np.ndarray]]]
+    # 可分离的方形抗锯齿码点：各层像素行的覆盖比例（见 ``plan_squares``）
+    weights: Optional[List[np.ndarray]] = None
+
+
+def plan_stamp(
+    matrix: np.ndarray,
+    size: int,
+    lo: np.ndarray,
+    hi: np.ndarray,
+    sprites: np.ndarray,
+    classes: np.ndarray,
+) -> StampPlan:
+    """
+    准备把码点图块盖印到所有深色模块上
+
+    先把模块矩阵沿x轴展开到像素列；``stamp_rows`` 再按码点图块的每一行
+    把对应的像素行整行拼出来，全部操作都是数组运算。布尔图块按位或合并；
+    uint8覆盖率图块相加后截断到255，相邻抗锯齿码点在接缝处的覆盖率正好互补。
+
+    Args:
+        matrix: 布尔模块矩阵，形状为 (n, n)
+        size: 输出图像大小（正方形）
+        lo: 每一行/列码点覆盖的起始像素
+        hi: 每一行/列码点覆盖的结束像素（含）
+        sprites: 图块查找表，形状为 (k, k, span, span)，
+            sprites[i, j] 为高度类别i、宽度类别j的图块
+        classes: 每一行/列码点所属的尺寸类别
+
+    Returns:
+        StampPlan，交给 ``stamp_rows`` 生成任意像素行
+    """
+    modules_count = matrix.shape[0]
+    span = sprites.shape[-1]
+    layers = pixel_layers(lo, hi, size)
+    pixels = np.arange(size, dtype=np.int64)
+
+    # 每个像素列所属模块列的深浅，以及每个像素列在各图块行上的取值
+    # patterns[key, x]，其中 key = 图块高度类别 * span + 图块内行偏移。
+    # expanded 末尾追加一行全False，供未被任何码点覆盖的像素行索引
+    columns = []
+    for index, valid in layers:
+        expanded = np.zeros((modules_count + 1, size), dtype=bool)
+        expanded[:modules_count] = matrix[:, index] & valid
+        offset = np.clip(pixels - lo[index], 0, span - 1)
+        patterns = sprites[:, classes[index], :, offset]
+        columns.append((expanded, patterns.reshape(size, -1).T.copy()))
+
+    return StampPlan(
+        modules_count, size, span, sprites.dtype == bool, lo, classes, layers, columns
+    )
+
+
+def plan_squares(matrix: np.ndarray, size: int, factor: int = 1) -> StampPlan:
+    """
+    准备栅格化方形抗锯齿码点
+
+    方形码点恰好占满连续的模块单元，覆盖率可按x、y方向分离：像素的覆盖率
+    等于它在两个方向上与单元重叠比例的乘积。先按列算出每个模块行的水平
+    覆盖率，``stamp_rows`` 再按行加权求和，相邻深色模块之间没有接缝。
+
+    Args:
+        matrix: 布尔模块矩阵，形状为 (n, n)
+        size: 输出图像大小（正方形）
+        factor: 每个方向的采样数，1为解析覆盖率
+
+    Returns:
+        StampPlan，交给 ``stamp_rows`` 生成任意像素行
+    """
+    modules_count = matrix.shape[0]
+    edges = cell_edges(modules_count, size)
+    lo = np.floor(edges[:-1]).astype(np.int64)
+    hi = np.maximum(np.ceil(edges[1:]).astype(np.int64) - 1, lo)
+    layers = pixel_layers(lo, hi, size)
+    pixels = np.arange(size, dtype=np.float64)
+
+    weights = [
+        (axis_coverage(pixels, edges[index], edges[index + 1], factor) * valid).astype(np.float32)
+        for index, valid in layers
+    ]
+    # 末尾追加一行全0，供未被任何码点覆盖的像素行索引
+    profile = np.zeros((modules_count + 1, size), dtype=np.float32)
+    for (index, _), weight in zip(layers, weights):
+        profile[:modules_count] += matrix[:, index] * weight
+
+    return StampPlan(
+        modules_count, size, 1, False, lo, np.zeros(modules_count, dtype=np.int64),
+        layers, [(profile, None)], weights
+    )
+
+
+def stamp_rows(plan: StampPlan, y0: int = 0, y1: Optional[int] = None) -> np.ndarray:
+    """
+    按盖印计划生成第 y0 到 y1（不含）行像素的覆盖数组
+
+    Returns:
+        形状为 (y1 - y0, size) 的覆盖数组，布尔图块时为布尔数组，否则为uint8
+    """
+    size, span, binary = plan.size, plan.span, plan.binary
+    y1 = size if y1 is None else y1
+    pixels = np.arange(y0, y1, dtype=np.int64)
+
+    if plan.weights is not None:
+        profile = plan.columns[0][0]
+        coverage = np.zeros((y1 - y0, size), dtype=np.float32)
+        for (index, valid), weight in zip(plan.layers, plan.weights):
+            rows = np.where(valid[y0:y1], index[y0:y1], plan.modules_count)
+            coverage += weight[y0:y1, None] * profile[rows]
+        return np.round(np.minimum(coverage, 1.0) * 255).astype(np.uint8)
+
+    # 沿y轴整行取出：每个像素行所属模块行的展开结果与对应图块行相乘。
+    # 第一层覆盖几乎所有像素行，整块计算；后续层只涉及码点重叠的少数行
+    coverage = np.zeros((y1 - y0, size), dtype=bool if binary else np.uint16)
+    for depth, (index, valid) in enumerate(plan.layers):
+        index, valid = index[y0:y1], valid[y0:y1]
+        offset = np.clip(pixels - plan.lo[index], 0, span - 1)
+        keys = plan.classes[index] * span + offset
+        rows = np.where(valid, index, plan.modules_count)
+        if depth == 0:
+            target, rows_used, keys_used = coverage, rows, keys
+        else:
+            ys = np.flatnonzero(valid)
+            rows_used, keys_used = rows[ys], keys[ys]
+            target = np.zeros((len(ys), size), dtype=coverage.dtype)
+        for expanded, patterns in plan.columns:
+            if binary:
+                target |= expanded[rows_used] & patterns[keys_used]
+            else:
+                target += patterns[keys_used] * expanded[rows_used]
+        if depth > 0:
+            if binary:
+                coverage[ys] |= target
+            else:
+                coverage[ys] += target
+
+    if binary:
+        return coverage
+    return np.minimum(coverage, 255).astype(np.uint8)
+
+
+def plan_dots(
+    matrix: np.ndarray,
+    size: int,
+    dot_shape: Literal["square", "circle"] = "square",
+    quality: str = "fast",
+) -> StampPlan:
+    """
+    准备栅格化码点，参数含义见 ``rasterize_dots``
+
+    Returns:
+        StampPlan，交给 ``stamp_rows`` 按行带生成覆盖掩码
+    """
+    kind, factor = parse_quality(quality)
+    modules_count = matrix.shape[0]
+
+    if kind != 'fast':
+        # 抗锯齿码点按连续的模块单元定位，不取整到像素
+        if dot_shape != 'circle':
+            return plan_squares(matrix, size, factor)
+        lo, hi, classes, offsets, span = circle_phases(modules_count, size)
+        sprites = circle_sprites(size / (modules_count * 2), offsets, span, quality)
+        return plan_stamp(matrix, size, lo, hi, sprites, classes)
+
+    lo, hi = dot_bounds(modules_count, size)
+
+    # 除画布边缘被截断的码点外，所有码点尺寸相同，因此图块种类极少
+    extents, classes = np.unique(hi - lo, return_inverse=True)
+    classes = classes.reshape(-1)
+    sprites = sprite_cache.get_or_create(
+        (dot_shape, tuple(extents.tolist()), 'fast'),
+        lambda: _fast_sprite_table(dot_shape, extents)
+    )
+    return plan_stamp(matrix, size, lo, hi, sprites, classes)
+
+
+def rasterize_dots(
+    matrix: np.ndarray,
+    size: int,
+    dot_shape: Literal["square", "circle"] = "square",
+    quality: str = "fast",
+) -> np.ndarray:
+    """
+    将模块矩阵栅格化为码点覆盖掩码
+
+    每种尺寸的码点图块只渲染一次，然后以数组运算盖印到所有深色模块上。
+
+    Args:
+        matrix: 布尔模块矩阵，形状为 (n, n)
+        size: 输出图像大小（正方形）
+        dot_shape: 码点形状，'square'(方形) 或 'circle'(圆形)
+        quality: 渲染质量。'fast'与逐点调用ImageDraw的结果逐像素一致；
+            'aa'使用解析覆盖率抗锯齿；'supersample-N'在每个像素内做N x N采样
+
+    Returns:
+        'fast'时为形状 (size, size) 的布尔数组，True表示需要填充前景色；
+        其余为同形状的uint8覆盖率数组（0-255）
+    """
+    return stamp_rows(plan_dots(matrix, size, dot_shape, quality))
+
+
+def _fast_sprite_table(
+    dot_shape: Literal["square", "circle"], extents: np.ndarray
+) -> np.ndarray:
+    """生成无抗锯齿的码点图块查找表"""
+    if dot_shape == 'circle':
+        return sprite_table(dot_shape, extents)
+    # 方形码点铺满整个外接框，查找表退化为全True
+    span = int(extents.max()) + 1
+    return np.ones((len(extents), len(extents), span, span), dtype=bool)
+
+
+def coverage_palette(
+    binary: bool,
+    fill_color: Union[str, tuple],
+    back_color: Union[str, tuple],
+) -> np.ndarray:
+    """
+    覆盖掩码对应的调色板：布尔掩码为 [背景色, 前景色]，
+    uint8覆盖率为从背景色到前景色的256级渐变
+
+    Returns:
+        形状为 (2, 4) 或 (256, 4) 的uint8 RGBA数组
+    """
+    fill = resolve_color(fill_color)
+    back = resolve_color(back_color)
+    if binary:
+        return np.array([back, fill], dtype=np.uint8)
+    t = np.arange(256, dtype=np.float64)[:, None] / 255
+    return np.round(
+        np.array(back, dtype=np.float64) * (1 - t) + np.array(fill, dtype=np.float64) * t
+    ).astype(np.uint8)
+
+
+def colorize(
+    coverage: np.ndarray,
+    fill_color: Union[str, tuple],
+    back_color: Union[str, tuple],
+    mode: Literal["RGBA", "P", "1", "auto"] = "RGBA",
+) -> Image.Image:
+    """
+    按码点覆盖掩码为图像上色
+
+    以掩码作为调色板索引构建调色板图像，需要RGBA时再由PIL一次性展开。
+    布尔掩码对应双色调色板，效果等同于在背景色画布上以掩码粘贴前景色；
+    uint8覆盖率对应从背景色到前景色的256级渐变调色板。
+
+    Args:
+        coverage: 码点覆盖掩码（布尔）或覆盖率（uint8），形状为 (h, w)
+        fill_color: 前景色
+        back_color: 背景色
+        mode: 输出模式。'RGBA'为真彩色；'P'为调色板图像（双色时PNG按1位深度写出）；
+            '1'为黑白二值图，仅支持布尔掩码及黑色前景、白色背景；
+            'auto'在可以时使用'1'，否则使用'P'
+
+    Returns:
+        指定模式的PIL Image对象
+    """
+    fill = resolve_color(fill_color)
+    back = resolve_color(back_color)
+    binary = coverage.dtype == bool
+    black_on_white = binary and fill == (0, 0, 0, 255) and back == (255, 255, 255, 255)
+
+    if mode == 'auto':
+        mode = '1' if black_on_white else 'P'
+    if mode == '1':
+        if not black_on_white:
+            raise ValueError("'1'模式只支持无抗锯齿的黑色前景和白色背景")
+        # 二值图中1为白色，因此取反
+        return Image.fromarray(~coverage)
+
+    palette = coverage_palette(binary, fill, back)
+    height, width = coverage.shape
+    img = Image.frombytes('P', (width, height), coverage.view(np.uint8).tobytes())
+    if fill[3] == 255 and back[3] == 255:
+        img.putpalette(palette[:, :3].tobytes(), 'RGB')
+    else:
+        img.putpalette(palette.tobytes(), 'RGBA')
+    if mode == 'P':
+        return img
+    return img.convert(mode)
+
+
+def _composite_over(colors: np.ndarray, mask: Tuple[int, int, int, int]) -> np.ndarray:
+    """
+    把纯色蒙板叠加到一组RGBA颜色上（Porter-Duff over）
+
+    按 Image.alpha_composite 的整数运算（7位额外精度、除以255时四舍五入）
+    计算，结果与之逐位一致。
+
+    Args:
+        colors: 形状为 (N, 4) 的uint8颜色数组
+        mask: 蒙板颜色 (r, g, b, a)
+
+    Returns:
+        形状为 (N, 4) 的uint8颜色数组
+    """
+    src_alpha = mask[3]
+    if src_alpha == 0:
+        return colors.copy()
+
+    def div255(value: np.ndarray) -> np.ndarray:
+        return ((value >> 8) + value) >> 8
+
+    src = np.array(mask[:3], dtype=np.int64)
+    dst = colors[:, :3].astype(np.int64)
+    dst_alpha = colors[:, 3:].astype(np.int64)
+
+    out_alpha = src_alpha * 255 + dst_alpha * (255 - src_alpha)
+    src_weight = src_alpha * 255 * 255 * 128 // out_alpha
+    dst_weight = 255 * 128 - src_weight
+
+    out = np.empty_like(colors)
+    out[:, :3] = div255(src * src_weight + dst * dst_weight + (0x80 << 7)) >> 7
+    out[:, 3:] = div255(out_alpha + 0x80)
+    return out
+
+
+def _mask_rgba(mask_color: Union[str, tuple], mask_opacity: float) -> Tuple[int, int, int, int]:
+    """蒙板颜色和不透明度对应的RGBA颜色"""
+    color = resolve_color(mask_color)
+    return (*color[:3], int(255 * mask_opacity))
+
+
+def mask_colors(
+    colors: Sequence[Union[str, tuple]],
+    mask_color: Union[str, tuple],
+    mask_opacity: float
+) -> List[Tuple[int, int, int, int]]:
+    """
+    计算叠加蒙板后的颜色，结果与 apply_mask 作用于这些颜色的像素一致
+
+    Args:
+        colors: 原颜色序列
+        mask_color: 蒙板颜色
+        mask_opacity: 蒙板不透明度（0.0-1.0）
+
+    Returns:
+        叠加蒙板后的RGBA颜色列表
+    """
+    palette = np.array([resolve_color(color) for color in colors], dtype=np.uint8)
+    mask = _mask_rgba(mask_color, mask_opacity)
+    if mask[3] == 0:
+        return [tuple(color) for color in palette.tolist()]
+    return [tuple(color) for color in _composite_over(palette, mask).tolist()]
+
+
+def apply_mask(img: Image.Image, mask_color: Union[str, tuple], mask_opacity: float) -> Image.Image:
+    """
+    在图像上叠加覆盖全图的半透明纯色蒙板
+
+    结果等同于用 Image.alpha_composite 叠加一张纯色RGBA图层，但不分配该图层：
+    蒙板对每个像素都是同一个按通道的仿射变换，调色板图像只需变换调色板颜色，
+    真彩色图像由 Image.point 按通道查表一次完成。图像模式尽量保持不变：
+    调色板图像仍为调色板图像，'1'模式转换为双色调色板图像，RGB仍为RGB。
+
+    Args:
+        img: 要叠加蒙板的图像，调色板图像会被原地修改
+        mask_color: 蒙板颜色
+        mask_opacity: 蒙板不透明度（0.0-1.0）
+
+    Returns:
+        叠加蒙板后的图像
+    """
+    mask = _mask_rgba(mask_color, mask_opacity)
+    if mask[3] == 0:
+        return img
+
+    if img.mode == '1':
+        # 二值图中1为白色，先转换为以0为背景、1为前景的双色调色板图像
+        img = colorize(~np.asarray(img), "black", "white", mode='P')
+    elif img.mode not in ('P', 'RGB', 'RGBA'):
+        img = img.convert('RGBA')
+
+    if img.mode == 'P':
+        palette = np.array(img.getpalette('RGBA'), dtype=np.uint8).reshape(-1, 4)
+        blended = _composite_over(palette, mask)
+        if (blended[:, 3] == 255).all():
+            img.putpalette(blended[:, :3].tobytes(), 'RGB')
+        else:
+            img.putpalette(blended.tobytes(), 'RGBA')
+        return img
+
+    # 不透明像素叠加蒙板后每个通道只取决于自身的值，可以按通道查表
+    levels = np.arange(256, dtype=np.uint8)
+    opaque = np.full((256, 4), 255, dtype=np.uint8)
+    opaque[:, :3] = levels[:, None]
+    lut = _composite_over(opaque, mask)[:, :3].T.ravel().tolist()
+    if img.mode == 'RGB':
+        return img.point(lut)
+    if img.getchannel('A').getextrema()[0] == 255:
+        return img.point(lut + levels.tolist())
+
+    # 含半透明像素时颜色与透明度相关，逐像素计算
+    pixels = np.asarray(img).reshape(-1, 4)
+    blended = _composite_over(pixels, mask)
+    return Image.frombytes('RGBA', img.size, blended.tobytes())
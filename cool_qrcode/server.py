@@ -0,0 +1,335 @@
+"""
+Cool QRCode HTTP服务
+
+只依赖标准库的二维码渲染服务：
+
+    GET /qr?data=Hello&style=ocean&dot=circle&size=400&format=png
+
+渲染参数先规范化（颜色统一为十六进制、风格展开为颜色），同样的二维码
+无论写法如何都对应同一个缓存键和ETag。命中内存缓存或客户端携带匹配的
+If-None-Match时不渲染；未命中时交给有界的渲染线程池。
+
+启动:
+    python -m cool_qrcode.server --port 8000
+"""
+
+import argparse
+import hashlib
+import io
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import NamedTuple, Optional, Sequence, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from . import __version__
+from .cache import CacheInfo, LRUCache
+from .colors import to_hex
+from .exceptions import CoolQRCodeError
+from .raster import parse_quality
+from .simple import PRETTY_COLORS, make_cool_qrcode
+
+MAX_DATA_LENGTH = 2953
+MIN_SIZE = 21
+MAX_SIZE = 4096
+# 超采样的内存与耗时按N²增长，匿名请求最多每个方向8次采样
+MAX_SUPERSAMPLE = 8
+
+CONTENT_TYPES = {"png": "image/png", "svg": "image/svg+xml"}
+
+
+class RenderParams(NamedTuple):
+    """规范化后的渲染参数，同时作为缓存键"""
+    data: str
+    size: int
+    dot_shape: str
+    fill_color: str
+    back_color: str
+    quality: str
+    format: str
+
+
+def parse_query(query: str) -> RenderParams:
+    """
+    解析并规范化查询参数
+
+    支持的参数：data（必填）、size、dot（square/circle）、style、fill、back、
+    quality（fast/aa/supersample-N，N不超过8）、format（png/svg）。指定style时忽略fill和back。
+
+    Args:
+        query: URL查询字符串
+
+    Returns:
+        规范化的RenderParams
+
+    Raises:
+        ValueError: 当参数缺失或无效时抛出
+    """
+    fields = parse_qs(query, keep_blank_values=True)
+
+    def field(name: str, default: Optional[str] = None) -> Optional[str]:
+        values = fields.get(name)
+        return values[-1] if values else default
+
+    data = field("data")
+    if not data:
+        raise ValueError("缺少data参数")
+    if len(data) > MAX_DATA_LENGTH:
+        raise ValueError(f"data过长，最多{MAX_DATA_LENGTH}个字符")
+
+    try:
+        size = int(field("size", "500"))
+    except ValueError:
+        raise ValueError("size必须是整数")
+    if not MIN_SIZE <= size <= MAX_SIZE:
+        raise ValueError(f"size必须在{MIN_SIZE}到{MAX_SIZE}之间")
+
+    dot_shape = field("dot", "square")
+    if dot_shape not in ("square", "circle"):
+        raise ValueError("dot必须是square或circle")
+
+    style = field("style")
+    if style:
+        if style not in PRETTY_COLORS:
+            raise ValueError(f"未知的style: {style}")
+        fill_color, back_color = PRETTY_COLORS[style]
+    else:
+        fill_color, back_color = field("fill", "black"), field("back", "white")
+
+    quality = field("quality", "fast")
+    _, samples = parse_quality(quality)
+    if samples > MAX_SUPERSAMPLE:
+        raise ValueError(f"supersample的采样数最多为{MAX_SUPERSAMPLE}")
+
+    output_format = field("format", "png").lower()
+    if output_format not in CONTENT_TYPES:
+        raise ValueError("format必须是png或svg")
+
+    if output_format == "svg":
+        # 矢量输出与渲染质量无关，规范化后共用同一个缓存键
+        quality = "fast"
+
+    return RenderParams(
+        data, size, dot_shape, to_hex(fill_color), to_hex(back_color), quality, output_format
+    )
+
+
+def render(params: RenderParams) -> bytes:
+    """
+    按规范化参数渲染二维码
+
+    Returns:
+        PNG或SVG的字节数据
+    """
+    options = dict(
+        size=params.size,
+        fill_color=params.fill_color,
+        back_color=params.back_color,
+        dot_shape=params.dot_shape,
+    )
+    if params.format == "svg":
+        return make_cool_qrcode(params.data, format="svg", **options).encode("utf-8")
+    img = make_cool_qrcode(params.data, mode="auto", quality=params.quality, **options)
+    bio = io.BytesIO()
+    img.save(bio, format="PNG")
+    return bio.getvalue()
+
+
+class QRCodeService:
+    """
+    带响应缓存和渲染线程池的二维码服务逻辑，与HTTP层无关
+
+    示例:
+        service = QRCodeService(workers=4)
+        body = service.get(parse_query("data=Hello&style=ocean"))
+    """
+
+    def __init__(
+        self,
+        workers: int = 4,
+        cache_size: int = 4096,
+        cache_bytes: int = 64 * 1024 * 1024
+    ):
+        """
+        初始化服务
+
+        Args:
+            workers: 渲染线程数
+            cache_size: 响应缓存的最大条目数
+            cache_bytes: 响应缓存的内存预算（字节）
+        """
+        self.cache = LRUCache(maxsize=cache_size, maxbytes=cache_bytes, sizeof=len)
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="cool-qrcode-http")
+
+    @staticmethod
+    def etag(params: RenderParams) -> str:
+        """
+        计算渲染结果的ETag
+
+        渲染结果完全由规范化参数和库版本决定，因此无需渲染即可得到ETag。
+        """
+        digest = hashlib.sha256(repr((__version__,) + tuple(params)).encode("utf-8"))
+        return f'"{digest.hexdigest()[:32]}"'
+
+    def get(self, params: RenderParams) -> bytes:
+        """
+        获取渲染结果，未命中缓存时在渲染线程池中渲染
+
+        Raises:
+            CoolQRCodeError: 当渲染失败时抛出
+        """
+        return self.cache.get_or_create(
+            params, lambda: self._executor.submit(render, params).result()
+        )
+
+    def info(self) -> CacheInfo:
+        """响应缓存的统计信息"""
+        return self.cache.info()
+
+    def close(self) -> None:
+        """关闭渲染线程池"""
+        self._executor.shutdown(wait=True)
+
+
+class QRCodeRequestHandler(BaseHTTPRequestHandler):
+    """处理 /qr 请求"""
+
+    server: "QRCodeHTTPServer"
+    server_version = f"cool-qrcode/{__version__}"
+
+    def do_GET(self) -> None:
+        self._handle(send_body=True)
+
+    def do_HEAD(self) -> None:
+        self._handle(send_body=False)
+
+    def _handle(self, send_body: bool) -> None:
+        url = urlsplit(self.path)
+        if url.path != "/qr":
+            self._send_error(HTTPStatus.NOT_FOUND, "未知路径，请使用 /qr", send_body)
+            return
+
+        try:
+            params = parse_query(url.query)
+        except (ValueError, CoolQRCodeError) as e:
+            self._send_error(HTTPStatus.BAD_REQUEST, str(e), send_body)
+            return
+
+        service = self.server.service
+        etag = service.etag(params)
+        if etag in _parse_etags(self.headers.get("If-None-Match", "")):
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self._send_cache_headers(etag)
+            self.end_headers()
+            return
+
+        try:
+            body = service.get(params)
+        except CoolQRCodeError as e:
+            self._send_error(HTTPStatus.BAD_REQUEST, str(e), send_body)
+            return
+        except Exception as e:
+            self.log_error("渲染失败: %r", e)
+            self._send_error(HTTPStatus.INTERNAL_SERVER_ERROR, "渲染失败", send_body)
+            return
+
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", CONTENT_TYPES[params.format])
+        self.send_header("Content-Length", str(len(body)))
+        self._send_cache_headers(etag)
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+    def _send_cache_headers(self, etag: str) -> None:
+        self.send_header("ETag", etag)
+        self.send_header("Cache-Control", "public, max-age=86400")
+
+    def _send_error(self, status: HTTPStatus, message: str, send_body: bool) -> None:
+        body = message.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "text/plain; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+
+def _parse_etags(header: str) -> Tuple[str, ...]:
+    """解析If-None-Match中的ETag列表，忽略弱校验前缀"""
+    tags = (tag.strip() for tag in header.split(","))
+    return tuple(tag[2:] if tag.startswith("W/") else tag for tag in tags if tag)
+
+
+class QRCodeHTTPServer(ThreadingHTTPServer):
+    """二维码HTTP服务器，每个连接一个线程，渲染交给共享的QRCodeService"""
+
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], service: QRCodeService, quiet: bool = False):
+        super().__init__(address, QRCodeRequestHandler)
+        self.service = service
+        self.quiet = quiet
+
+    def server_close(self) -> None:
+        super().server_close()
+        self.service.close()
+
+
+def create_server(
+    host: str = "127.0.0.1",
+    port: int = 8000,
+    workers: int = 4,
+    cache_size: int = 4096,
+    cache_bytes: int = 64 * 1024 * 1024,
+    quiet: bool = False
+) -> QRCodeHTTPServer:
+    """
+    创建二维码HTTP服务器（不启动），调用 serve_forever() 开始服务
+
+    Args:
+        host: 监听地址
+        port: 监听端口，0表示自动分配
+        workers: 渲染线程数
+        cache_size: 响应缓存的最大条目数
+        cache_bytes: 响应缓存的内存预算（字节）
+        quiet: 是否关闭访问日志
+
+    Returns:
+        QRCodeHTTPServer对象
+    """
+    service = QRCodeService(workers=workers, cache_size=cache_size, cache_bytes=cache_bytes)
+    return QRCodeHTTPServer((host, port), service, quiet=quiet)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """命令行入口"""
+    parser = argparse.ArgumentParser(prog="python -m cool_qrcode.server",
+                                     description="Cool QRCode HTTP渲染服务")
+    parser.add_argument("--host", default="127.0.0.1", help="监听地址（默认127.0.0.1）")
+    parser.add_argument("--port", type=int, default=8000, help="监听端口（默认8000）")
+    parser.add_argument("--workers", type=int, default=4, help="渲染线程数（默认4）")
+    parser.add_argument("--cache-mb", type=int, default=64, help="响应缓存大小（MB，默认64）")
+    parser.add_argument("-q", "--quiet", action="store_true", help="关闭访问日志")
+    args = parser.parse_args(argv)
+
+    server = create_server(args.host, args.port, workers=args.workers,
+                           cache_bytes=args.cache_mb * 1024 * 1024, quiet=args.quiet)
+    host, port = server.server_address[:2]
+    print(f"Cool QRCode服务已启动: http://{host}:{port}/qr?data=Hello", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
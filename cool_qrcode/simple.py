@@ -2,14 +2,22 @@
 Cool QRCode 简化API - 专为初学者设计
 """
 
-from typing import Union, Optional, Literal
+from typing import Union, Optional, Literal, Iterable, Iterator, Tuple
 from pathlib import Path
 from PIL import Image, ImageDraw, ImageEnhance
+import hashlib
+import io
 import tempfile
 import os
 
-from .core import CoolQRCode
-from .exceptions import CoolQRCodeError
+from . import __version__
+from .cache import DiskCache, logo_digest_cache
+from .core import CoolQRCode, load_logo
+from .raster import apply_mask
+from .style import QRStyle
+from .svg import render_svg
+from .colors import resolve_color
+from .exceptions import CoolQRCodeError, InvalidDataError, InvalidLogoError
 
 
 def make_cool_qrcode(
@@ -27,8 +35,14 @@ def make_cool_qrcode(
     logo_circular: bool = True,
     # 蒙板选项
     mask_color: Optional[str] = None,
-    mask_opacity: float = 0.3
-) -> Image.Image:
+    mask_opacity: float = 0.3,
+    # 输出选项
+    format: Optional[str] = None,
+    mode: Literal["RGBA", "P", "1", "auto"] = "RGBA",
+    quality: str = "fast",
+    # 缓存选项
+    cache: Optional[DiskCache] = None
+) -> Union[Image.Image, str]:
     """
     生成自定义二维码 - 万能函数，支持多种效果组合
 
@@ -74,9 +88,29 @@ def make_cool_qrcode(
         
         mask_opacity (float, 可选): 
             蒙板透明度，范围0.0-1.0。0.0为完全透明，1.0为完全不透明。默认为0.3。
+        
+        format (str, 可选):
+            输出格式。设为"svg"时直接从模块矩阵生成SVG矢量图并返回字符串，
+            不经过栅格化。默认为None，返回PIL图像。
+        
+        mode (str, 可选):
+            图像模式，默认为"RGBA"。双色二维码（无Logo）可使用"P"(双色调色板)、
+            "1"(黑白二值，仅限黑色码点白色背景)或"auto"(自动选择)，
+            内存更小，保存为PNG时按1位深度写出。有Logo时始终为RGBA；
+            蒙板只变换调色板颜色，"1"模式加蒙板后为双色调色板图像。
+        
+        quality (str, 可选):
+            渲染质量，默认为"fast"（最快，无抗锯齿）。"aa"为抗锯齿，圆形码点边缘平滑；
+            "supersample-N"在每个像素内做N x N采样（如"supersample-4"），
+            N越大越精细也越慢。SVG输出不受此参数影响。
+        
+        cache (DiskCache, 可选):
+            磁盘缓存。指定时按全部渲染参数（含Logo文件内容和库版本）计算摘要，
+            命中则直接读取编码好的PNG/SVG，不再渲染；未命中时渲染后写入缓存。
+            默认为None，不使用缓存。
 
     返回:
-        PIL.Image.Image: 生成的二维码图像对象
+        PIL.Image.Image: 生成的二维码图像对象；format为"svg"时返回SVG字符串
 
     示例:
         # 基本用法
@@ -100,6 +134,16 @@ def make_cool_qrcode(
         # 添加蒙板效果
         make_cool_qrcode("Hello", mask_color="blue", mask_opacity=0.3)
         
+        # 抗锯齿圆形码点
+        make_cool_qrcode("Hello", dot_shape="circle", quality="aa")
+        
+        # 输出SVG矢量图
+        make_cool_qrcode("Hello", dot_shape="circle", format="svg", filename="qr.svg")
+        
+        # 使用磁盘缓存，重复生成时直接读取
+        cache = DiskCache("~/.cache/cool-qrcode")
+        make_cool_qrcode("Hello", style="ocean", cache=cache, filename="qr.png")
+        
         # 组合多种效果
         make_cool_qrcode(
             "综合效果示例",
@@ -114,23 +158,31 @@ def make_cool_qrcode(
     
     注意:
         1. 组合效果时，style会覆盖fill_color和back_color设置
-        2. 当使用蒙板效果时，图像会自动转换为RGBA模式
+        2. 当使用Logo时，图像会自动转换为RGBA模式
         3. 当logo_path不存在时，会抛出异常
         4. 如果指定filename，函数会自动保存图像并打印确认信息
     """
     
     # 1. 确定颜色
-    if style:
-        # 使用预设风格
-        if style not in PRETTY_COLORS:
-            print(f"⚠️ 风格 '{style}' 不存在，使用默认风格 'ocean'")
-            style = "ocean"
-        fill_color, back_color = PRETTY_COLORS[style]
+    fill_color, back_color = _resolve_colors(fill_color, back_color, style)
+    
+    # 使用磁盘缓存时，按渲染参数的摘要读取或写入编码结果
+    if cache is not None:
+        return _make_cached(
+            cache, data, filename, size, fill_color, back_color, dot_shape, logo_path,
+            logo_circular, mask_color, mask_opacity, format, mode, quality
+        )
     
     # 2. 创建基础二维码
     qr = CoolQRCode(fill_color=fill_color, back_color=back_color)
     qr.add_data(data)
     
+    # SVG输出直接由模块矩阵生成，不经过栅格化
+    if format and format.lower() == "svg":
+        return _make_svg(
+            qr, filename, size, dot_shape, logo_path, logo_circular, mask_color, mask_opacity
+        )
+    
     # 3. 生成图像（根据是否有Logo选择不同方法）
     if logo_path:
         # 有Logo的情况
@@ -139,23 +191,23 @@ def make_cool_qrcode(
             size=size,
             dot_shape=dot_shape,
             logo_size_ratio=0.2,
-            circular_logo=logo_circular
+            circular_logo=logo_circular,
+            quality=quality
         )
     else:
-        # 无Logo的情况
-        img = qr.make_custom_image(size=size, dot_shape=dot_shape)
+        # 无Logo的情况（有蒙板时先生成调色板图像，蒙板只需变换调色板颜色）
+        img = qr.make_custom_image(
+            size=size,
+            dot_shape=dot_shape,
+            mode="P" if mask_color and mode == "RGBA" else mode,
+            quality=quality
+        )
     
     # 4. 应用蒙板效果（如果指定）
     if mask_color:
-        # 创建半透明蒙板
-        mask = Image.new('RGBA', (size, size), (*_color_to_rgb(mask_color), int(255 * mask_opacity)))
-        
-        # 将原图转换为RGBA模式
-        if img.mode != 'RGBA':
-            img = img.convert('RGBA')
-        
-        # 应用蒙板
-        img = Image.alpha_composite(img, mask)
+        img = apply_mask(img, mask_color, mask_opacity)
+        if mode == "RGBA" and img.mode != "RGBA":
+            img = img.convert("RGBA")
     
     # 5. 保存文件（如果指定）
     if filename:
@@ -165,6 +217,243 @@ def make_cool_qrcode(
     return img
 
 
+def make_cool_qrcode_batch(
+    datas: Iterable[str],
+    size: int = 500,
+    # 颜色选项
+    fill_color: str = "black",
+    back_color: str = "white",
+    style: Optional[str] = None,
+    # 形状选项
+    dot_shape: Literal["square", "circle"] = "square",
+    # Logo选项
+    logo_path: Optional[str] = None,
+    logo_circular: bool = True,
+    # 蒙板选项
+    mask_color: Optional[str] = None,
+    mask_opacity: float = 0.3,
+    # 输出选项
+    format: Optional[str] = None,
+    mode: Literal["RGBA", "P", "1", "auto"] = "auto",
+    quality: str = "fast"
+) -> Iterator[Union[Image.Image, bytes]]:
+    """
+    批量生成相同样式的二维码 - 适合一次生成成千上万个二维码
+
+    所有二维码共用同一套样式：颜色和Logo图块只准备一次，
+    之后每个数据只做编码和绘制。结果以生成器逐个返回，无论批量多大，
+    内存占用都保持平稳。
+
+    参数:
+        datas (Iterable[str]):
+            二维码内容序列，可以是列表，也可以是按需产生数据的生成器。
+
+        format (str, 可选):
+            输出格式，如 "PNG"。指定时逐个返回编码后的字节数据，
+            否则返回PIL图像对象。默认为None。
+
+        mode (str, 可选):
+            图像模式，含义同 make_cool_qrcode。默认为"auto"：双色二维码使用
+            1位调色板/二值图像，内存和PNG体积都远小于RGBA；抗锯齿时使用
+            256级渐变调色板。
+
+        quality (str, 可选):
+            渲染质量，含义同 make_cool_qrcode。抗锯齿码点图块按尺寸缓存，
+            整批只计算一次。默认为"fast"。
+
+        其余参数与 make_cool_qrcode 相同。
+
+    返回:
+        生成器，按输入顺序逐个产生 PIL.Image.Image 或 bytes
+
+    示例:
+        # 批量生成图像
+        for img in make_cool_qrcode_batch(["A", "B", "C"], style="ocean"):
+            ...
+
+        # 批量生成PNG字节数据
+        urls = (f"https://example.com/{i}" for i in range(10000))
+        for png in make_cool_qrcode_batch(urls, dot_shape="circle", format="PNG"):
+            ...
+
+    注意:
+        1. 生成器是惰性的，Logo文件不存在等错误会在取第一个结果时抛出
+        2. 每个数据都必须非空，否则抛出异常
+    """
+    # 1. 一次性编译所有与数据无关的样式
+    template = QRStyle(
+        size=size,
+        fill_color=fill_color,
+        back_color=back_color,
+        style=style,
+        dot_shape=dot_shape,
+        logo_path=logo_path,
+        logo_circular=logo_circular,
+        mask_color=mask_color,
+        mask_opacity=mask_opacity,
+        mode=mode,
+        quality=quality
+    )
+    
+    # 2. 逐个编码、绘制并产出
+    for data in datas:
+        yield template.render(data, format=format)
+
+
+def _make_svg(
+    qr: CoolQRCode,
+    filename: Optional[str],
+    size: int,
+    dot_shape: Literal["square", "circle"],
+    logo_path: Optional[str],
+    logo_circular: bool,
+    mask_color: Optional[str],
+    mask_opacity: float
+) -> str:
+    """生成SVG格式的二维码，可选保存到文件"""
+    logo = None
+    if logo_path:
+        if not Path(logo_path).exists():
+            raise InvalidLogoError(f"Logo文件不存在: {logo_path}")
+        logo = load_logo(logo_path, int(size * 0.2), circular=logo_circular)
+    
+    svg = render_svg(
+        qr.encode().as_numpy(),
+        size=size,
+        dot_shape=dot_shape,
+        fill_color=qr.fill_color,
+        back_color=qr.back_color,
+        logo=logo,
+        mask_color=mask_color,
+        mask_opacity=mask_opacity
+    )
+    
+    if filename:
+        with open(filename, "w", encoding="utf-8") as f:
+            f.write(svg)
+        print(f"✅ 酷炫二维码已保存为 {filename}")
+    
+    return svg
+
+
+def _render_key(
+    data: str,
+    size: int,
+    fill_color: str,
+    back_color: str,
+    dot_shape: str,
+    logo_path: Optional[str],
+    logo_circular: bool,
+    mask_color: Optional[str],
+    mask_opacity: float,
+    svg: bool,
+    mode: str,
+    quality: str
+) -> str:
+    """
+    计算渲染结果的内容摘要
+
+    颜色按解析后的RGBA值参与计算，"red"与"#FF0000"得到相同的摘要；
+    Logo按文件内容参与计算，文件内容变化后摘要随之变化。
+    """
+    logo_digest = _logo_digest(logo_path) if logo_path else None
+    params = (
+        __version__, data, size, resolve_color(fill_color), resolve_color(back_color),
+        dot_shape, logo_digest, logo_circular if logo_path else None,
+        resolve_color(mask_color) if mask_color else None,
+        mask_opacity if mask_color else None,
+        "svg" if svg else "png",
+        None if svg else ("RGBA" if logo_path else mode),
+        None if svg else quality,
+    )
+    return hashlib.sha256(repr(params).encode("utf-8")).hexdigest()
+
+
+def _logo_digest(logo_path: str) -> str:
+    """Logo文件内容的摘要，按 (路径, 修改时间, 大小) 缓存，文件不变时不重复读取"""
+    path = Path(logo_path)
+    if not path.exists():
+        raise InvalidLogoError(f"Logo文件不存在: {logo_path}")
+    stat = path.stat()
+    key = (str(path.resolve()), stat.st_mtime_ns, stat.st_size)
+    return logo_digest_cache.get_or_create(
+        key, lambda: hashlib.sha256(path.read_bytes()).hexdigest()
+    )
+
+
+def _make_cached(
+    cache: DiskCache,
+    data: str,
+    filename: Optional[str],
+    size: int,
+    fill_color: str,
+    back_color: str,
+    dot_shape: Literal["square", "circle"],
+    logo_path: Optional[str],
+    logo_circular: bool,
+    mask_color: Optional[str],
+    mask_opacity: float,
+    format: Optional[str],
+    mode: Literal["RGBA", "P", "1", "auto"],
+    quality: str
+) -> Union[Image.Image, str]:
+    """通过磁盘缓存生成二维码：命中时读取编码结果，未命中时渲染并写入缓存"""
+    if not data:
+        raise InvalidDataError("数据不能为空")
+    svg = bool(format) and format.lower() == "svg"
+    key = _render_key(
+        data, size, fill_color, back_color, dot_shape, logo_path, logo_circular,
+        mask_color, mask_opacity, svg, mode, quality
+    )
+    
+    payload = cache.get(key)
+    if payload is None:
+        result = make_cool_qrcode(
+            data, size=size, fill_color=fill_color, back_color=back_color,
+            dot_shape=dot_shape, logo_path=logo_path, logo_circular=logo_circular,
+            mask_color=mask_color, mask_opacity=mask_opacity, format=format,
+            mode=mode, quality=quality
+        )
+        if svg:
+            payload = result.encode("utf-8")
+        else:
+            bio = io.BytesIO()
+            result.save(bio, format="PNG")
+            payload = bio.getvalue()
+        cache.put(key, payload)
+    elif svg:
+        result = payload.decode("utf-8")
+    else:
+        result = Image.open(io.BytesIO(payload))
+        result.load()
+    
+    if filename:
+        # 缓存中已是编码好的PNG/SVG，目标格式相同时直接写入文件
+        if svg or Path(filename).suffix.lower() == ".png":
+            with open(filename, "wb") as f:
+                f.write(payload)
+        else:
+            result.save(filename)
+        print(f"✅ 酷炫二维码已保存为 {filename}")
+    
+    return result
+
+
+def _resolve_colors(
+    fill_color: str,
+    back_color: str,
+    style: Optional[str]
+) -> Tuple[str, str]:
+    """根据预设风格确定前景色和背景色，风格优先"""
+    if style:
+        # 使用预设风格
+        if style not in PRETTY_COLORS:
+            print(f"⚠️ 风格 '{style}' 不存在，使用默认风格 'ocean'")
+            style = "ocean"
+        fill_color, back_color = PRETTY_COLORS[style]
+    return fill_color, back_color
+
+
 def make_qrcode(
     data: str,
     filename: Optional[str] = None,
@@ -393,62 +682,7 @@ def create_sample_logo(filename: str = "sample_logo.png") -> str:
 
 def _color_to_rgb(color: str) -> tuple:
     """将颜色名称转换为RGB值"""
-    color_map = {
-        # 基础颜色
-        'red': (255, 0, 0),
-        'green': (0, 255, 0),
-        'blue': (0, 0, 255),
-        'yellow': (255, 255, 0),
-        'purple': (128, 0, 128),
-        'orange': (255, 165, 0),
-        'pink': (255, 192, 203),
-        'cyan': (0, 255, 255),
-        'black': (0, 0, 0),
-        'white': (255, 255, 255),
-        'gray': (128, 128, 128),
-        'grey': (128, 128, 128),
-        
-        # 添加更多常用颜色
-        'aqua': (0, 255, 255),      # 水绿色
-        'fuchsia': (255, 0, 255),   # 紫红色
-        'lime': (0, 255, 0),        # 酸橙色
-        'maroon': (128, 0, 0),      # 栗色
-        'navy': (0, 0, 128),        # 海军蓝
-        'olive': (128, 128, 0),     # 橄榄色
-        'silver': (192, 192, 192),  # 银色
-        'teal': (0, 128, 128),      # 蓝绿色
-        
-        # 扩展颜色
-        'lightblue': (173, 216, 230),
-        'lightgreen': (144, 238, 144),
-        'lightcyan': (224, 255, 255),
-        'lightyellow': (255, 255, 224),
-        'lavender': (230, 230, 250),
-        'lightgray': (211, 211, 211),
-        'lightpink': (255, 182, 193),
-        'darkblue': (0, 0, 139),
-        'darkgreen': (0, 100, 0),
-        'darkorange': (255, 140, 0),
-        'darkred': (139, 0, 0),
-        'brown': (165, 42, 42),
-        'wheat': (245, 222, 179),
-    }
-    
-    color_lower = color.lower()
-    if color_lower in color_map:
-        return color_map[color_lower]
-    
-    # 如果是十六进制颜色
-    if color.startswith('#'):
-        try:
-            hex_color = color[1:]
-            if len(hex_color) == 6:
-                return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
-        except ValueError:
-            pass
-    
-    # 默认返回黑色
-    return (0, 0, 0)
+    return resolve_color(color)[:3]
 
 
 # 预设的漂亮颜色组合
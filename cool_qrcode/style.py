@@ -0,0 +1,175 @@
+"""
+Cool QRCode样式模板模块
+
+把与数据无关的样式（颜色、码点形状、Logo图块、蒙板、输出尺寸）预先编译成
+QRStyle对象，之后每个数据只需编码和盖印码点。QRStyle可以pickle，
+适合发送到工作进程后反复使用。
+"""
+
+import io
+from pathlib import Path
+from typing import Optional, Union, Literal
+
+from PIL import Image
+from qrcode.constants import ERROR_CORRECT_M
+
+from .colors import ColorType, resolve_color
+from .core import encode_matrix, load_logo
+from .exceptions import ImageGenerationError, InvalidLogoError
+from .raster import apply_mask, colorize, mask_colors, parse_quality, rasterize_dots
+
+MODES = ("RGBA", "P", "1", "auto")
+DOT_SHAPES = ("square", "circle")
+
+BLACK = (0, 0, 0, 255)
+WHITE = (255, 255, 255, 255)
+
+
+class QRStyle:
+    """
+    预编译的二维码样式，render(data) 只做编码和码点盖印
+
+    颜色在创建时解析，Logo在创建时读取并缩放，蒙板在可以时直接折算进
+    前景色和背景色（双色二维码叠加蒙板后仍是双色），不再逐像素合成。
+    码点图块按尺寸保存在进程内的共享缓存中，每个进程只生成一次。
+
+    示例:
+        style = QRStyle(size=400, style="ocean", dot_shape="circle", logo_path="logo.png")
+        for url in urls:
+            png = style.render(url, format="PNG")
+    """
+
+    def __init__(
+        self,
+        size: int = 500,
+        fill_color: ColorType = "black",
+        back_color: ColorType = "white",
+        style: Optional[str] = None,
+        dot_shape: Literal["square", "circle"] = "square",
+        logo_path: Optional[Union[str, Path]] = None,
+        logo_circular: bool = True,
+        logo_size_ratio: float = 0.2,
+        mask_color: Optional[ColorType] = None,
+        mask_opacity: float = 0.3,
+        mode: Literal["RGBA", "P", "1", "auto"] = "auto",
+        quality: str = "fast",
+        version: int = 1,
+        error_correction: int = ERROR_CORRECT_M
+    ):
+        """
+        编译样式
+
+        Args:
+            size: 输出图像大小（正方形）
+            fill_color: 前景色
+            back_color: 背景色
+            style: 预设风格名称（见 PRETTY_COLORS），指定时覆盖前景色和背景色
+            dot_shape: 码点形状，'square'(方形) 或 'circle'(圆形)
+            logo_path: Logo文件路径（可选），粘贴在二维码中央
+            logo_circular: Logo是否裁剪为圆形
+            logo_size_ratio: Logo边长相对于图像大小的比例
+            mask_color: 蒙板颜色（可选）
+            mask_opacity: 蒙板不透明度（0.0-1.0）
+            mode: 图像模式，含义同 make_cool_qrcode；有Logo时始终为RGBA
+            quality: 渲染质量，'fast'、'aa' 或 'supersample-N'
+            version: 起始版本（1-40）
+            error_correction: 纠错级别
+
+        Raises:
+            InvalidColorError: 当颜色无法识别时抛出
+            InvalidLogoError: 当Logo文件不存在时抛出
+            ValueError: 当尺寸、码点形状、图像模式或渲染质量无效时抛出
+        """
+        if style:
+            from .simple import _resolve_colors
+            fill_color, back_color = _resolve_colors(fill_color, back_color, style)
+        if size < 1:
+            raise ValueError("size必须大于0")
+        if dot_shape not in DOT_SHAPES:
+            raise ValueError(f"无效的码点形状: {dot_shape!r}，可选 'square' 或 'circle'")
+        if mode not in MODES:
+            raise ValueError(f"无效的图像模式: {mode!r}，可选 {', '.join(MODES)}")
+        kind, _ = parse_quality(quality)
+
+        self.size = size
+        self.dot_shape = dot_shape
+        self.mode = mode
+        self.quality = quality
+        self.version = version
+        self.error_correction = error_correction
+        self.fill_color = resolve_color(fill_color)
+        self.back_color = resolve_color(back_color)
+
+        self._logo = None
+        self._logo_pos = (0, 0)
+        if logo_path:
+            if not Path(logo_path).exists():
+                raise InvalidLogoError(f"Logo文件不存在: {logo_path}")
+            self._logo = load_logo(logo_path, int(size * logo_size_ratio), circular=logo_circular)
+            self._logo_pos = ((size - self._logo.size[0]) // 2, (size - self._logo.size[1]) // 2)
+
+        # 蒙板对所有像素是同一个按颜色的变换：无Logo且无抗锯齿时图像只有两种颜色，
+        # 直接换算这两种颜色；否则渲染后再叠加
+        self._fill, self._back = self.fill_color, self.back_color
+        self._mask = None
+        if mask_color:
+            if self._logo is None and kind == 'fast':
+                self._fill, self._back = mask_colors(
+                    [self.fill_color, self.back_color], mask_color, mask_opacity
+                )
+            else:
+                resolve_color(mask_color)
+                self._mask = (mask_color, mask_opacity)
+
+        # 实际渲染时使用的模式：Logo需要在RGBA上合成；待叠加蒙板时先用调色板
+        black_on_white = kind == 'fast' and (self._fill, self._back) == (BLACK, WHITE)
+        if self._logo is not None:
+            self._render_mode = "RGBA"
+        elif self._mask is not None and mode == "RGBA":
+            self._render_mode = "P"
+        elif mode == "1" and not black_on_white:
+            if not mask_color:
+                raise ValueError("'1'模式只支持无抗锯齿的黑色前景和白色背景")
+            # 叠加蒙板后不再是黑白两色，与 make_cool_qrcode 一样输出双色调色板图像
+            self._render_mode = "P"
+        else:
+            self._render_mode = mode
+
+    def render(self, data: Union[str, bytes], format: Optional[str] = None) -> Union[Image.Image, bytes]:
+        """
+        按样式生成二维码
+
+        Args:
+            data: 二维码内容
+            format: 输出格式（如 'PNG'），指定时返回编码后的字节数据
+
+        Returns:
+            PIL Image对象，指定format时为字节数据
+
+        Raises:
+            InvalidDataError: 当数据为空或超出二维码容量时抛出
+            ImageGenerationError: 当图像生成失败时抛出
+        """
+        matrix = encode_matrix(data, self.version, self.error_correction)
+
+        try:
+            dots = rasterize_dots(
+                matrix.as_numpy(), self.size, self.dot_shape, quality=self.quality
+            )
+            img = colorize(dots, self._fill, self._back, mode=self._render_mode)
+
+            if self._logo is not None:
+                img.paste(self._logo, self._logo_pos, self._logo)
+
+            if self._mask is not None:
+                img = apply_mask(img, *self._mask)
+                if self.mode == "RGBA" and img.mode != "RGBA":
+                    img = img.convert("RGBA")
+        except Exception as e:
+            raise ImageGenerationError(f"生成图像失败: {str(e)}")
+
+        if format:
+            bio = io.BytesIO()
+            img.save(bio, format=format)
+            return bio.getvalue()
+        return img
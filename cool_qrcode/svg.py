@@ -0,0 +1,126 @@
+"""
+Cool QRCode SVG输出模块
+
+直接从模块矩阵生成SVG矢量图，完全跳过栅格化。
+"""
+
+import base64
+import io
+from typing import Literal, Optional
+
+import numpy as np
+from PIL import Image
+
+from .colors import to_hex
+
+
+def _square_path(matrix: np.ndarray) -> str:
+    """
+    把每一行中相邻的方形码点合并为一条线段
+
+    以宽度为1的描边绘制，每段 ``h{长度}`` 即为一串连续方块；
+    线段之间用相对移动连接，偏移为上一段终点到下一段起点的距离。
+    """
+    # 在每行首尾补零后做差分，找出每段连续深色模块的起止列
+    padded = np.pad(matrix.view(np.int8), ((0, 0), (1, 1)))
+    rows, edges = np.nonzero(np.diff(padded, axis=1))
+    if not len(rows):
+        return ""
+    rows, starts, ends = rows[::2], edges[::2], edges[1::2]
+
+    parts = [f"M{starts[0]} {rows[0]}.5h{ends[0] - starts[0]}"]
+    for i in range(1, len(rows)):
+        parts.append(
+            f"m{starts[i] - ends[i - 1]} {rows[i] - rows[i - 1]}h{ends[i] - starts[i]}"
+        )
+    return "".join(parts)
+
+
+def _circle_path(matrix: np.ndarray) -> str:
+    """
+    把所有圆形码点合并为一条路径
+
+    每个码点是一段零长度线段，配合圆头线帽（stroke-linecap="round"）
+    描边即为直径1的圆点；码点之间用相对移动连接，偏移即两个码点的行列差。
+    """
+    rows, cols = np.nonzero(matrix)
+    if not len(rows):
+        return ""
+    parts = [f"M{cols[0]}.5 {rows[0]}.5h0"]
+    for dr, dc in zip(np.diff(rows), np.diff(cols)):
+        parts.append(f"m{dc} {dr}h0")
+    return "".join(parts)
+
+
+def render_svg(
+    matrix: np.ndarray,
+    size: int = 500,
+    dot_shape: Literal["square", "circle"] = "square",
+    fill_color: str = "black",
+    back_color: str = "white",
+    logo: Optional[Image.Image] = None,
+    mask_color: Optional[str] = None,
+    mask_opacity: float = 0.3
+) -> str:
+    """
+    将模块矩阵渲染为SVG文档
+
+    坐标系以模块为单位（viewBox为 0 0 n n），通过width/height缩放到目标大小。
+    方形码点按行合并为线段，圆形码点为零长度线段加圆头线帽，
+    均以宽度为1的描边绘制，所有码点只占用一个 ``<path>`` 元素。
+
+    Args:
+        matrix: 布尔模块矩阵，形状为 (n, n)
+        size: 输出图像大小（正方形，像素）
+        dot_shape: 码点形状，'square'(方形) 或 'circle'(圆形)
+        fill_color: 前景色
+        back_color: 背景色
+        logo: 已预处理好的Logo图像，以PNG内嵌到二维码中心
+        mask_color: 蒙板颜色
+        mask_opacity: 蒙板透明度
+
+    Returns:
+        SVG文档字符串
+    """
+    modules_count = matrix.shape[0]
+    fill_color, back_color = to_hex(fill_color), to_hex(back_color)
+    if dot_shape == 'circle':
+        dots = (
+            f'<path d="{_circle_path(matrix)}" fill="none" stroke="{fill_color}" '
+            f'stroke-width="1" stroke-linecap="round"/>'
+        )
+    else:
+        dots = (
+            f'<path d="{_square_path(matrix)}" fill="none" stroke="{fill_color}" '
+            f'stroke-width="1" shape-rendering="crispEdges"/>'
+        )
+
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{size}" height="{size}" '
+        f'viewBox="0 0 {modules_count} {modules_count}">',
+        f'<rect width="100%" height="100%" fill="{back_color}"/>',
+        dots,
+    ]
+
+    if logo is not None:
+        # Logo的像素大小换算到模块坐标系，保持与位图输出相同的居中规则
+        scale = modules_count / size
+        logo_width, logo_height = logo.size
+        bio = io.BytesIO()
+        logo.save(bio, format='PNG')
+        href = "data:image/png;base64," + base64.b64encode(bio.getvalue()).decode('ascii')
+        parts.append(
+            f'<image x="{(size - logo_width) // 2 * scale:g}" '
+            f'y="{(size - logo_height) // 2 * scale:g}" '
+            f'width="{logo_width * scale:g}" height="{logo_height * scale:g}" '
+            f'href="{href}"/>'
+        )
+
+    if mask_color:
+        parts.append(
+            f'<rect width="100%" height="100%" fill="{to_hex(mask_color)}" '
+            f'fill-opacity="{mask_opacity:g}"/>'
+        )
+
+    parts.append('</svg>')
+    return "".join(parts)
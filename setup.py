@@ -38,6 +38,11 @@ setup(
     ],
     keywords='qrcode, qr, cool-qrcode, 二维码',
     python_requires='>=3.7',
+    entry_points={
+        'console_scripts': [
+            'cool-qrcode=cool_qrcode.cli:main',
+        ],
+    },
     extras_require={
         'dev': [
             'pytest>=6.0.0',
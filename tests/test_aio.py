@@ -0,0 +1,146 @@
+"""
+异步API测试
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+from PIL import Image
+
+from cool_qrcode import AsyncRenderer, CoolQRCode, amake_cool_qrcode, make_cool_qrcode
+
+
+class TestAmakeCoolQRCode:
+    """异步生成测试类"""
+
+    def test_matches_sync(self):
+        """测试异步结果与同步结果一致"""
+        img = asyncio.run(amake_cool_qrcode("Hello", style="ocean", dot_shape="circle", size=200))
+        expected = make_cool_qrcode("Hello", style="ocean", dot_shape="circle", size=200)
+
+        assert isinstance(img, Image.Image)
+        assert img.tobytes() == expected.tobytes()
+
+    def test_svg(self):
+        """测试异步生成SVG"""
+        svg = asyncio.run(amake_cool_qrcode("Hello", format="svg"))
+        assert svg.startswith("<svg")
+
+    def test_event_loop_not_blocked(self):
+        """测试渲染期间事件循环仍然可以调度其他协程"""
+        async def main():
+            ticks = 0
+
+            async def ticker():
+                nonlocal ticks
+                while True:
+                    ticks += 1
+                    await asyncio.sleep(0)
+
+            task = asyncio.create_task(ticker())
+            await asyncio.gather(*(amake_cool_qrcode(f"item-{i}", size=800) for i in range(4)))
+            task.cancel()
+            return ticks
+
+        assert asyncio.run(main()) > 4
+
+    def test_errors_propagate(self):
+        """测试渲染错误传回调用方"""
+        with pytest.raises(Exception):
+            asyncio.run(amake_cool_qrcode(""))
+
+
+class TestAsyncRenderer:
+    """异步执行器测试类"""
+
+    def test_concurrency_limit(self):
+        """测试同时提交的任务数不超过上限"""
+        renderer = AsyncRenderer(max_workers=4, max_concurrency=2)
+        lock = threading.Lock()
+        active = peak = 0
+
+        def work():
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.02)
+            with lock:
+                active -= 1
+
+        async def main():
+            await asyncio.gather(*(renderer.run(work) for _ in range(8)))
+
+        asyncio.run(main())
+        renderer.shutdown()
+        assert peak == 2
+
+    def test_cancel_waiting_task(self):
+        """测试取消排队中的任务，任务不会被执行"""
+        renderer = AsyncRenderer(max_workers=1, max_concurrency=1)
+        started = []
+        release = threading.Event()
+
+        def blocker():
+            release.wait(5)
+
+        async def main():
+            first = asyncio.ensure_future(renderer.run(blocker))
+            await asyncio.sleep(0.01)
+            second = asyncio.ensure_future(renderer.run(started.append, "second"))
+            await asyncio.sleep(0.01)
+            assert renderer.waiting == 1
+
+            second.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await second
+            release.set()
+            await first
+            # 取消后名额照常归还，后续任务可以执行
+            await renderer.run(started.append, "third")
+
+        asyncio.run(main())
+        renderer.shutdown()
+        assert started == ["third"]
+
+    def test_timeout(self):
+        """测试配合wait_for超时取消"""
+        renderer = AsyncRenderer(max_workers=1)
+
+        async def main():
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(renderer.run(time.sleep, 0.2), timeout=0.01)
+            assert await renderer.run(sum, [1, 2]) == 3
+
+        asyncio.run(main())
+        renderer.shutdown()
+
+    def test_invalid_arguments(self):
+        """测试无效参数"""
+        with pytest.raises(ValueError):
+            AsyncRenderer(max_workers=-1)
+
+
+class TestArender:
+    """CoolQRCode.arender测试类"""
+
+    def test_image_and_bytes(self):
+        """测试异步渲染图像和字节数据"""
+        qr = CoolQRCode(fill_color="navy")
+        qr.add_data("测试异步渲染")
+
+        async def main():
+            img = await qr.arender(size=300, dot_shape="circle")
+            png = await qr.arender(format="PNG", size=300, dot_shape="circle")
+            return img, png
+
+        img, png = asyncio.run(main())
+        expected = qr.make_custom_image(size=300, dot_shape="circle")
+        assert img.tobytes() == expected.tobytes()
+        assert png == qr.to_bytes(render={"size": 300, "dot_shape": "circle"})
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
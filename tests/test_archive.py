@@ -0,0 +1,134 @@
+"""
+归档输出测试
+"""
+
+import io
+import tarfile
+import tracemalloc
+import zipfile
+
+import pytest
+
+from cool_qrcode import ArchiveWriter, make_cool_qrcode_archive, make_cool_qrcode_batch
+
+
+class _PipeStream(io.RawIOBase):
+    """模拟管道：只能顺序写入，不能seek和tell"""
+
+    def __init__(self):
+        self.buffer = bytearray()
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.buffer.extend(data)
+        return len(data)
+
+
+class TestArchiveWriter:
+    """流式归档写入器测试类"""
+
+    @pytest.mark.parametrize("suffix", [".zip", ".tar"])
+    def test_roundtrip(self, tmp_path, suffix):
+        """测试各格式写入后可以完整读回"""
+        path = tmp_path / f"codes{suffix}"
+        entries = [(f"{i}.png", bytes([i]) * (i + 1)) for i in range(5)]
+        with ArchiveWriter(path) as archive:
+            assert archive.write_all(entries) == 5
+        assert archive.count == 5
+
+        if suffix == ".zip":
+            with zipfile.ZipFile(path) as zf:
+                assert zf.testzip() is None
+                assert [(info.filename, zf.read(info)) for info in zf.infolist()] == entries
+        else:
+            with tarfile.open(path) as tf:
+                assert [(m.name, tf.extractfile(m).read()) for m in tf.getmembers()] == entries
+
+    @pytest.mark.parametrize("suffix", [".tar.gz", ".tgz", ".tar.xz"])
+    def test_compressed_tar_rejected(self, tmp_path, suffix):
+        """测试拒绝会重新压缩PNG的压缩tar归档"""
+        path = tmp_path / f"codes{suffix}"
+        with pytest.raises(ValueError):
+            ArchiveWriter(path)
+        with pytest.raises(ValueError):
+            ArchiveWriter(io.BytesIO(), "tar.gz")
+        assert not path.exists()
+
+    def test_zip_entries_stored(self, tmp_path):
+        """测试zip条目不压缩"""
+        path = tmp_path / "codes.zip"
+        with ArchiveWriter(path) as archive:
+            archive.write("a.png", b"\0" * 1000)
+        with zipfile.ZipFile(path) as zf:
+            info = zf.getinfo("a.png")
+            assert info.compress_type == zipfile.ZIP_STORED
+            assert info.compress_size == 1000
+
+    @pytest.mark.parametrize("archive_format", ["zip", "tar"])
+    def test_unseekable_stream(self, archive_format):
+        """测试可以写入不能seek的流"""
+        stream = _PipeStream()
+        with ArchiveWriter(stream, archive_format) as archive:
+            archive.write("a.png", b"first")
+            archive.write("b.png", b"second")
+
+        data = io.BytesIO(bytes(stream.buffer))
+        if archive_format == "zip":
+            with zipfile.ZipFile(data) as zf:
+                assert zf.read("b.png") == b"second"
+        else:
+            with tarfile.open(fileobj=data) as tf:
+                assert tf.extractfile("b.png").read() == b"second"
+
+    @pytest.mark.parametrize("suffix", [".zip", ".tar"])
+    def test_memory_does_not_grow_with_payload(self, tmp_path, suffix):
+        """测试已写入的条目内容不会留在内存中"""
+        payload = b"x" * 100_000
+        tracemalloc.start()
+        try:
+            with ArchiveWriter(tmp_path / f"codes{suffix}") as archive:
+                for i in range(200):
+                    archive.write(f"{i}.png", payload)
+                _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        # 写入了20MB，峰值只应有几个条目加上缓冲区的大小
+        assert peak < 4 * 1024 * 1024
+
+    def test_invalid_format(self, tmp_path):
+        """测试无效的归档格式"""
+        with pytest.raises(ValueError):
+            ArchiveWriter(tmp_path / "codes.rar")
+        with pytest.raises(ValueError):
+            ArchiveWriter(io.BytesIO(), "rar")
+
+
+class TestMakeCoolQRCodeArchive:
+    """批量生成归档测试类"""
+
+    def test_matches_batch(self, tmp_path):
+        """测试归档内容与批量生成结果一致"""
+        datas = [f"https://example.com/{i}" for i in range(6)]
+        path = tmp_path / "codes.zip"
+
+        count = make_cool_qrcode_archive(datas, path, size=100, style="mint", name_template="qr-{index}")
+
+        assert count == 6
+        expected = list(make_cool_qrcode_batch(datas, size=100, style="mint", format="PNG"))
+        with zipfile.ZipFile(path) as zf:
+            assert zf.namelist() == [f"qr-{i}.png" for i in range(6)]
+            assert [zf.read(name) for name in zf.namelist()] == expected
+
+    def test_parallel(self, tmp_path):
+        """测试多进程生成归档"""
+        path = tmp_path / "codes.tar"
+        datas = (f"item-{i}" for i in range(8))
+        assert make_cool_qrcode_archive(datas, path, size=100, workers=2, chunksize=3) == 8
+        with tarfile.open(path) as tf:
+            assert len(tf.getnames()) == 8
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
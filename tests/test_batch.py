@@ -0,0 +1,96 @@
+"""
+批量生成API测试
+"""
+
+import io
+import os
+import tempfile
+import types
+
+import pytest
+from PIL import Image
+
+from cool_qrcode import make_cool_qrcode, make_cool_qrcode_batch, create_sample_logo
+from cool_qrcode.cache import logo_cache
+
+
+class TestMakeCoolQRCodeBatch:
+    """批量生成测试类"""
+
+    @pytest.fixture
+    def sample_logo(self):
+        """创建测试用的Logo文件"""
+        with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as tmp:
+            logo_path = create_sample_logo(tmp.name)
+            yield logo_path
+            if os.path.exists(logo_path):
+                os.unlink(logo_path)
+
+    def test_returns_generator(self):
+        """测试返回惰性生成器"""
+        result = make_cool_qrcode_batch(["A", "B"])
+        assert isinstance(result, types.GeneratorType)
+
+    def test_matches_single_api(self, sample_logo):
+        """测试批量结果与逐个调用make_cool_qrcode一致"""
+        datas = ["第一个", "第二个", "https://example.com/3"]
+        options = dict(
+            size=300,
+            style="berry",
+            dot_shape="circle",
+            logo_path=sample_logo,
+            mask_color="purple",
+            mask_opacity=0.2,
+        )
+
+        batch = list(make_cool_qrcode_batch(datas, **options))
+        assert len(batch) == len(datas)
+        for data, img in zip(datas, batch):
+            expected = make_cool_qrcode(data, **options)
+            assert img.mode == expected.mode
+            assert img.tobytes() == expected.tobytes()
+
+    def test_encoded_bytes(self):
+        """测试输出编码后的字节数据"""
+        outputs = list(make_cool_qrcode_batch(["A", "B", "C"], size=200, format="PNG"))
+        assert len(outputs) == 3
+        for data in outputs:
+            assert isinstance(data, bytes)
+            img = Image.open(io.BytesIO(data))
+            assert img.format == "PNG"
+            assert img.size == (200, 200)
+
+    def test_two_color_uses_palette(self):
+        """测试双色二维码默认使用调色板/二值模式"""
+        assert next(make_cool_qrcode_batch(["A"], size=100)).mode == "1"
+        assert next(make_cool_qrcode_batch(["A"], size=100, style="ocean")).mode == "P"
+        assert next(make_cool_qrcode_batch(["A"], size=100, mode="RGBA")).mode == "RGBA"
+        assert next(make_cool_qrcode_batch(["A"], size=100, mask_color="red")).mode == "P"
+
+    def test_logo_prepared_once(self, sample_logo):
+        """测试Logo只准备一次"""
+        logo_cache.clear()
+        for _ in make_cool_qrcode_batch(["A", "B", "C", "D"], size=200, logo_path=sample_logo):
+            pass
+        info = logo_cache.info()
+        assert info.misses == 1
+        assert info.hits == 0
+
+    def test_accepts_iterator(self):
+        """测试接受任意可迭代对象"""
+        datas = (f"item-{i}" for i in range(5))
+        assert len(list(make_cool_qrcode_batch(datas, size=100))) == 5
+
+    def test_nonexistent_logo_error(self):
+        """测试不存在的Logo文件（应该报错）"""
+        with pytest.raises(Exception):
+            next(make_cool_qrcode_batch(["A"], logo_path="nonexistent_logo.png"))
+
+    def test_empty_data_error(self):
+        """测试空数据（应该报错）"""
+        with pytest.raises(Exception):
+            list(make_cool_qrcode_batch(["A", ""]))
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
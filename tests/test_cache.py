@@ -0,0 +1,338 @@
+"""
+缓存测试
+"""
+
+import os
+import tempfile
+import threading
+
+import numpy as np
+import pytest
+from PIL import Image, ImageDraw
+from qrcode.constants import ERROR_CORRECT_H
+
+from cool_qrcode import CoolQRCode, DiskCache, cache_stats, make_cool_qrcode
+from cool_qrcode.cache import LRUCache, logo_cache, matrix_cache, sprite_cache
+
+
+class TestLRUCache:
+    """LRU缓存测试类"""
+
+    def test_hit_and_miss(self):
+        """测试命中与未命中统计"""
+        cache = LRUCache(maxsize=2)
+        assert cache.get_or_create("a", lambda: 1) == 1
+        assert cache.get_or_create("a", lambda: 2) == 1
+
+        info = cache.info()
+        assert info.hits == 1
+        assert info.misses == 1
+        assert info.currsize == 1
+
+    def test_eviction(self):
+        """测试超出容量时淘汰最久未使用的条目"""
+        cache = LRUCache(maxsize=2)
+        cache.get_or_create("a", lambda: 1)
+        cache.get_or_create("b", lambda: 2)
+        cache.get_or_create("a", lambda: 1)
+        cache.get_or_create("c", lambda: 3)
+
+        assert len(cache) == 2
+        assert cache.get_or_create("b", lambda: "new") == "new"
+
+    def test_invalid_maxsize(self):
+        """测试无效容量"""
+        with pytest.raises(ValueError):
+            LRUCache(maxsize=0)
+
+    def test_thread_safety(self):
+        """测试多线程并发访问"""
+        cache = LRUCache(maxsize=8)
+
+        def worker():
+            for i in range(200):
+                cache.get_or_create(i % 16, lambda: i)
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        info = cache.info()
+        assert info.hits + info.misses == 800
+        assert info.currsize == 8
+
+    def test_memory_budget(self):
+        """测试按内存预算淘汰"""
+        cache = LRUCache(maxsize=100, maxbytes=10, sizeof=len)
+        cache.get_or_create("a", lambda: b"xxxx")
+        cache.get_or_create("b", lambda: b"xxxx")
+        cache.get_or_create("c", lambda: b"xxxx")
+
+        info = cache.info()
+        assert info.currsize == 2
+        assert info.nbytes == 8
+        assert info.maxbytes == 10
+        assert info.evictions == 1
+        assert cache.get_or_create("a", lambda: "new") == "new"
+
+    def test_oversized_value_not_kept(self):
+        """测试超出预算的单个值照常返回但不缓存"""
+        cache = LRUCache(maxbytes=4, sizeof=len)
+        assert cache.get_or_create("big", lambda: b"x" * 8) == b"x" * 8
+        assert len(cache) == 0
+        assert cache.info().nbytes == 0
+
+    def test_resize(self):
+        """测试调整容量后立即淘汰"""
+        cache = LRUCache(maxsize=4, sizeof=len)
+        for key in "abcd":
+            cache.get_or_create(key, lambda: b"xx")
+        cache.resize(maxbytes=5)
+        assert len(cache) == 2
+        cache.resize(maxsize=1)
+        assert len(cache) == 1
+
+        with pytest.raises(ValueError):
+            LRUCache(maxbytes=10)
+
+
+class TestLogoCache:
+    """Logo缓存测试类"""
+
+    @pytest.fixture
+    def sample_logo(self):
+        """创建测试用的Logo文件"""
+        with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as tmp:
+            logo = Image.new('RGBA', (100, 100), (0, 0, 0, 0))
+            draw = ImageDraw.Draw(logo)
+            draw.ellipse((20, 20, 80, 80), fill='blue')
+            logo.save(tmp.name)
+            yield tmp.name
+            if os.path.exists(tmp.name):
+                os.unlink(tmp.name)
+
+    def test_logo_reused_across_calls(self, sample_logo):
+        """测试同一Logo只预处理一次"""
+        logo_cache.clear()
+        qr = CoolQRCode()
+        qr.add_data("测试Logo缓存")
+
+        first = qr.add_logo_to_custom(sample_logo, size=300)
+        second = qr.add_logo_to_custom(sample_logo, size=300)
+
+        info = logo_cache.info()
+        assert info.misses == 1
+        assert info.hits == 1
+        assert first.tobytes() == second.tobytes()
+
+    def test_variants_cached_separately(self, sample_logo):
+        """测试不同大小、形状和边框分别缓存"""
+        logo_cache.clear()
+        qr = CoolQRCode()
+        qr.add_data("测试Logo变体")
+
+        qr.add_logo_to_custom(sample_logo, size=300, circular_logo=True)
+        qr.add_logo_to_custom(sample_logo, size=300, circular_logo=False)
+        qr.add_logo_to_custom(sample_logo, size=400, circular_logo=True)
+        qr.add_logo(sample_logo, border_size=2)
+        qr.add_logo(sample_logo, border_size=0)
+
+        assert logo_cache.info().misses == 5
+
+    def test_modified_logo_reloaded(self, sample_logo):
+        """测试Logo文件修改后重新加载"""
+        logo_cache.clear()
+        qr = CoolQRCode()
+        qr.add_data("测试Logo更新")
+
+        qr.add_logo_to_custom(sample_logo, size=300)
+        Image.new('RGBA', (100, 100), 'red').save(sample_logo)
+        stat = os.stat(sample_logo)
+        os.utime(sample_logo, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        qr.add_logo_to_custom(sample_logo, size=300)
+
+        assert logo_cache.info().misses == 2
+
+
+class TestMatrixCache:
+    """模块矩阵缓存测试类"""
+
+    def test_encoding_reused(self):
+        """测试相同数据只编码一次"""
+        matrix_cache.clear()
+        first = CoolQRCode()
+        first.add_data("测试矩阵缓存")
+        img1 = first.make_custom_image(size=300)
+
+        second = CoolQRCode(fill_color="red")
+        second.add_data("测试矩阵缓存")
+        second.make_custom_image(size=200, dot_shape="circle")
+        img3 = second.make_custom_image(size=300)
+
+        info = matrix_cache.info()
+        assert info.misses == 1
+        assert info.hits == 2
+        assert np.array_equal(np.array(img1)[..., 3], np.array(img3)[..., 3])
+
+    def test_key_includes_version_and_error_correction(self):
+        """测试版本和纠错级别不同的二维码分别缓存"""
+        matrix_cache.clear()
+        for kwargs in ({}, {"version": 5}, {"error_correction": ERROR_CORRECT_H}):
+            qr = CoolQRCode(**kwargs)
+            qr.add_data("测试矩阵键")
+            qr.make_custom_image(size=200)
+
+        assert matrix_cache.info().misses == 3
+
+    def test_clear_resets_data(self):
+        """测试清除数据后不会命中旧数据的缓存"""
+        qr = CoolQRCode()
+        qr.add_data("旧数据")
+        old = qr.make_custom_image(size=200)
+        qr.clear()
+        qr.add_data("新数据新数据新数据新数据")
+        new = qr.make_custom_image(size=200)
+
+        assert old.tobytes() != new.tobytes()
+
+
+class TestSpriteCache:
+    """码点图块缓存测试类"""
+
+    def test_sprites_shared_across_images(self):
+        """测试相同尺寸和形状的码点图块在不同图像、不同颜色间共享"""
+        sprite_cache.clear()
+        for color in ("black", "red", "navy"):
+            qr = CoolQRCode(fill_color=color)
+            qr.add_data(f"测试图块缓存{color}")
+            qr.make_custom_image(size=300, dot_shape="circle", quality="aa")
+
+        info = sprite_cache.info()
+        assert info.misses == 1
+        assert info.hits == 2
+        assert 0 < info.nbytes <= info.maxbytes
+
+    def test_quality_cached_separately(self):
+        """测试不同形状和渲染质量分别缓存"""
+        sprite_cache.clear()
+        qr = CoolQRCode()
+        qr.add_data("测试图块变体")
+        for dot_shape in ("square", "circle"):
+            for quality in ("fast", "aa", "supersample-4"):
+                qr.make_custom_image(size=300, dot_shape=dot_shape, quality=quality)
+
+        # 方形抗锯齿码点按x、y方向分离计算，不使用图块
+        assert sprite_cache.info().misses == 4
+
+    def test_cache_stats(self):
+        """测试缓存统计汇总"""
+        stats = cache_stats()
+        assert set(stats) == {"logo", "matrix", "sprite"}
+        assert stats["sprite"].maxbytes == sprite_cache.maxbytes
+
+
+class TestDiskCache:
+    """磁盘缓存测试类"""
+
+    def test_put_and_get(self, tmp_path):
+        """测试写入、读取和分片目录"""
+        cache = DiskCache(tmp_path)
+        key = "ab" + "0" * 62
+        assert cache.get(key) is None
+        cache.put(key, b"payload")
+
+        assert cache.get(key) == b"payload"
+        assert (tmp_path / "ab" / key).is_file()
+        info = cache.info()
+        assert (info.hits, info.misses, info.currsize, info.nbytes) == (1, 1, 1, 7)
+
+    def test_invalid_key(self, tmp_path):
+        """测试拒绝非摘要形式的键"""
+        with pytest.raises(ValueError):
+            DiskCache(tmp_path).get("../../etc/passwd")
+
+    def test_size_bounded_eviction(self, tmp_path):
+        """测试超出大小上限时淘汰最久未使用的条目"""
+        cache = DiskCache(tmp_path, max_bytes=1000)
+        keys = [f"{i:02x}" + "0" * 62 for i in range(5)]
+        for i, key in enumerate(keys):
+            cache.put(key, b"x" * 300)
+            os.utime(tmp_path / key[:2] / key, ns=(i * 10**9, i * 10**9))
+
+        info = cache.info()
+        assert info.nbytes <= 900
+        assert info.evictions >= 2
+        assert cache.get(keys[0]) is None
+        assert cache.get(keys[-1]) is not None
+
+    def test_put_existing_key(self, tmp_path):
+        """测试重复写入同一个键时不重复计数，也不提前淘汰"""
+        cache = DiskCache(tmp_path, max_bytes=2500)
+        key = "ef" + "2" * 62
+        for _ in range(3):
+            cache.put(key, b"x" * 1000)
+        info = cache.info()
+        assert (info.currsize, info.nbytes, info.evictions) == (1, 1000, 0)
+
+        cache.put(key, b"y" * 400)
+        info = cache.info()
+        assert (info.currsize, info.nbytes) == (1, 400)
+        assert info.nbytes == DiskCache(tmp_path).info().nbytes
+
+    def test_reopen_counts_existing(self, tmp_path):
+        """测试重新打开缓存目录时统计已有内容"""
+        DiskCache(tmp_path).put("cd" + "1" * 62, b"abc")
+        info = DiskCache(tmp_path).info()
+        assert info.currsize == 1
+        assert info.nbytes == 3
+
+    def test_make_cool_qrcode_served_from_cache(self, tmp_path, monkeypatch):
+        """测试命中缓存时不渲染，结果与渲染一致"""
+        cache = DiskCache(tmp_path / "cache")
+        first = make_cool_qrcode("测试磁盘缓存", style="ocean", dot_shape="circle", size=200, cache=cache)
+
+        def fail(*args, **kwargs):
+            raise AssertionError("命中缓存时不应渲染")
+        monkeypatch.setattr(CoolQRCode, "make_custom_image", fail)
+
+        # 等价的颜色写法命中同一条缓存
+        second = make_cool_qrcode("测试磁盘缓存", fill_color="#00008B", back_color="lightblue",
+                                  dot_shape="circle", size=200, cache=cache)
+        assert second.tobytes() == first.tobytes()
+        assert cache.info().hits == 1
+
+        target = tmp_path / "qr.png"
+        make_cool_qrcode("测试磁盘缓存", style="ocean", dot_shape="circle", size=200,
+                         cache=cache, filename=str(target))
+        assert target.read_bytes() == cache.get(cache_key_of(cache))
+
+    def test_key_covers_parameters(self, tmp_path):
+        """测试不同参数、Logo内容和输出格式分别缓存"""
+        cache = DiskCache(tmp_path / "cache")
+        logo = tmp_path / "logo.png"
+        Image.new("RGBA", (50, 50), "red").save(logo)
+
+        make_cool_qrcode("参数", size=150, cache=cache)
+        make_cool_qrcode("参数", size=160, cache=cache)
+        make_cool_qrcode("参数", size=150, dot_shape="circle", cache=cache)
+        make_cool_qrcode("参数", size=150, format="svg", cache=cache)
+        make_cool_qrcode("参数", size=150, logo_path=str(logo), cache=cache)
+        Image.new("RGBA", (50, 50), "blue").save(logo)
+        stat = os.stat(logo)
+        os.utime(logo, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        make_cool_qrcode("参数", size=150, logo_path=str(logo), cache=cache)
+
+        assert cache.info().misses == 6
+        assert cache.info().currsize == 6
+
+
+def cache_key_of(cache):
+    """返回缓存中唯一的键"""
+    (path,) = [p for p in cache.directory.glob("*/*")]
+    return path.name
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
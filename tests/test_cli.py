@@ -0,0 +1,152 @@
+"""
+命令行工具测试
+"""
+
+import io
+import json
+import tarfile
+import zipfile
+
+import pytest
+from PIL import Image
+
+from cool_qrcode import make_cool_qrcode_batch
+from cool_qrcode.cli import main, read_records
+
+
+class TestReadRecords:
+    """输入解析测试类"""
+
+    def test_csv(self):
+        """测试CSV输入，默认使用data列"""
+        stream = io.StringIO("id,data\n1,https://a.com\n2,\n3,https://b.com\n")
+        records = list(read_records(stream, "csv", name_column="id"))
+        assert records == [("1", "https://a.com"), ("3", "https://b.com")]
+
+    def test_csv_first_column(self):
+        """测试CSV没有data列时使用第一列"""
+        stream = io.StringIO("url\nhttps://a.com\n")
+        assert list(read_records(stream, "csv")) == [("000000", "https://a.com")]
+
+    def test_csv_missing_column(self):
+        """测试指定的列不存在"""
+        from cool_qrcode.exceptions import CoolQRCodeError
+        with pytest.raises(CoolQRCodeError):
+            list(read_records(io.StringIO("url\nx\n"), "csv", column="link"))
+
+    def test_jsonl(self):
+        """测试JSONL输入，支持字符串和对象"""
+        stream = io.StringIO('"plain"\n\n{"data": "obj", "name": "../evil"}\n')
+        records = list(read_records(stream, "jsonl", name_column="name"))
+        assert records == [("000000", "plain"), ("_evil", "obj")]
+
+    def test_lines(self):
+        """测试每行一条的输入"""
+        stream = io.StringIO("a\n\nb\r\n")
+        assert list(read_records(stream, "lines")) == [("000000", "a"), ("000002", "b")]
+
+
+class TestMain:
+    """命令行入口测试类"""
+
+    def test_csv_to_directory(self, tmp_path, capsys):
+        """测试CSV输入写出到目录，并输出统计信息"""
+        source = tmp_path / "codes.csv"
+        source.write_text("name,data\nfirst,https://a.com\nsecond,https://b.com\n", encoding="utf-8")
+        output = tmp_path / "out"
+
+        code = main([str(source), "-o", str(output), "--name-column", "name",
+                     "--style", "ocean", "--dot-shape", "circle", "--size", "120"])
+
+        assert code == 0
+        assert sorted(p.name for p in output.iterdir()) == ["first.png", "second.png"]
+        expected = next(make_cool_qrcode_batch(
+            ["https://a.com"], size=120, style="ocean", dot_shape="circle", format="PNG"
+        ))
+        assert (output / "first.png").read_bytes() == expected
+
+        stderr = capsys.readouterr().err
+        assert "已生成 2 个二维码" in stderr
+        assert "p50=" in stderr and "p99=" in stderr
+
+    def test_jsonl_to_zip(self, tmp_path):
+        """测试JSONL输入写入zip归档（不压缩）"""
+        source = tmp_path / "codes.jsonl"
+        source.write_text("\n".join(json.dumps({"data": f"item-{i}"}) for i in range(5)),
+                          encoding="utf-8")
+        archive = tmp_path / "codes.zip"
+
+        assert main([str(source), "-o", str(archive), "--size", "100", "-q"]) == 0
+
+        with zipfile.ZipFile(archive) as zf:
+            infos = zf.infolist()
+            assert [info.filename for info in infos] == [f"{i:06d}.png" for i in range(5)]
+            assert all(info.compress_type == zipfile.ZIP_STORED for info in infos)
+            assert Image.open(io.BytesIO(zf.read(infos[0]))).size == (100, 100)
+
+    def test_parallel_to_tar(self, tmp_path, capsys):
+        """测试多进程生成并写入tar归档，顺序与输入一致"""
+        source = tmp_path / "codes.txt"
+        source.write_text("\n".join(f"line-{i}" for i in range(12)), encoding="utf-8")
+        archive = tmp_path / "codes.tar"
+
+        code = main([str(source), "-o", str(archive), "--size", "100",
+                     "--jobs", "2", "--chunksize", "3"])
+
+        assert code == 0
+        with tarfile.open(archive) as tf:
+            names = tf.getnames()
+            payload = tf.extractfile(names[4]).read()
+        assert names == [f"{i:06d}.png" for i in range(12)]
+        assert payload == next(make_cool_qrcode_batch(["line-4"], size=100, format="PNG"))
+        assert "已生成 12 个二维码" in capsys.readouterr().err
+
+    def test_missing_logo(self, tmp_path):
+        """测试Logo不存在时在生成前报错"""
+        source = tmp_path / "codes.txt"
+        source.write_text("a\n", encoding="utf-8")
+        with pytest.raises(SystemExit):
+            main([str(source), "-o", str(tmp_path / "out"), "--logo", "missing.png"])
+        assert not (tmp_path / "out").exists()
+
+    @pytest.mark.parametrize("image_format", ["svg", "bogus"])
+    def test_invalid_format(self, tmp_path, capsys, image_format):
+        """测试不支持的图像格式在生成前报错，不留下输出目录"""
+        source = tmp_path / "codes.txt"
+        source.write_text("a\n", encoding="utf-8")
+        with pytest.raises(SystemExit) as excinfo:
+            main([str(source), "-o", str(tmp_path / "out"), "--format", image_format])
+        assert excinfo.value.code != 0
+        assert "不支持的图像格式" in capsys.readouterr().err
+        assert not (tmp_path / "out").exists()
+
+    def test_compressed_tar_output(self, tmp_path, capsys):
+        """测试输出为压缩的tar时在生成前报错，不创建同名目录"""
+        source = tmp_path / "codes.txt"
+        source.write_text("a\n", encoding="utf-8")
+        with pytest.raises(SystemExit) as excinfo:
+            main([str(source), "-o", str(tmp_path / "out.tar.gz")])
+        assert excinfo.value.code != 0
+        assert "不支持压缩的tar归档" in capsys.readouterr().err
+        assert not (tmp_path / "out.tar.gz").exists()
+
+    def test_format_extension(self, tmp_path):
+        """测试以扩展名指定格式"""
+        source = tmp_path / "codes.txt"
+        source.write_text("a\n", encoding="utf-8")
+        assert main([str(source), "-o", str(tmp_path / "out"), "--format", "jpg",
+                     "--size", "100", "-q"]) == 0
+        with Image.open(tmp_path / "out" / "000000.jpg") as img:
+            assert img.format == "JPEG"
+
+    def test_invalid_data_reports_error(self, tmp_path, capsys):
+        """测试生成失败时返回非零退出码"""
+        source = tmp_path / "codes.txt"
+        source.write_text("a\n", encoding="utf-8")
+        code = main([str(source), "-o", str(tmp_path / "out"), "--quality", "best"])
+        assert code == 1
+        assert "错误" in capsys.readouterr().err
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
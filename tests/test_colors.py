@@ -0,0 +1,114 @@
+"""
+颜色解析测试
+"""
+
+import pytest
+
+from cool_qrcode import CoolQRCode, make_cool_qrcode
+from cool_qrcode.colors import resolve_color, to_hex
+from cool_qrcode.exceptions import CoolQRCodeError, InvalidColorError
+from cool_qrcode.simple import _color_to_rgb
+
+
+class TestResolveColor:
+    """颜色解析测试类"""
+
+    @pytest.mark.parametrize("color,expected", [
+        ("black", (0, 0, 0, 255)),
+        ("Navy", (0, 0, 128, 255)),
+        ("rebeccapurple", (102, 51, 153, 255)),
+        ("#FFF", (255, 255, 255, 255)),
+        ("#FFF8", (255, 255, 255, 136)),
+        ("#FF5733", (255, 87, 51, 255)),
+        ("#FF573380", (255, 87, 51, 128)),
+        ("rgb(1, 2, 3)", (1, 2, 3, 255)),
+        ("rgba(1, 2, 3, 4)", (1, 2, 3, 4)),
+        ("hsl(0, 100%, 50%)", (255, 0, 0, 255)),
+        ((10, 20, 30), (10, 20, 30, 255)),
+        ((10, 20, 30, 40), (10, 20, 30, 40)),
+        ("transparent", (0, 0, 0, 0)),
+        (" Transparent ", (0, 0, 0, 0)),
+        (None, (0, 0, 0, 0)),
+    ])
+    def test_supported_formats(self, color, expected):
+        """测试支持的颜色写法"""
+        assert resolve_color(color) == expected
+
+    @pytest.mark.parametrize("color", [
+        "notacolor", "#12", "#GGGGGG", "", (1, 2), (256, 0, 0), [0, 0, 0], {"r": 0}, 1.5,
+    ])
+    def test_invalid_color(self, color):
+        """测试无效颜色抛出异常"""
+        with pytest.raises(InvalidColorError):
+            resolve_color(color)
+
+    def test_error_hierarchy(self):
+        """测试异常类型"""
+        assert issubclass(InvalidColorError, CoolQRCodeError)
+        assert issubclass(InvalidColorError, ValueError)
+
+    def test_memoized(self):
+        """测试同一颜色只解析一次"""
+        resolve_color.cache_clear()
+        resolve_color("lightblue")
+        resolve_color("lightblue")
+        info = resolve_color.cache_info()
+        assert info.misses == 1
+        assert info.hits == 1
+
+    def test_to_hex(self):
+        """测试转换为十六进制"""
+        assert to_hex("lightyellow") == "#ffffe0"
+        assert to_hex("#FF573380") == "#ff573380"
+
+    def test_color_to_rgb(self):
+        """测试简化API的颜色转换"""
+        assert _color_to_rgb("#FFF") == (255, 255, 255)
+        with pytest.raises(InvalidColorError):
+            _color_to_rgb("notacolor")
+
+
+class TestColorValidation:
+    """颜色校验测试类"""
+
+    def test_invalid_fill_color(self):
+        """测试无效前景色"""
+        with pytest.raises(InvalidColorError):
+            CoolQRCode(fill_color="notacolor")
+
+    def test_transparent_background(self):
+        """测试透明背景（CSS关键字transparent）"""
+        qr = CoolQRCode(back_color="transparent")
+        qr.add_data("测试")
+        img = qr.make_image().get_image()
+        assert img.mode == "RGBA"
+        assert img.getpixel((0, 0)) == (0, 0, 0, 0)
+        
+        custom = qr.make_custom_image(size=100)
+        assert custom.getextrema()[3] == (0, 255)
+
+    def test_none_background(self):
+        """测试背景色为None时与之前一样可以生成图像"""
+        qr = CoolQRCode(back_color=None)
+        qr.add_data("测试")
+        qr.make_image()
+        assert qr.make_custom_image(size=100).getextrema()[3] == (0, 255)
+
+    def test_unhashable_color(self):
+        """测试列表等不可哈希的颜色"""
+        with pytest.raises(InvalidColorError):
+            CoolQRCode(fill_color=[0, 0, 0])
+
+    def test_invalid_mask_color(self):
+        """测试无效蒙板颜色"""
+        with pytest.raises(InvalidColorError):
+            make_cool_qrcode("测试", mask_color="notacolor")
+
+    def test_short_hex_mask(self):
+        """测试短十六进制蒙板颜色"""
+        img = make_cool_qrcode("测试", size=100, mask_color="#F00", mask_opacity=1.0)
+        assert img.getpixel((0, 0))[:3] == (255, 0, 0)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
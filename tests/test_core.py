@@ -3,12 +3,14 @@
 """
 
 import pytest
+import qrcode
 from PIL import Image
 import tempfile
+import io
 import os
 from pathlib import Path
 
-from cool_qrcode import CoolQRCode
+from cool_qrcode import CoolQRCode, QRMatrix
 from cool_qrcode.exceptions import InvalidDataError, ImageGenerationError
 
 
@@ -83,6 +85,70 @@ class TestCoolQRCode:
         assert isinstance(data, bytes)
         assert len(data) > 0
     
+    def test_save_to_file_object(self):
+        """测试直接写入文件对象"""
+        qr = CoolQRCode()
+        qr.add_data("测试文件对象")
+        
+        bio = io.BytesIO()
+        qr.save(bio)
+        bio.seek(0)
+        img = Image.open(bio)
+        assert img.format == "PNG"
+    
+    def test_to_bytes_with_rendered_image(self):
+        """测试导出已生成的自定义图像"""
+        qr = CoolQRCode(fill_color="blue")
+        qr.add_data("测试已有图像")
+        custom = qr.make_custom_image(size=300, dot_shape="circle")
+        
+        data = qr.to_bytes(image=custom)
+        img = Image.open(io.BytesIO(data))
+        assert img.size == (300, 300)
+        assert img.convert('RGBA').tobytes() == custom.tobytes()
+    
+    def test_to_bytes_with_render_spec(self):
+        """测试按渲染参数导出自定义图像"""
+        qr = CoolQRCode()
+        qr.add_data("测试渲染参数")
+        
+        data = qr.to_bytes(render={"size": 250, "dot_shape": "circle"})
+        img = Image.open(io.BytesIO(data))
+        assert img.size == (250, 250)
+        assert img.convert('RGBA').tobytes() == qr.make_custom_image(250, "circle").tobytes()
+    
+    def test_compress_level(self):
+        """测试PNG压缩级别"""
+        qr = CoolQRCode()
+        qr.add_data("测试压缩级别")
+        img = qr.make_custom_image(size=400)
+        
+        fast = qr.to_bytes(image=img, compress_level=0)
+        small = qr.to_bytes(image=img, compress_level=9)
+        optimized = qr.to_bytes(image=img, optimize=True)
+        assert len(small) < len(fast)
+        assert len(optimized) <= len(small)
+        assert Image.open(io.BytesIO(fast)).tobytes() == Image.open(io.BytesIO(small)).tobytes()
+    
+    def test_encode_once(self, monkeypatch):
+        """测试重复导出时不重新编码"""
+        qr = CoolQRCode()
+        qr.add_data("测试只编码一次")
+        
+        from cool_qrcode import core
+        calls = []
+        original = core._encode
+        monkeypatch.setattr(core, "_encode", lambda *a, **kw: (calls.append(1), original(*a, **kw))[1])
+        
+        qr.to_bytes()
+        qr.to_bytes()
+        qr.save(io.BytesIO())
+        assert len(calls) == 1
+        
+        qr.add_data("追加数据")
+        qr.to_bytes()
+        assert len(calls) == 2
+    
     def test_clear(self):
         """测试清除数据"""
         qr = CoolQRCode()
@@ -101,5 +167,104 @@ class TestCoolQRCode:
         assert hasattr(img, 'save')  # 检查是否有save方法
 
 
+
+class TestStatelessRendering:
+    """无状态渲染与线程安全测试"""
+    
+    def test_encode_readonly(self):
+        """测试编码结果为不可变矩阵"""
+        qr = CoolQRCode()
+        qr.add_data("测试只读矩阵")
+        matrix = qr.encode()
+        assert isinstance(matrix, QRMatrix)
+        assert matrix is qr.encode()
+        array = matrix.as_numpy()
+        assert array.dtype == bool
+        assert array.shape == (matrix.size, matrix.size)
+        with pytest.raises(ValueError):
+            array[0, 0] = False
+    
+    def test_encode_no_data(self):
+        """测试未添加数据时编码"""
+        with pytest.raises(ImageGenerationError):
+            CoolQRCode().encode()
+    
+    def test_fit_false_on_fresh_instance(self):
+        """测试fit=False时数据超出构造版本仍自动选择版本（与qrcode首次生成一致）"""
+        data = "https://example.com/" + "x" * 60
+        reference = qrcode.QRCode()
+        reference.add_data(data)
+        expected = reference.make_image().size
+        
+        qr = CoolQRCode()
+        qr.add_data(data)
+        assert qr.make_image(fit=False).size == expected
+        assert qr.make_custom_image(size=500, fit=False).size == (500, 500)
+        assert qr.encode(fit=False) == qr.encode()
+    
+    def test_fit_false_keeps_version(self):
+        """测试fit=False且数据放得下时使用构造时的版本"""
+        qr = CoolQRCode(version=5)
+        qr.add_data("hello")
+        assert qr.encode(fit=False).size == 37
+    
+    def test_render_with_matrix(self):
+        """测试传入已编码的矩阵生成图像"""
+        qr = CoolQRCode(fill_color="navy")
+        qr.add_data("测试矩阵输入")
+        matrix = qr.encode()
+        
+        other = CoolQRCode(fill_color="navy")
+        assert other.make_custom_image(size=200, matrix=matrix).tobytes() == \
+            qr.make_custom_image(size=200).tobytes()
+        assert other.to_plain_png(matrix=matrix) == qr.to_plain_png()
+        assert other.to_svg(matrix=matrix) == qr.to_svg()
+    
+    def test_make_image_matches_qrcode(self):
+        """测试基础图像与qrcode的make_image逐像素一致"""
+        import qrcode
+        for fill_color, back_color in [("black", "white"), ("red", "lightblue")]:
+            qr = CoolQRCode(fill_color=fill_color, back_color=back_color, box_size=7, border=3)
+            qr.add_data("测试基础图像")
+            reference = qrcode.QRCode(box_size=7, border=3)
+            reference.add_data("测试基础图像")
+            expected = reference.make_image(fill_color=fill_color, back_color=back_color)
+            img = qr.make_image()
+            assert img.mode == expected.mode
+            assert img.get_image().tobytes() == expected.get_image().tobytes()
+    
+    def test_shared_instance_in_thread_pool(self):
+        """测试同一个对象在多个线程中同时生成图像"""
+        from concurrent.futures import ThreadPoolExecutor
+        
+        qr = CoolQRCode(fill_color="darkgreen", back_color="lightyellow")
+        qr.add_data("https://example.com/" + "x" * 200)
+        expected = {
+            "custom": qr.make_custom_image(size=300, dot_shape="circle").tobytes(),
+            "plain": qr.to_bytes(),
+            "svg": qr.to_svg(),
+        }
+        tasks = {
+            "custom": lambda: qr.make_custom_image(size=300, dot_shape="circle").tobytes(),
+            "plain": qr.to_bytes,
+            "svg": qr.to_svg,
+        }
+        
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            futures = [(kind, executor.submit(task)) for kind, task in tasks.items() for _ in range(20)]
+            for kind, future in futures:
+                assert future.result() == expected[kind]
+    
+    def test_add_data_keeps_encoded_matrix(self):
+        """测试追加数据后已返回的矩阵不变，新的编码使用新数据"""
+        qr = CoolQRCode()
+        qr.add_data("第一段")
+        matrix = qr.encode()
+        snapshot = matrix.as_numpy().copy()
+        
+        qr.add_data("第二段" * 20)
+        assert (matrix.as_numpy() == snapshot).all()
+        assert qr.encode().size != matrix.size
+
 if __name__ == "__main__":
     pytest.main([__file__]) 
\ No newline at end of file
@@ -0,0 +1,76 @@
+"""
+导入耗时测试
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import cool_qrcode
+
+HEAVY_MODULES = ("numpy", "PIL", "qrcode", "tempfile", "asyncio", "concurrent.futures")
+
+
+def _run(code):
+    """在新的解释器中执行代码，返回标准输出和标准错误"""
+    root = str(Path(cool_qrcode.__file__).resolve().parent.parent)
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [root, os.environ.get("PYTHONPATH")])))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True, check=True, env=env,
+    )
+    return result.stdout, result.stderr
+
+
+def _cumulative_us(importtime_log, module):
+    """从 -X importtime 的输出中取出某个模块的累计导入耗时（微秒）"""
+    for line in importtime_log.splitlines():
+        parts = [part.strip() for part in line.split("|")]
+        if len(parts) == 3 and parts[2] == module:
+            return int(parts[1])
+    raise AssertionError(f"没有找到模块 {module} 的导入记录")
+
+
+class TestLazyImport:
+    """按需导入测试类"""
+
+    def test_import_does_not_load_heavy_dependencies(self):
+        """测试 import cool_qrcode 不导入重量级依赖"""
+        stdout, _ = _run(
+            "import sys, cool_qrcode; "
+            f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+        )
+        assert stdout.strip() == ""
+
+    def test_import_time_budget(self):
+        """测试导入耗时保持在预算内（实测约2毫秒，预算留有余量）"""
+        _, log = _run("import cool_qrcode")
+        assert _cumulative_us(log, "cool_qrcode") < 30_000
+
+    def test_first_access_loads_dependencies(self):
+        """测试首次访问公开API时才加载依赖"""
+        stdout, _ = _run(
+            "import sys, cool_qrcode; "
+            "before = 'numpy' in sys.modules; "
+            "cool_qrcode.make_cool_qrcode; "
+            "print(before, 'numpy' in sys.modules)"
+        )
+        assert stdout.split() == ["False", "True"]
+
+    def test_all_names_resolve(self):
+        """测试 __all__ 中的所有名称都能访问，且出现在 dir() 中"""
+        for name in cool_qrcode.__all__:
+            assert getattr(cool_qrcode, name) is not None
+            assert name in dir(cool_qrcode)
+
+    def test_unknown_attribute(self):
+        """测试访问不存在的名称"""
+        with pytest.raises(AttributeError):
+            cool_qrcode.no_such_name
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
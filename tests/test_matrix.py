@@ -0,0 +1,127 @@
+"""
+模块矩阵测试
+"""
+
+import pickle
+
+import pytest
+import numpy as np
+import qrcode
+
+from cool_qrcode import CoolQRCode, QRMatrix
+from cool_qrcode.core import encode_matrix
+
+
+def _modules(data, version=1):
+    """用qrcode编码，返回原始的模块嵌套列表"""
+    qr = qrcode.QRCode(version=version)
+    qr.add_data(data)
+    qr.make(fit=True)
+    return qr.modules
+
+
+class TestQRMatrix:
+    """QRMatrix测试类"""
+
+    def test_from_modules(self):
+        """测试由qrcode模块矩阵创建"""
+        modules = _modules("测试矩阵")
+        matrix = QRMatrix.from_modules(modules)
+        assert matrix.size == len(modules)
+        assert matrix.as_numpy().tolist() == [[bool(m) for m in row] for row in modules]
+
+    def test_packed_storage(self):
+        """测试按位打包存储"""
+        matrix = QRMatrix.from_modules(_modules("x" * 2000))
+        assert matrix.size > 150
+        assert len(matrix.bits) == (matrix.size ** 2 + 7) // 8
+        assert not hasattr(matrix, "__dict__")
+
+    def test_pack_roundtrip(self):
+        """测试按位打包与还原"""
+        qr = qrcode.QRCode(version=3)
+        qr.add_data("pack")
+        qr.make(fit=False)
+
+        array = np.array(qr.modules, dtype=bool)
+        matrix = QRMatrix.from_array(array)
+        assert matrix.size == 29
+        assert len(matrix.bits) == (29 * 29 + 7) // 8
+        restored = QRMatrix(matrix.size, matrix.bits)
+        assert restored == matrix
+        assert np.array_equal(restored.as_numpy(), array)
+
+    def test_as_numpy_is_read_only(self):
+        """测试as_numpy返回只读数组"""
+        matrix = QRMatrix.from_modules(_modules("测试视图"))
+        array = matrix.as_numpy()
+        assert not array.flags.writeable
+        with pytest.raises(ValueError):
+            array[0, 0] = not array[0, 0]
+
+    def test_immutable(self):
+        """测试不能修改属性"""
+        matrix = QRMatrix.from_modules(_modules("测试不可变"))
+        with pytest.raises(AttributeError):
+            matrix.size = 1
+        with pytest.raises(AttributeError):
+            matrix._bits = b""
+
+    def test_equality_and_hash(self):
+        """测试相等比较和哈希"""
+        first = QRMatrix.from_modules(_modules("相同数据"))
+        second = QRMatrix.from_array(first.as_numpy().copy())
+        other = QRMatrix.from_modules(_modules("不同数据"))
+
+        assert first == second
+        assert hash(first) == hash(second)
+        assert first != other
+        assert len({first, second, other}) == 2
+        assert first != (first.size, first.bits)
+
+    def test_padding_normalized(self):
+        """测试末尾补齐位不影响相等性"""
+        array = np.eye(3, dtype=bool)
+        matrix = QRMatrix.from_array(array)
+        dirty = QRMatrix(3, matrix.bits[:-1] + bytes([matrix.bits[-1] | 0x7F]))
+        assert dirty == matrix
+        assert np.array_equal(dirty.as_numpy(), array)
+
+    def test_nbytes_is_packed_size(self):
+        """测试展开数组后对象仍只占打包数据的大小"""
+        matrix = QRMatrix.from_modules(_modules("x" * 2000))
+        matrix.as_numpy()
+        assert matrix.nbytes == len(matrix.bits) == (matrix.size * matrix.size + 7) // 8
+        assert not hasattr(matrix, "_array")
+
+    def test_pickle(self):
+        """测试pickle只传递打包数据"""
+        matrix = QRMatrix.from_modules(_modules("x" * 2000))
+        matrix.as_numpy()
+        payload = pickle.dumps(matrix)
+        assert len(payload) < len(matrix.bits) + 100
+        assert pickle.loads(payload) == matrix
+
+    def test_invalid(self):
+        """测试无效参数"""
+        with pytest.raises(ValueError):
+            QRMatrix(0, b"")
+        with pytest.raises(ValueError):
+            QRMatrix(21, b"\x00" * 10)
+        with pytest.raises(ValueError):
+            QRMatrix.from_array(np.zeros((3, 4), dtype=bool))
+
+    def test_shared_by_renderers(self):
+        """测试编码结果在缓存中共享，并可用于所有渲染方法"""
+        matrix = encode_matrix("测试共享矩阵")
+        assert matrix is encode_matrix("测试共享矩阵")
+
+        qr = CoolQRCode()
+        qr.add_data("测试共享矩阵")
+        assert qr.encode() is matrix
+        assert qr.make_image(matrix=matrix).size == qr.make_image().size
+        assert qr.to_plain_png(matrix=matrix) == qr.to_plain_png()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,67 @@
+"""
+多进程批量生成测试
+"""
+
+import pytest
+
+from cool_qrcode import make_cool_qrcode_batch, make_cool_qrcode_parallel, BatchStats
+
+
+class TestMakeCoolQRCodeParallel:
+    """多进程批量生成测试类"""
+
+    def test_matches_serial_batch_in_order(self):
+        """测试结果与串行批量生成一致且保持输入顺序"""
+        datas = [f"https://example.com/{i}" for i in range(23)]
+        options = dict(size=120, style="ocean", dot_shape="circle")
+
+        serial = list(make_cool_qrcode_batch(datas, format="PNG", **options))
+        parallel = list(make_cool_qrcode_parallel(datas, workers=2, chunksize=4, **options))
+
+        assert parallel == serial
+
+    def test_stats(self):
+        """测试按工作进程统计吞吐量"""
+        stats = BatchStats()
+        datas = (f"item-{i}" for i in range(10))
+        outputs = list(make_cool_qrcode_parallel(datas, workers=2, chunksize=3, size=100, stats=stats))
+
+        assert len(outputs) == 10
+        assert stats.items == 10
+        assert 1 <= len(stats.workers) <= 2
+        assert stats.throughput > 0
+        for worker in stats.workers.values():
+            assert worker.items > 0
+            assert worker.throughput > 0
+
+        assert len(stats.latencies) == 10
+        assert 0 < stats.percentile(50) <= stats.percentile(99) <= max(stats.latencies)
+
+    def test_percentile(self):
+        """测试耗时百分位数"""
+        stats = BatchStats()
+        assert stats.percentile(50) == 0.0
+        stats.record(1, 100, 5.5, [float(i) for i in range(100, 0, -1)])
+        assert stats.percentile(50) == 50.0
+        assert stats.percentile(99) == 99.0
+        assert stats.percentile(100) == 100.0
+        with pytest.raises(ValueError):
+            stats.percentile(101)
+
+    def test_empty_input(self):
+        """测试空输入"""
+        assert list(make_cool_qrcode_parallel([], workers=1)) == []
+
+    def test_invalid_chunksize(self):
+        """测试无效的分块大小"""
+        with pytest.raises(ValueError):
+            list(make_cool_qrcode_parallel(["A"], chunksize=0))
+
+    def test_worker_error_propagates(self):
+        """测试工作进程中的错误会传回主进程"""
+        with pytest.raises(Exception):
+            list(make_cool_qrcode_parallel(["A", ""], workers=1, chunksize=1))
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,116 @@
+"""
+性能相关测试
+"""
+
+import io
+
+import numpy as np
+import pytest
+import qrcode
+from PIL import Image
+
+from cool_qrcode import CoolQRCode
+from cool_qrcode.png import encode_png, matrix_to_png
+
+
+SIZES = [200, 500, 1000, 2000]
+
+
+class TestCustomImagePipeline:
+    """自定义图像渲染管线测试类"""
+
+    @pytest.mark.parametrize("size", SIZES)
+    def test_no_base_image_rendered(self, size, monkeypatch):
+        """测试make_custom_image不再渲染并丢弃qrcode的基础图像"""
+        calls = []
+        original = qrcode.QRCode.make_image
+
+        def counting_make_image(self, *args, **kwargs):
+            calls.append(args)
+            return original(self, *args, **kwargs)
+
+        monkeypatch.setattr(qrcode.QRCode, "make_image", counting_make_image)
+
+        qr = CoolQRCode()
+        qr.add_data("https://example.com/" + "x" * 100)
+        img = qr.make_custom_image(size=size, dot_shape="circle")
+
+        assert img.size == (size, size)
+        assert calls == []
+
+
+def _decode(png):
+    """把PNG解码为RGBA数组"""
+    return np.array(Image.open(io.BytesIO(png)).convert("RGBA"))
+
+
+class TestPlainPngExport:
+    """不经过PIL的PNG导出测试类"""
+
+    @pytest.mark.parametrize("data", ["short", "x" * 300, "长数据" * 200], ids=["short", "ascii", "unicode"])
+    @pytest.mark.parametrize("bit_depth", [1, 8])
+    def test_matches_to_bytes(self, data, bit_depth):
+        """测试与to_bytes的基础图像逐像素一致"""
+        qr = CoolQRCode(fill_color="darkgreen", back_color="ivory")
+        qr.add_data(data)
+        png = qr.to_plain_png(bit_depth=bit_depth)
+
+        assert png[24] == bit_depth
+        assert np.array_equal(_decode(png), _decode(qr.to_bytes()))
+
+    def test_box_size_and_border(self):
+        """测试模块大小和边框"""
+        qr = CoolQRCode(box_size=3, border=2)
+        qr.add_data("边框")
+        img = Image.open(io.BytesIO(qr.to_plain_png()))
+        assert img.size == ((21 + 4) * 3,) * 2
+        assert img.getpixel((5, 5)) == 0
+
+    def test_no_pil_image_constructed(self, monkeypatch):
+        """测试导出过程不构造PIL图像"""
+        qr = CoolQRCode()
+        qr.add_data("不经过PIL")
+        qr.to_plain_png()
+
+        def fail(*args, **kwargs):
+            raise AssertionError("不应构造PIL图像")
+        monkeypatch.setattr(Image, "new", fail)
+        monkeypatch.setattr(Image, "fromarray", fail)
+        monkeypatch.setattr(Image, "frombytes", fail)
+        qr.clear()
+        qr.add_data("不经过PIL的另一个二维码")
+        assert qr.to_plain_png().startswith(b"\x89PNG")
+
+    @pytest.mark.parametrize("bit_depth", [2, 4, 8])
+    def test_encode_palette_depths(self, bit_depth):
+        """测试多色调色板各位深度的打包"""
+        indices = (np.arange(7 * 11).reshape(7, 11) % 4).astype(np.uint8)
+        png = encode_png(indices, ["red", "green", "blue", "#00000000"], bit_depth=bit_depth)
+        img = Image.open(io.BytesIO(png))
+        assert np.array_equal(np.array(img), indices)
+        assert img.convert("RGBA").getpixel((3, 0)) == (0, 0, 0, 0)
+
+    def test_palette_too_large_for_depth(self):
+        """测试位深度无法容纳调色板"""
+        with pytest.raises(ValueError):
+            encode_png(np.zeros((2, 2), dtype=np.uint8), ["red", "green", "blue"], bit_depth=1)
+
+    def test_matrix_to_png_matches_to_bytes(self, monkeypatch):
+        """测试直接编码不构造PIL图像，且与to_bytes逐像素一致"""
+        qr = CoolQRCode()
+        qr.add_data("https://example.com/" + "x" * 500)
+        matrix = qr.encode().as_numpy()
+        expected = _decode(qr.to_bytes())
+
+        def fail(*args, **kwargs):
+            raise AssertionError("不应构造PIL图像")
+        with monkeypatch.context() as patch:
+            patch.setattr(Image, "new", fail)
+            patch.setattr(Image, "fromarray", fail)
+            patch.setattr(Image, "frombytes", fail)
+            png = matrix_to_png(matrix)
+
+        assert np.array_equal(_decode(png), expected)
+
+if __name__ == "__main__":
+    pytest.main([__file__])
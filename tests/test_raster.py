@@ -0,0 +1,340 @@
+"""
+栅格化引擎测试
+"""
+
+import pytest
+import numpy as np
+import qrcode
+from PIL import Image, ImageDraw
+
+from cool_qrcode import CoolQRCode, QRMatrix
+from cool_qrcode.cache import sprite_cache
+from cool_qrcode.raster import (
+    rasterize_dots, colorize,
+    circle_phases, circle_sprites, parse_quality, apply_mask
+)
+
+
+def _reference_image(qr, size, dot_shape, fill_color, back_color):
+    """逐点调用ImageDraw绘制的参考实现"""
+    img = Image.new('RGBA', (size, size), back_color)
+    draw = ImageDraw.Draw(img)
+    modules_count = qr.modules_count
+    dot_size = size / (modules_count * 2)
+    for r in range(modules_count):
+        for c in range(modules_count):
+            if qr.modules[r][c]:
+                x = c * size // modules_count + size // (2 * modules_count)
+                y = r * size // modules_count + size // (2 * modules_count)
+                box = (x - dot_size, y - dot_size, x + dot_size, y + dot_size)
+                if dot_shape == 'circle':
+                    draw.ellipse(box, fill=fill_color)
+                else:
+                    draw.rectangle(box, fill=fill_color)
+    return img
+
+
+class TestRaster:
+    """栅格化引擎测试类"""
+
+    @pytest.mark.parametrize("dot_shape", ["square", "circle"])
+    @pytest.mark.parametrize("version,size", [
+        (1, 21), (1, 200), (2, 333), (5, 500), (10, 777), (20, 1000), (40, 601)
+    ])
+    def test_pixel_identical(self, version, size, dot_shape):
+        """测试与逐点绘制的结果逐像素一致"""
+        qr = qrcode.QRCode(version=version)
+        qr.add_data("pixel")
+        qr.make(fit=False)
+
+        expected = _reference_image(qr, size, dot_shape, "navy", "#FF000080")
+        dots = rasterize_dots(QRMatrix.from_modules(qr.modules).as_numpy(), size, dot_shape)
+        actual = colorize(dots, "navy", "#FF000080")
+
+        assert actual.mode == 'RGBA'
+        assert np.array_equal(np.array(actual), np.array(expected))
+
+    def test_make_custom_image_matches_reference(self):
+        """测试make_custom_image与参考实现一致"""
+        qr = CoolQRCode(fill_color="darkgreen", back_color="lightyellow")
+        qr.add_data("测试栅格化")
+
+        img = qr.make_custom_image(size=450, dot_shape="circle")
+
+        reference = qrcode.QRCode(version=1)
+        reference.add_data("测试栅格化")
+        reference.make(fit=True)
+        expected = _reference_image(reference, 450, "circle", "darkgreen", "lightyellow")
+        assert np.array_equal(np.array(img), np.array(expected))
+
+
+class TestPaletteModes:
+    """双色调色板输出测试类"""
+
+    @pytest.fixture
+    def qr(self):
+        qr = CoolQRCode(fill_color="navy", back_color="lightyellow")
+        qr.add_data("测试调色板")
+        return qr
+
+    def test_palette_mode(self, qr):
+        """测试P模式与RGBA输出颜色一致"""
+        rgba = qr.make_custom_image(size=300, dot_shape="circle")
+        palette = qr.make_custom_image(size=300, dot_shape="circle", mode="P")
+
+        assert palette.mode == "P"
+        assert len(palette.getcolors()) == 2
+        assert palette.convert("RGBA").tobytes() == rgba.tobytes()
+
+    def test_palette_png_is_one_bit(self, qr):
+        """测试P模式写出1位深度的PNG且体积更小"""
+        palette_png = qr.to_bytes(image=qr.make_custom_image(size=300, mode="P"))
+        rgba_png = qr.to_bytes(image=qr.make_custom_image(size=300))
+
+        # IHDR中的位深度字段
+        assert palette_png[24] == 1
+        assert len(palette_png) < len(rgba_png)
+
+    def test_bilevel_mode(self):
+        """测试黑白二维码输出1模式"""
+        qr = CoolQRCode()
+        qr.add_data("测试二值图")
+        rgba = qr.make_custom_image(size=200)
+
+        for mode in ("1", "auto"):
+            img = qr.make_custom_image(size=200, mode=mode)
+            assert img.mode == "1"
+            assert img.convert("RGBA").tobytes() == rgba.tobytes()
+
+    def test_auto_mode_with_colors(self, qr):
+        """测试彩色二维码自动选择P模式"""
+        assert qr.make_custom_image(size=200, mode="auto").mode == "P"
+
+    def test_transparent_palette(self):
+        """测试带透明度的颜色"""
+        dots = np.zeros((4, 4), dtype=bool)
+        dots[1:3, 1:3] = True
+        img = colorize(dots, "#FF000080", "white", mode="P")
+        assert img.convert("RGBA").getpixel((1, 1)) == (255, 0, 0, 128)
+
+    def test_bilevel_requires_black_and_white(self, qr):
+        """测试非黑白颜色不能使用1模式"""
+        from cool_qrcode.exceptions import ImageGenerationError
+        with pytest.raises(ImageGenerationError):
+            qr.make_custom_image(size=200, mode="1")
+
+
+class TestQuality:
+    """抗锯齿渲染质量测试类"""
+
+    @pytest.fixture
+    def matrix(self):
+        qr = qrcode.QRCode(version=5)
+        qr.add_data("quality")
+        qr.make(fit=False)
+        return QRMatrix.from_modules(qr.modules).as_numpy()
+
+    def test_parse_quality(self):
+        """测试质量参数解析"""
+        assert parse_quality("fast") == ("fast", 1)
+        assert parse_quality("aa") == ("aa", 1)
+        assert parse_quality("supersample-4") == ("supersample", 4)
+        for quality in ("best", "supersample-1", "supersample-x", "supersample-"):
+            with pytest.raises(ValueError):
+                parse_quality(quality)
+
+    @pytest.mark.parametrize("quality", ["aa", "supersample-2", "supersample-4"])
+    @pytest.mark.parametrize("dot_shape", ["square", "circle"])
+    def test_coverage_area(self, matrix, quality, dot_shape):
+        """测试覆盖率总和接近码点的解析面积"""
+        size = 600
+        coverage = rasterize_dots(matrix, size, dot_shape, quality=quality)
+        assert coverage.dtype == np.uint8
+        assert coverage.shape == (size, size)
+
+        dot_size = size / (matrix.shape[0] * 2)
+        area = (4 if dot_shape == "square" else np.pi) * dot_size ** 2
+        # 画布边缘的码点会被截断，只统计内部码点
+        expected = area * matrix[1:-1, 1:-1].sum()
+        margin = int(np.ceil(size / matrix.shape[0]))
+        inner = coverage.astype(np.float64) / 255
+        inner[:margin] = inner[-margin:] = 0
+        inner[:, :margin] = inner[:, -margin:] = 0
+        # 采样数较小时边缘像素的覆盖率按 1/N 量化，允许少量误差
+        assert abs(inner.sum() - expected) / expected < 0.05
+
+    @pytest.mark.parametrize("quality", ["aa", "supersample-3", "supersample-4"])
+    @pytest.mark.parametrize("modules_count,size", [(3, 100), (29, 500), (25, 333), (177, 200)])
+    def test_square_has_no_seams(self, modules_count, size, quality):
+        """测试画布大小不能被模块数整除时，相邻方形码点之间也没有浅色接缝"""
+        block = np.ones((modules_count, modules_count), dtype=bool)
+        coverage = rasterize_dots(block, size, "square", quality=quality)
+        assert (coverage == 255).all()
+
+    def test_finder_pattern_core_is_solid(self):
+        """测试真实二维码中定位图案的3x3中心完全覆盖"""
+        qr = qrcode.QRCode(version=3)
+        qr.add_data("seam")
+        qr.make(fit=False)
+        matrix = QRMatrix.from_modules(qr.modules).as_numpy()
+        size = 333
+        coverage = rasterize_dots(matrix, size, "square", quality="aa")
+        lo, hi = int(np.ceil(2 * size / 29)), int(5 * size / 29)
+        assert (coverage[lo:hi, lo:hi] == 255).all()
+
+    def test_square_module_area(self):
+        """测试单个方形码点的覆盖率总和等于模块单元的面积"""
+        matrix = np.zeros((29, 29), dtype=bool)
+        matrix[5, 7] = True
+        coverage = rasterize_dots(matrix, 500, "square", quality="aa")
+        assert abs(coverage.sum() / 255 - (500 / 29) ** 2) < 0.5
+
+    def test_circle_follows_module_pitch(self):
+        """测试圆形码点的中心位于连续模块单元的中心"""
+        matrix = np.zeros((29, 29), dtype=bool)
+        matrix[20, 3] = True
+        coverage = rasterize_dots(matrix, 500, "circle", quality="aa").astype(np.float64)
+        ys, xs = np.indices(coverage.shape) + 0.5
+        total = coverage.sum()
+        center = ((ys * coverage).sum() / total, (xs * coverage).sum() / total)
+        expected = (20.5 * 500 / 29, 3.5 * 500 / 29)
+        assert np.abs(np.subtract(center, expected)).max() < 1 / 16
+
+    def test_supersample_converges_to_aa(self, matrix):
+        """测试采样数越大，结果越接近解析抗锯齿"""
+        aa = rasterize_dots(matrix, 500, "circle", quality="aa").astype(int)
+        errors = [
+            np.abs(rasterize_dots(matrix, 500, "circle", quality=f"supersample-{n}") - aa).mean()
+            for n in (2, 8)
+        ]
+        assert errors[1] < errors[0]
+
+    def test_sprite_is_cached(self):
+        """测试码点图块只计算一次"""
+        sprite_cache.clear()
+        _, _, _, offsets, span = circle_phases(29, 500)
+        first = circle_sprites(500 / 58, offsets, span, "aa")
+        assert first.shape == (len(offsets), len(offsets), span, span)
+        assert circle_sprites(500 / 58, offsets, span, "aa") is first
+        info = sprite_cache.info()
+        assert info.hits == 1 and info.misses == 1
+        assert info.nbytes == first.nbytes
+
+    def test_gradient_palette(self):
+        """测试抗锯齿图像的渐变调色板"""
+        coverage = np.array([[0, 128, 255]], dtype=np.uint8)
+        img = colorize(coverage, "black", "white", mode="auto")
+        assert img.mode == "P"
+        assert img.convert("RGB").getpixel((0, 0)) == (255, 255, 255)
+        assert img.convert("RGB").getpixel((1, 0)) == (127, 127, 127)
+        assert img.convert("RGB").getpixel((2, 0)) == (0, 0, 0)
+        with pytest.raises(ValueError):
+            colorize(coverage, "black", "white", mode="1")
+
+    def test_make_custom_image_quality(self):
+        """测试make_custom_image的质量参数"""
+        qr = CoolQRCode(fill_color="navy", back_color="lightyellow")
+        qr.add_data("测试抗锯齿")
+
+        fast = qr.make_custom_image(size=300, dot_shape="circle")
+        smooth = qr.make_custom_image(size=300, dot_shape="circle", quality="aa")
+        palette = qr.make_custom_image(size=300, dot_shape="circle", quality="aa", mode="P")
+
+        assert len(fast.getcolors()) == 2
+        assert len(smooth.getcolors(65536)) > 2
+        assert palette.convert("RGBA").tobytes() == smooth.tobytes()
+
+
+
+def _composite_reference(img, mask_color, mask_opacity):
+    """叠加纯色RGBA图层的参考实现"""
+    layer = Image.new('RGBA', img.size, mask_color)
+    layer.putalpha(int(255 * mask_opacity))
+    return Image.alpha_composite(img.convert('RGBA'), layer)
+
+
+class TestApplyMask:
+    """蒙板合成测试类"""
+
+    @pytest.fixture
+    def qr(self):
+        qr = CoolQRCode(fill_color="darkgreen", back_color="lightgreen")
+        qr.add_data("测试蒙板")
+        return qr
+
+    @pytest.mark.parametrize("opacity", [0.0, 0.2, 0.5, 1.0])
+    @pytest.mark.parametrize("mode", ["RGBA", "P"])
+    def test_matches_alpha_composite(self, qr, mode, opacity):
+        """测试结果与alpha_composite叠加纯色图层一致"""
+        img = qr.make_custom_image(size=200, dot_shape="circle", mode=mode)
+        expected = _composite_reference(img, "purple", opacity)
+
+        result = apply_mask(img, "purple", opacity)
+        assert result.mode == mode
+        assert result.convert("RGBA").tobytes() == expected.tobytes()
+
+    def test_palette_blended_in_place(self, qr):
+        """测试调色板图像只变换调色板，不改变像素索引"""
+        img = qr.make_custom_image(size=200, mode="P")
+        indices = img.tobytes()
+
+        result = apply_mask(img, "red", 0.4)
+        assert result is img
+        assert result.tobytes() == indices
+        assert len(result.getcolors()) == 2
+
+    def test_bilevel_becomes_palette(self):
+        """测试黑白二值图加蒙板后为双色调色板图像"""
+        qr = CoolQRCode()
+        qr.add_data("测试二值蒙板")
+        img = qr.make_custom_image(size=200, mode="1")
+        expected = _composite_reference(img, "blue", 0.3)
+
+        result = apply_mask(img, "blue", 0.3)
+        assert result.mode == "P"
+        assert result.convert("RGBA").tobytes() == expected.tobytes()
+
+    def test_rgb_and_translucent(self):
+        """测试RGB图像和含半透明像素的RGBA图像"""
+        rng = np.random.default_rng(0)
+        rgb = Image.fromarray(rng.integers(0, 256, (32, 32, 3), dtype=np.uint8), "RGB")
+        result = apply_mask(rgb, "orange", 0.3)
+        assert result.mode == "RGB"
+        assert result.convert("RGBA").tobytes() == _composite_reference(rgb, "orange", 0.3).tobytes()
+
+        rgba = Image.fromarray(rng.integers(0, 256, (64, 64, 4), dtype=np.uint8), "RGBA")
+        for opacity in (0.05, 0.3, 0.77, 1.0):
+            result = apply_mask(rgba, "orange", opacity)
+            assert result.tobytes() == _composite_reference(rgba, "orange", opacity).tobytes()
+
+    def test_translucent_logo(self, tmp_path):
+        """测试带半透明Logo的二维码叠加蒙板后与alpha_composite逐位一致"""
+        from cool_qrcode import make_cool_qrcode
+
+        logo = Image.new("RGBA", (64, 64))
+        logo.putdata([(x * 4, 255 - y * 4, 128, (x + y) * 2) for y in range(64) for x in range(64)])
+        logo_path = tmp_path / "logo.png"
+        logo.save(logo_path)
+
+        options = dict(size=300, dot_shape="circle", style="ocean", logo_path=str(logo_path))
+        plain = make_cool_qrcode("测试半透明Logo", **options)
+        assert plain.getchannel("A").getextrema()[0] < 255
+
+        result = make_cool_qrcode("测试半透明Logo", mask_color="purple", mask_opacity=0.35, **options)
+        assert result.tobytes() == _composite_reference(plain, "purple", 0.35).tobytes()
+
+    def test_make_cool_qrcode_keeps_palette(self):
+        """测试make_cool_qrcode加蒙板时保持调色板模式"""
+        from cool_qrcode import make_cool_qrcode
+
+        rgba = make_cool_qrcode("测试", size=200, style="forest", mask_color="red", mask_opacity=0.3)
+        palette = make_cool_qrcode(
+            "测试", size=200, style="forest", mask_color="red", mask_opacity=0.3, mode="auto"
+        )
+        assert rgba.mode == "RGBA"
+        assert palette.mode == "P"
+        assert palette.convert("RGBA").tobytes() == rgba.tobytes()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
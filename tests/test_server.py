@@ -0,0 +1,131 @@
+"""
+HTTP服务测试
+"""
+
+import threading
+import urllib.error
+import urllib.request
+from io import BytesIO
+
+import pytest
+from PIL import Image
+
+from cool_qrcode import make_cool_qrcode
+from cool_qrcode.server import QRCodeService, create_server, parse_query
+
+
+class TestParseQuery:
+    """查询参数规范化测试类"""
+
+    def test_defaults(self):
+        """测试默认参数"""
+        params = parse_query("data=Hello")
+        assert params.size == 500
+        assert params.dot_shape == "square"
+        assert (params.fill_color, params.back_color) == ("#000000", "#ffffff")
+        assert params.format == "png"
+
+    def test_equivalent_queries_normalize_equal(self):
+        """测试不同写法的相同参数规范化为同一个键"""
+        a = parse_query("data=Hi&fill=red&back=white&dot=circle")
+        b = parse_query("dot=circle&fill=%23FF0000&back=rgb(255,255,255)&data=Hi")
+        assert a == b
+        assert QRCodeService.etag(a) == QRCodeService.etag(b)
+
+    def test_style_overrides_colors(self):
+        """测试style展开为颜色"""
+        assert parse_query("data=Hi&style=ocean&fill=red") == parse_query(
+            "data=Hi&fill=darkblue&back=lightblue"
+        )
+
+    @pytest.mark.parametrize("query", [
+        "", "data=", "data=Hi&size=abc", "data=Hi&size=5", "data=Hi&size=100000",
+        "data=Hi&dot=star", "data=Hi&style=unknown", "data=Hi&fill=notacolor",
+        "data=Hi&quality=best", "data=Hi&quality=supersample-9",
+        "data=Hi&quality=supersample-96", "data=Hi&format=gif",
+    ])
+    def test_invalid(self, query):
+        """测试无效参数"""
+        with pytest.raises(ValueError):
+            parse_query(query)
+
+
+class TestServer:
+    """HTTP服务测试类"""
+
+    @pytest.fixture
+    def base_url(self):
+        server = create_server(port=0, workers=2, quiet=True)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        host, port = server.server_address[:2]
+        yield f"http://{host}:{port}", server
+        server.shutdown()
+        server.server_close()
+
+    def _get(self, url, headers=None):
+        request = urllib.request.Request(url, headers=headers or {})
+        try:
+            with urllib.request.urlopen(request, timeout=10) as response:
+                return response.status, dict(response.headers), response.read()
+        except urllib.error.HTTPError as e:
+            return e.code, dict(e.headers), e.read()
+
+    def test_png(self, base_url):
+        """测试返回PNG，与直接生成的结果一致"""
+        url, _ = base_url
+        status, headers, body = self._get(f"{url}/qr?data=Hello&style=ocean&dot=circle&size=200")
+
+        assert status == 200
+        assert headers["Content-Type"] == "image/png"
+        assert headers["ETag"]
+        expected = make_cool_qrcode("Hello", style="ocean", dot_shape="circle", size=200)
+        assert Image.open(BytesIO(body)).convert("RGBA").tobytes() == expected.tobytes()
+
+    def test_svg(self, base_url):
+        """测试返回SVG"""
+        url, _ = base_url
+        status, headers, body = self._get(f"{url}/qr?data=Hello&format=svg")
+        assert status == 200
+        assert headers["Content-Type"] == "image/svg+xml"
+        assert body.startswith(b"<svg")
+
+    def test_response_cache_and_etag(self, base_url):
+        """测试重复请求命中缓存，携带ETag时返回304"""
+        url, server = base_url
+        _, headers, first = self._get(f"{url}/qr?data=Cache&size=150")
+        _, _, second = self._get(f"{url}/qr?size=150&data=Cache&fill=%23000")
+
+        info = server.service.info()
+        assert first == second
+        assert info.misses == 1 and info.hits == 1
+
+        status, _, body = self._get(f"{url}/qr?data=Cache&size=150",
+                                    headers={"If-None-Match": headers["ETag"]})
+        assert status == 304
+        assert body == b""
+        assert server.service.info().hits == 1
+
+    def test_bad_request(self, base_url):
+        """测试无效参数返回400"""
+        url, _ = base_url
+        status, _, body = self._get(f"{url}/qr?data=Hi&dot=star")
+        assert status == 400
+        assert "dot" in body.decode("utf-8")
+
+    def test_supersample_limit(self, base_url):
+        """测试超采样数超过上限时返回400，不渲染"""
+        url, server = base_url
+        status, _, body = self._get(f"{url}/qr?data=Hi&size=4096&quality=supersample-96")
+        assert status == 400
+        assert "supersample" in body.decode("utf-8")
+        assert parse_query("data=Hi&quality=supersample-8").quality == "supersample-8"
+
+    def test_not_found(self, base_url):
+        """测试未知路径返回404"""
+        url, _ = base_url
+        assert self._get(f"{url}/other")[0] == 404
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
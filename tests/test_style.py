@@ -0,0 +1,110 @@
+"""
+预编译样式模板测试
+"""
+
+import io
+import os
+import pickle
+import tempfile
+
+import pytest
+from PIL import Image
+
+from cool_qrcode import QRStyle, make_cool_qrcode, create_sample_logo
+from cool_qrcode.exceptions import InvalidDataError, InvalidLogoError, InvalidColorError
+from cool_qrcode.cache import logo_cache
+
+
+class TestQRStyle:
+    """QRStyle测试类"""
+
+    @pytest.fixture
+    def sample_logo(self):
+        """创建测试用的Logo文件"""
+        with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as tmp:
+            logo_path = create_sample_logo(tmp.name)
+            yield logo_path
+            if os.path.exists(logo_path):
+                os.unlink(logo_path)
+
+    @pytest.mark.parametrize("options", [
+        dict(),
+        dict(style="ocean", dot_shape="circle"),
+        dict(style="berry", mask_color="purple", mask_opacity=0.2),
+        dict(fill_color="navy", dot_shape="circle", quality="aa", mask_color="red"),
+    ], ids=["plain", "style", "mask", "aa-mask"])
+    def test_matches_make_cool_qrcode(self, options):
+        """测试渲染结果与make_cool_qrcode一致"""
+        style = QRStyle(size=300, mode="RGBA", **options)
+        for data in ("第一个", "https://example.com/2"):
+            expected = make_cool_qrcode(data, size=300, **options)
+            img = style.render(data)
+            assert img.mode == expected.mode == "RGBA"
+            assert img.tobytes() == expected.tobytes()
+
+    def test_logo_and_mask(self, sample_logo):
+        """测试Logo与蒙板组合，Logo只准备一次"""
+        options = dict(style="forest", dot_shape="circle", logo_path=sample_logo,
+                       mask_color="purple", mask_opacity=0.2)
+        logo_cache.clear()
+        style = QRStyle(size=300, **options)
+        images = [style.render(data) for data in ("A", "B", "C")]
+        assert logo_cache.info().misses == 1
+
+        for data, img in zip("ABC", images):
+            expected = make_cool_qrcode(data, size=300, **options)
+            assert img.mode == "RGBA"
+            assert img.tobytes() == expected.tobytes()
+
+    def test_mask_folded_into_palette(self):
+        """测试无Logo时蒙板折算进双色调色板"""
+        style = QRStyle(size=200, mask_color="blue", mask_opacity=0.3)
+        img = style.render("测试")
+        assert img.mode == "P"
+        assert len(img.getcolors()) == 2
+        expected = make_cool_qrcode("测试", size=200, mask_color="blue", mask_opacity=0.3)
+        assert img.convert("RGBA").tobytes() == expected.tobytes()
+
+    def test_bilevel_default(self):
+        """测试黑白二维码默认输出1模式"""
+        assert QRStyle(size=100).render("测试").mode == "1"
+
+    def test_encoded_bytes(self):
+        """测试输出编码后的字节数据"""
+        png = QRStyle(size=200, style="ocean").render("测试", format="PNG")
+        img = Image.open(io.BytesIO(png))
+        assert img.format == "PNG"
+        assert img.size == (200, 200)
+
+    def test_pickle_roundtrip(self, sample_logo):
+        """测试pickle后渲染结果不变"""
+        style = QRStyle(size=200, style="sunset", dot_shape="circle", logo_path=sample_logo)
+        restored = pickle.loads(pickle.dumps(style))
+        assert restored.render("测试", format="PNG") == style.render("测试", format="PNG")
+
+    def test_invalid_options(self):
+        """测试无效参数在创建时报错"""
+        with pytest.raises(ValueError):
+            QRStyle(dot_shape="triangle")
+        with pytest.raises(ValueError):
+            QRStyle(mode="CMYK")
+        with pytest.raises(ValueError):
+            QRStyle(quality="best")
+        with pytest.raises(ValueError):
+            QRStyle(fill_color="red", mode="1")
+        with pytest.raises(InvalidColorError):
+            QRStyle(mask_color="notacolor")
+        with pytest.raises(InvalidLogoError):
+            QRStyle(logo_path="nonexistent_logo.png")
+
+    def test_invalid_data(self):
+        """测试空数据和超出容量的数据"""
+        style = QRStyle(size=100)
+        with pytest.raises(InvalidDataError):
+            style.render("")
+        with pytest.raises(InvalidDataError):
+            style.render("x" * 8000)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,118 @@
+"""
+SVG输出测试
+"""
+
+import os
+import re
+import tempfile
+import xml.etree.ElementTree as ET
+
+import numpy as np
+import pytest
+import qrcode
+
+from cool_qrcode import CoolQRCode, QRMatrix, make_cool_qrcode, create_sample_logo
+from cool_qrcode.svg import render_svg
+
+SVG_NS = "{http://www.w3.org/2000/svg}"
+
+
+def _matrix(data):
+    qr = qrcode.QRCode(version=1)
+    qr.add_data(data)
+    qr.make(fit=True)
+    return QRMatrix.from_modules(qr.modules).as_numpy()
+
+
+def _decode_path(d, modules_count):
+    """把描边路径还原为模块矩阵"""
+    matrix = np.zeros((modules_count, modules_count), dtype=bool)
+    x = y = 0.0
+    for command, args in re.findall(r"([MmHh])([^MmHh]*)", d):
+        values = [float(v) for v in args.split()]
+        if command == "M":
+            x, y = values
+        elif command == "m":
+            x, y = x + values[0], y + values[1]
+        else:
+            length = values[0]
+            row = int(y)
+            if length == 0:
+                matrix[row, int(x)] = True
+            else:
+                matrix[row, int(x):int(x + length)] = True
+            x += length
+    return matrix
+
+
+class TestSVG:
+    """SVG输出测试类"""
+
+    @pytest.mark.parametrize("dot_shape", ["square", "circle"])
+    def test_geometry_matches_matrix(self, dot_shape):
+        """测试SVG路径与模块矩阵一致"""
+        matrix = _matrix("https://example.com/svg")
+        svg = render_svg(matrix, size=400, dot_shape=dot_shape)
+
+        root = ET.fromstring(svg)
+        assert root.get("width") == "400"
+        n = matrix.shape[0]
+        assert root.get("viewBox") == f"0 0 {n} {n}"
+
+        paths = root.findall(f"{SVG_NS}path")
+        assert len(paths) == 1
+        assert np.array_equal(_decode_path(paths[0].get("d"), n), matrix)
+
+    def test_colors(self):
+        """测试颜色统一转换为十六进制"""
+        svg = render_svg(_matrix("颜色"), fill_color="#FF573380", back_color="lightyellow")
+        root = ET.fromstring(svg)
+        assert root.find(f"{SVG_NS}rect").get("fill") == "#ffffe0"
+        assert root.find(f"{SVG_NS}path").get("stroke") == "#ff573380"
+
+    def test_to_svg(self):
+        """测试CoolQRCode.to_svg"""
+        qr = CoolQRCode(fill_color="navy")
+        qr.add_data("测试SVG")
+        svg = qr.to_svg(size=300, dot_shape="circle")
+        assert svg.startswith("<svg")
+        assert 'stroke-linecap="round"' in svg
+        assert len(svg) < 10 * 1024
+
+    def test_to_svg_no_data(self):
+        """测试未添加数据时生成SVG"""
+        from cool_qrcode.exceptions import ImageGenerationError
+        with pytest.raises(ImageGenerationError):
+            CoolQRCode().to_svg()
+
+    def test_make_cool_qrcode_svg(self):
+        """测试make_cool_qrcode输出SVG并保存"""
+        with tempfile.TemporaryDirectory() as tmp:
+            logo_path = create_sample_logo(os.path.join(tmp, "logo.png"))
+            filename = os.path.join(tmp, "qr.svg")
+            svg = make_cool_qrcode(
+                "组合SVG",
+                style="ocean",
+                dot_shape="circle",
+                logo_path=logo_path,
+                mask_color="blue",
+                mask_opacity=0.2,
+                format="svg",
+                filename=filename,
+            )
+            assert isinstance(svg, str)
+            with open(filename, encoding="utf-8") as f:
+                assert f.read() == svg
+
+        root = ET.fromstring(svg)
+        assert len(root.findall(f"{SVG_NS}image")) == 1
+        assert root.findall(f"{SVG_NS}rect")[-1].get("fill-opacity") == "0.2"
+
+    def test_nonexistent_logo_error(self):
+        """测试不存在的Logo文件（应该报错）"""
+        with pytest.raises(Exception):
+            make_cool_qrcode("测试", logo_path="nonexistent_logo.png", format="svg")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
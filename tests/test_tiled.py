@@ -0,0 +1,169 @@
+"""
+分块渲染测试
+"""
+
+import io
+import threading
+import zlib
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from cool_qrcode import CoolQRCode
+from cool_qrcode.exceptions import ImageGenerationError
+from cool_qrcode.png import _adler32_combine, deflate_band, write_png
+from cool_qrcode.raster import plan_dots, rasterize_dots, stamp_rows
+from cool_qrcode.tiled import iter_bands, render_tiled, write_tiled_png
+
+
+def _matrix(version=5):
+    """测试用的模块矩阵"""
+    qr = CoolQRCode(version=version)
+    qr.add_data("https://example.com/tiled")
+    return qr.encode().as_numpy()
+
+
+def _pixels(img):
+    """图像的RGBA像素数组"""
+    return np.array(img.convert("RGBA"))
+
+
+class TestStampRows:
+    """按行带盖印测试类"""
+
+    @pytest.mark.parametrize("quality", ["fast", "aa", "supersample-2"])
+    @pytest.mark.parametrize("dot_shape", ["square", "circle"])
+    def test_bands_match_full_render(self, dot_shape, quality):
+        """测试任意切分的行带拼接后与整幅渲染一致"""
+        matrix = _matrix()
+        size = 517
+        expected = rasterize_dots(matrix, size, dot_shape, quality)
+        plan = plan_dots(matrix, size, dot_shape, quality)
+
+        for cuts in ([0, size], [0, 1, 40, 41, 300, size], list(range(0, size, 37)) + [size]):
+            bands = [stamp_rows(plan, y0, y1) for y0, y1 in zip(cuts, cuts[1:])]
+            assert np.array_equal(np.concatenate(bands), expected)
+
+
+class TestRenderTiled:
+    """多线程分块渲染测试类"""
+
+    @pytest.mark.parametrize("mode", ["RGBA", "P", "auto"])
+    @pytest.mark.parametrize("quality", ["fast", "aa"])
+    @pytest.mark.parametrize("dot_shape", ["square", "circle"])
+    def test_matches_make_custom_image(self, dot_shape, quality, mode):
+        """测试结果与单线程的make_custom_image逐像素一致"""
+        qr = CoolQRCode(version=5, fill_color="navy", back_color=(255, 255, 0, 128))
+        qr.add_data("https://example.com/tiled")
+
+        expected = qr.make_custom_image(size=601, dot_shape=dot_shape, mode=mode, quality=quality)
+        tiled = qr.make_custom_image(
+            size=601, dot_shape=dot_shape, mode=mode, quality=quality, workers=3, band_height=50
+        )
+
+        assert tiled.mode == expected.mode
+        assert _pixels(tiled).tolist() == _pixels(expected).tolist()
+
+    def test_black_and_white(self):
+        """测试黑白二值图的分块渲染"""
+        matrix = _matrix()
+        expected = rasterize_dots(matrix, 400, "circle")
+        img = render_tiled(matrix, 400, "circle", mode="1", workers=2, band_height=64)
+        assert img.mode == "1"
+        assert np.array_equal(~np.array(img), expected)
+
+    def test_bands_in_order(self):
+        """测试行带按从上到下的顺序产出，并在多个线程中渲染"""
+        plan = plan_dots(_matrix(), 300, "square")
+        threads = set()
+
+        def render(plan, y0, y1):
+            threads.add(threading.get_ident())
+            return y0, y1
+
+        bands = list(iter_bands(plan, render, workers=4, band_height=64))
+        assert [y0 for y0, _ in bands] == [0, 64, 128, 192, 256]
+        assert [result for _, result in bands] == [(0, 64), (64, 128), (128, 192), (192, 256), (256, 300)]
+        assert threading.get_ident() not in threads
+
+    def test_invalid_arguments(self):
+        """测试无效的线程数和行带高度"""
+        plan = plan_dots(_matrix(), 100, "square")
+        with pytest.raises(ValueError):
+            list(iter_bands(plan, stamp_rows, workers=0))
+        with pytest.raises(ValueError):
+            list(iter_bands(plan, stamp_rows, band_height=0))
+
+
+class TestTiledPNG:
+    """流式PNG写出测试类"""
+
+    def test_adler32_combine(self):
+        """测试Adler-32合并与整段计算一致"""
+        first, second = b"cool" * 5000, bytes(range(256)) * 300
+        combined = _adler32_combine(zlib.adler32(first), zlib.adler32(second), len(second))
+        assert combined == zlib.adler32(first + second)
+        assert _adler32_combine(zlib.adler32(first), 1, 0) == zlib.adler32(first)
+
+    def test_write_png_bands(self):
+        """测试独立压缩的行带拼接成合法的PNG"""
+        indices = np.random.default_rng(0).integers(0, 4, size=(90, 33))
+        bands = [deflate_band(indices[y:y + 20], 2) for y in range(0, 90, 20)]
+        buffer = io.BytesIO()
+        write_png(buffer, 33, 90, ["white", "black", "red", (0, 0, 255, 100)], bands)
+
+        buffer.seek(0)
+        img = Image.open(buffer)
+        img.load()
+        assert img.mode == "P"
+        assert np.array_equal(np.array(img), indices)
+
+    @pytest.mark.parametrize("quality", ["fast", "aa"])
+    @pytest.mark.parametrize("dot_shape", ["square", "circle"])
+    def test_matches_make_custom_image(self, dot_shape, quality):
+        """测试写出的PNG解码后与make_custom_image逐像素一致"""
+        qr = CoolQRCode(version=5, fill_color="purple", back_color=(200, 255, 200, 64))
+        qr.add_data("https://example.com/tiled")
+
+        buffer = io.BytesIO()
+        qr.save_tiled_png(buffer, size=433, dot_shape=dot_shape, quality=quality,
+                          workers=3, band_height=40)
+        expected = qr.make_custom_image(size=433, dot_shape=dot_shape, quality=quality)
+
+        buffer.seek(0)
+        img = Image.open(buffer)
+        assert img.format == "PNG" and img.mode == "P"
+        assert _pixels(img).tolist() == _pixels(expected).tolist()
+
+    def test_bit_depth(self, tmp_path):
+        """测试无抗锯齿时写出1位调色板PNG，并支持写入文件名"""
+        path = tmp_path / "large.png"
+        qr = CoolQRCode()
+        qr.add_data("hello")
+        qr.save_tiled_png(path, size=1000, dot_shape="circle", workers=2)
+
+        with Image.open(path) as img:
+            assert img.size == (1000, 1000)
+            assert img.info.get("transparency") is None
+        header = path.read_bytes()[16:29]
+        assert header[8] == 1
+
+    def test_streaming_matches_full_encode(self):
+        """测试流式写出与一次性编码的图像一致"""
+        matrix = _matrix(version=2)
+        buffer = io.BytesIO()
+        write_tiled_png(buffer, matrix, 250, "circle", workers=1, band_height=7)
+        expected = render_tiled(matrix, 250, "circle", mode="RGBA", workers=1)
+
+        buffer.seek(0)
+        assert _pixels(Image.open(buffer)).tolist() == _pixels(expected).tolist()
+
+    def test_error(self):
+        """测试无数据时抛出异常"""
+        with pytest.raises(ImageGenerationError):
+            CoolQRCode().save_tiled_png(io.BytesIO(), size=100)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])